@@ -1,12 +1,20 @@
 """
 Agent 패키지
 - LangChain Agent 구성
+- Case 2 결정적 파이프라인 (planner)
+- 턴 단위 도구/프롬프트 라우팅 (tool_router)
+- 로컬 Case 분류기 (case_classifier) / 에이전트 없이 직접 응답 (direct_answer)
 """
 
-from .agent import create_agent
+from .agent import create_agent, create_routed_agent
+from .planner import create_planner, plan_case2, speculative_targets
 from .prompts import SYSTEM_PROMPT
 
 __all__ = [
     "create_agent",
+    "create_routed_agent",
+    "create_planner",
+    "plan_case2",
+    "speculative_targets",
     "SYSTEM_PROMPT"
 ]
\ No newline at end of file
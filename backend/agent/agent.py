@@ -1,4 +1,12 @@
+import asyncio
+import json
+import logging
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
 from langchain.agents import create_tool_calling_agent, AgentExecutor
+from langchain_core.agents import AgentStep
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 try:
     from agent.callbacks import ToolTimingCallbackHandler
@@ -16,27 +24,78 @@ from tools import (
     naver_cafe_search,       
     create_search_map_tool,   
 )
-from agent.prompts import SYSTEM_PROMPT
+from agent.output_budget import format_budgeted_tool_messages
+from agent.prompts import SYSTEM_PROMPT, assemble_system_prompt
+from agent.tool_router import FULL_ROUTE, AgentRoute, select_route
+from config import settings
 
+logger = logging.getLogger(__name__)
 
-def create_agent():
-    """LangChain Agent 생성"""
-    llm = get_llm()
+# 현재 에이전트 스텝의 도구 동시 실행 제한 (스텝마다 새로 생성)
+_step_semaphore: ContextVar[Optional[asyncio.Semaphore]] = ContextVar("step_semaphore", default=None)
 
-    # 1. 모든 도구 등록
-    tools = [
-        extract_user_intent,
-        get_weather_forecast,
-        search_facilities,        
-        show_map_for_facilities,
-        naver_web_search,         
-        naver_cafe_search,        
-        create_search_map_tool(),
-    ]
 
-    # 2. 프롬프트 정의
+class ConcurrentAgentExecutor(AgentExecutor):
+    """
+    한 스텝에서 모델이 여러 도구를 호출하면 동시에 실행하는 AgentExecutor
+    - 스텝당 동시 실행 수 상한 (max_concurrent_tools)
+    - 도구 하나의 예외는 해당 도구의 observation으로만 돌려주고 나머지 호출/루프는 계속 진행
+    """
+
+    max_concurrent_tools: int = 4
+    # 도구 실행까지 전달되는 콜백 (executor의 callbacks 필드는 체인 이벤트에만 적용됨)
+    tool_callbacks: List[Any] = []
+
+    def _with_tool_callbacks(self, config):
+        config = dict(config or {})
+        existing = config.get("callbacks")
+        if existing is None:
+            config["callbacks"] = list(self.tool_callbacks)
+        elif isinstance(existing, list):
+            config["callbacks"] = existing + list(self.tool_callbacks)
+        else:
+            manager = existing.copy()
+            for handler in self.tool_callbacks:
+                manager.add_handler(handler, inherit=True)
+            config["callbacks"] = manager
+        return config
+
+    def invoke(self, input, config=None, **kwargs):
+        return super().invoke(input, self._with_tool_callbacks(config), **kwargs)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        return await super().ainvoke(input, self._with_tool_callbacks(config), **kwargs)
+
+    async def _aiter_next_step(self, *args, **kwargs):
+        # AgentExecutor는 한 스텝의 action들을 asyncio.gather로 실행하므로
+        # 스텝 단위 세마포어를 contextvar로 넘겨 gather된 태스크들이 공유하게 함
+        token = _step_semaphore.set(asyncio.Semaphore(self.max_concurrent_tools))
+        try:
+            async for output in super()._aiter_next_step(*args, **kwargs):
+                yield output
+        finally:
+            _step_semaphore.reset(token)
+
+    async def _aperform_agent_action(self, name_to_tool_map, color_mapping, agent_action, run_manager=None) -> AgentStep:
+        semaphore = _step_semaphore.get()
+        async with (semaphore if semaphore is not None else nullcontext()):
+            try:
+                return await super()._aperform_agent_action(
+                    name_to_tool_map, color_mapping, agent_action, run_manager
+                )
+            except Exception as e:
+                logger.error(f"[Agent] 도구 실행 실패 tool={agent_action.tool}: {e}")
+                observation = json.dumps(
+                    {"success": False, "message": f"{agent_action.tool} 도구 실행 중 오류가 발생했습니다: {e}"},
+                    ensure_ascii=False,
+                )
+                return AgentStep(action=agent_action, observation=observation)
+
+
+def _build_executor(llm, tools: List[Any], system_prompt: str) -> ConcurrentAgentExecutor:
+    # 프롬프트 정의
     prompt = ChatPromptTemplate.from_messages([
-        ("system", SYSTEM_PROMPT),
+        ("system", system_prompt),
         ("system", "현재 대화 ID: {conversation_id}"),
         ("system", "최근 검색 출처(last_result_source): {last_result_source}"),
         MessagesPlaceholder(variable_name="chat_history", optional=True),
@@ -44,16 +103,76 @@ def create_agent():
         MessagesPlaceholder(variable_name="agent_scratchpad"),
     ])
 
-    # 3. Agent 생성 (Function Calling 방식)
-    agent = create_tool_calling_agent(llm, tools, prompt)
+    # Agent 생성 (Function Calling 방식)
+    #    scratchpad에는 도구별 토큰 예산으로 압축한 결과를 넣음 (원본은 intermediate_steps에 유지)
+    agent = create_tool_calling_agent(llm, tools, prompt, message_formatter=format_budgeted_tool_messages)
 
-    # 4. AgentExecutor 생성
-    return AgentExecutor(
+    # AgentExecutor 생성 (한 스텝의 독립 도구 호출은 동시 실행)
+    return ConcurrentAgentExecutor(
         agent=agent,
         tools=tools,
+        max_concurrent_tools=settings.AGENT_MAX_CONCURRENT_TOOLS,
         verbose=True,            
         max_iterations=5,             
         return_intermediate_steps=True, 
         handle_parsing_errors=True,  
-        callbacks=callbacks,          
+        tool_callbacks=callbacks,          
     )
+
+
+def _all_tools() -> List[Any]:
+    return [
+        extract_user_intent,
+        get_weather_forecast,
+        search_facilities,        
+        show_map_for_facilities,
+        naver_web_search,         
+        naver_cafe_search,        
+        create_search_map_tool(),
+    ]
+
+
+def create_agent():
+    """LangChain Agent 생성 (모든 도구 + 전체 SYSTEM_PROMPT)"""
+    return _build_executor(get_llm("answer"), _all_tools(), SYSTEM_PROMPT)
+
+
+class RoutedAgent:
+    """
+    턴마다 select_route로 도구/프롬프트 부분집합을 골라 해당 executor로 실행.
+    route별 executor(조합된 프롬프트 + 바인딩된 도구)는 처음 사용할 때 만들어 캐시합니다.
+    """
+
+    def __init__(self, llm=None):
+        self.llm = llm or get_llm("answer")
+        self.tools = {tool.name: tool for tool in _all_tools()}
+        self._executors: Dict[AgentRoute, ConcurrentAgentExecutor] = {}
+
+    def route_for(self, inputs: Dict[str, Any]) -> AgentRoute:
+        if not settings.AGENT_ROUTING_ENABLED:
+            return FULL_ROUTE
+        return select_route(inputs.get("input", ""), inputs.get("last_result_source", ""))
+
+    def executor_for(self, route: AgentRoute) -> ConcurrentAgentExecutor:
+        executor = self._executors.get(route)
+        if executor is None:
+            tools = [self.tools[name] for name in route.tools]
+            system_prompt = assemble_system_prompt(route.tools, route.sections)
+            executor = _build_executor(self.llm, tools, system_prompt)
+            self._executors[route] = executor
+        return executor
+
+    def invoke(self, inputs: Dict[str, Any], config=None, **kwargs):
+        route = self.route_for(inputs)
+        logger.info(f"🧭 agent route={route.name} tools={len(route.tools)}")
+        return self.executor_for(route).invoke(inputs, config, **kwargs)
+
+    async def ainvoke(self, inputs: Dict[str, Any], config=None, **kwargs):
+        route = self.route_for(inputs)
+        logger.info(f"🧭 agent route={route.name} tools={len(route.tools)}")
+        return await self.executor_for(route).ainvoke(inputs, config, **kwargs)
+
+
+def create_routed_agent() -> RoutedAgent:
+    """턴 단위 도구/프롬프트 라우팅 에이전트 생성"""
+    return RoutedAgent()
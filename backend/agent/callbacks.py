@@ -1,13 +1,14 @@
 import time
+import threading
 import logging
-from langchain.callbacks.base import BaseCallbackHandler
+from langchain.callbacks.base import AsyncCallbackHandler, BaseCallbackHandler
 from utils.tool_timings import record_tool_timing
 
 logger = logging.getLogger(__name__)
 
 
 class ToolTimingCallbackHandler(BaseCallbackHandler):
-    """Record start/end timestamps for each tool call."""
+    """Record start/end timestamps for each tool call (concurrent calls show overlapping spans)."""
 
     def __init__(self):
         super().__init__()
@@ -18,7 +19,10 @@ class ToolTimingCallbackHandler(BaseCallbackHandler):
         tool_name = serialized.get("name") if isinstance(serialized, dict) else None
         conversation_id = None
         try:
-            if isinstance(input_str, dict):
+            inputs = kwargs.get("inputs")
+            if isinstance(inputs, dict):
+                conversation_id = inputs.get("conversation_id")
+            elif isinstance(input_str, dict):
                 conversation_id = input_str.get("conversation_id")
         except Exception:
             pass
@@ -26,10 +30,103 @@ class ToolTimingCallbackHandler(BaseCallbackHandler):
         logger.debug(f"[ToolTiming] start tool={tool_name} run_id={run_id} conv={conversation_id}")
 
     def on_tool_end(self, output, **kwargs):
-        run_id = kwargs.get("run_id")
+        self._finish(kwargs.get("run_id"), error=False)
+
+    def on_tool_error(self, error, **kwargs):
+        self._finish(kwargs.get("run_id"), error=True)
+
+    def _finish(self, run_id, error: bool):
         start, tool_name, conversation_id = self._starts.pop(run_id, (None, None, None))
         if start is None:
             return
-        duration = time.time() - start
-        record_tool_timing(tool=tool_name or "unknown_tool", duration=duration, conversation_id=conversation_id)
+        end = time.time()
+        duration = end - start
+        record_tool_timing(
+            tool=tool_name or "unknown_tool",
+            duration=duration,
+            conversation_id=conversation_id,
+            start=start,
+            end=end,
+            error=error,
+        )
         logger.debug(f"[ToolTiming] end tool={tool_name} run_id={run_id} conv={conversation_id} duration={duration:.3f}s")
+
+
+class LLMCallCounterHandler(BaseCallbackHandler):
+    """Count LLM calls made while serving a single request."""
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def _increment(self):
+        with self._lock:
+            self.count += 1
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self._increment()
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self._increment()
+
+
+class ChatStreamCallbackHandler(AsyncCallbackHandler):
+    """
+    Push tool start/end and answer token events into an asyncio.Queue for the streaming chat endpoint.
+    LLM calls made inside tools (intent extraction, cafe summaries) are not streamed as answer tokens.
+    """
+
+    # tool_end 이벤트에 담을 도구 결과 최대 길이
+    TOOL_OUTPUT_PREVIEW_CHARS = 1000
+
+    def __init__(self, queue, loop=None):
+        super().__init__()
+        self._queue = queue
+        self._loop = loop
+        self._tool_names = {}
+        # 도구 실행 하위에 속한 run_id (도구 내부 LLM 토큰 제외용)
+        self._inside_tool = set()
+
+    def _emit(self, event: dict):
+        # 동기 도구 내부 콜백은 다른 스레드에서 올 수 있으므로 이벤트 루프에 안전하게 전달
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+        else:
+            self._queue.put_nowait(event)
+
+    def _track_parent(self, run_id, parent_run_id):
+        if parent_run_id is not None and parent_run_id in self._inside_tool:
+            self._inside_tool.add(run_id)
+
+    async def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+        self._track_parent(run_id, parent_run_id)
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        self._track_parent(run_id, parent_run_id)
+
+    async def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        self._track_parent(run_id, parent_run_id)
+
+    async def on_llm_new_token(self, token, *, run_id, **kwargs):
+        if token and run_id not in self._inside_tool:
+            self._emit({"type": "token", "delta": token})
+
+    async def on_tool_start(self, serialized, input_str, *, run_id, inputs=None, **kwargs):
+        tool_name = serialized.get("name") if isinstance(serialized, dict) else None
+        self._tool_names[run_id] = tool_name
+        self._inside_tool.add(run_id)
+        self._emit({"type": "tool_start", "tool": tool_name, "input": inputs if isinstance(inputs, dict) else input_str})
+
+    async def on_tool_end(self, output, *, run_id, **kwargs):
+        tool_name = self._tool_names.pop(run_id, None)
+        self._emit({
+            "type": "tool_end",
+            "tool": tool_name,
+            "output": str(output)[: self.TOOL_OUTPUT_PREVIEW_CHARS],
+        })
+
+    async def on_tool_error(self, error, *, run_id, **kwargs):
+        tool_name = self._tool_names.pop(run_id, None)
+        self._emit({"type": "tool_end", "tool": tool_name, "error": str(error)})
+
@@ -0,0 +1,123 @@
+"""
+로컬 Case 분류기 (TF-IDF 문자 n-gram + 로지스틱 회귀)
+- 평가 데이터셋의 라벨된 질문(eval_cases.classify_case 규칙)으로 학습한 CPU 모델
+- 에이전트가 첫 LLM 반복에서 하던 Case 판단(행사/장소/후기/날씨 전용/관련 없음/지도)을 1ms 이내로 예측
+- 학습 데이터: agent/case_examples.json (evaluation/scripts/evaluate_case_classifier.py --export로 갱신)
+"""
+
+import json
+import logging
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+logger = logging.getLogger(__name__)
+
+EXAMPLES_PATH = Path(__file__).parent / "case_examples.json"
+
+# 평가 데이터셋 category → 분류 라벨 (에이전트 route와 같은 이름)
+CATEGORY_TO_LABEL = {
+    "web_event": "event",
+    "rag": "place",
+    "weather_plus": "place",
+    "fallback": "place",
+    "cafe_review": "review",
+    "weather": "weather",
+    "no_tool": "off_topic",
+    "map": "map",
+}
+
+# 에이전트 힌트에 쓰는 라벨 설명 (SYSTEM_PROMPT의 Case 번호 기준)
+LABEL_DESCRIPTIONS = {
+    "event": "Case 1 (행사/축제 → naver_web_search)",
+    "place": "Case 2 (장소/시설 추천 → search_facilities, 0건이면 Case 4)",
+    "review": "Case 3 (후기/팁 → naver_cafe_search)",
+    "weather": "날씨 전용 질문 (get_weather_forecast만 사용)",
+    "off_topic": "Case 5 (챗봇과 관련없는 질문 → 도구 없이 안내)",
+    "map": "지도 요청 (search_map_by_address / show_map_for_facilities)",
+}
+
+NGRAM_RANGE = (1, 3)
+REGULARIZATION_C = 10.0
+
+
+@dataclass(frozen=True)
+class CasePrediction:
+    label: str
+    confidence: float
+
+
+class CaseClassifier:
+    """
+    학습은 scikit-learn으로 하고, 예측은 n-gram별 가중치(idf × 계수)를 미리 합쳐 둔 dict로 계산.
+    (Pipeline.predict_proba는 호출당 ~1ms라 단건 예측 경로에서는 사용하지 않음)
+    """
+
+    def __init__(self):
+        self.labels: List[str] = []
+        self._analyzer = None
+        self._weights: Dict[str, Tuple[float, List[float]]] = {}
+        self._intercepts: List[float] = []
+
+    def fit(self, texts: Sequence[str], labels: Sequence[str]) -> "CaseClassifier":
+        vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=NGRAM_RANGE, sublinear_tf=True)
+        features = vectorizer.fit_transform(texts)
+        model = LogisticRegression(C=REGULARIZATION_C, class_weight="balanced", max_iter=2000)
+        model.fit(features, labels)
+
+        self.labels = list(model.classes_)
+        self._analyzer = vectorizer.build_analyzer()
+        # n-gram → (idf, 클래스별 계수)
+        self._weights = {
+            ngram: (float(vectorizer.idf_[j]), [float(c) for c in model.coef_[:, j]])
+            for ngram, j in vectorizer.vocabulary_.items()
+        }
+        self._intercepts = [float(b) for b in model.intercept_]
+        return self
+
+    def predict(self, text: str) -> CasePrediction:
+        counts: Dict[str, int] = {}
+        for ngram in self._analyzer(text or ""):
+            if ngram in self._weights:
+                counts[ngram] = counts.get(ngram, 0) + 1
+
+        # sublinear tf-idf + L2 정규화 후 선형 결합 (TfidfVectorizer와 동일한 계산)
+        scores = [0.0] * len(self.labels)
+        norm = 0.0
+        for ngram, count in counts.items():
+            idf, coefs = self._weights[ngram]
+            value = (1.0 + math.log(count)) * idf
+            norm += value * value
+            for k, coef in enumerate(coefs):
+                scores[k] += value * coef
+        norm = math.sqrt(norm) or 1.0
+        scores = [s / norm + b for s, b in zip(scores, self._intercepts)]
+
+        # softmax (multinomial 로지스틱 회귀의 predict_proba)
+        top = max(scores)
+        exps = [math.exp(s - top) for s in scores]
+        best = max(range(len(scores)), key=scores.__getitem__)
+        return CasePrediction(self.labels[best], exps[best] / sum(exps))
+
+
+def load_examples(path: Path = EXAMPLES_PATH) -> List[Dict[str, str]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["examples"]
+
+
+@lru_cache(maxsize=1)
+def get_case_classifier() -> CaseClassifier:
+    """학습 예제로 분류기 학습 (프로세스당 1회, 수십 ms)"""
+    examples = load_examples()
+    classifier = CaseClassifier().fit([e["question"] for e in examples], [e["label"] for e in examples])
+    logger.info(f"✅ Case 분류기 학습 완료: 예제 {len(examples)}개, 라벨 {classifier.labels}")
+    return classifier
+
+
+def predict_case(message: str) -> CasePrediction:
+    return get_case_classifier().predict(message)
@@ -0,0 +1,104 @@
+"""
+에이전트 없이 바로 답하는 턴 (로컬 Case 분류기 결과 기반)
+- 관련 없는 질문(Case 5): 고정 안내 문구 (LLM 0회)
+- 날씨 전용 질문: get_weather_forecast 결과를 템플릿으로 답변 (LLM 0회)
+- 확신이 낮거나 장소/행사/후기/지도 키워드가 섞이면 None → 분류 결과를 힌트로 에이전트 실행
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from langchain_core.agents import AgentAction
+from langchain_core.messages import BaseMessage
+
+from agent.case_classifier import CasePrediction
+from agent.planner import DATE_KEYWORDS, EVENT_KEYWORDS, MAP_KEYWORDS, PLACE_KEYWORDS, REVIEW_KEYWORDS
+from agent.prompts import OFF_TOPIC_ANSWER
+from config import settings
+from tools import get_weather_forecast
+from utils.location_mapper import extract_location, extract_rag_location
+
+logger = logging.getLogger(__name__)
+
+# intermediate_steps에 남기는 로그 (에이전트 실행 결과와 구분용)
+DIRECT_LOG = "[direct] 로컬 Case 분류기 직접 응답"
+
+DOMAIN_KEYWORDS = EVENT_KEYWORDS + REVIEW_KEYWORDS + MAP_KEYWORDS + PLACE_KEYWORDS + ["날씨"]
+# 날씨 도구가 주지 않는 정보 (미세먼지, 바람 등) → 에이전트가 판단
+UNSUPPORTED_WEATHER_KEYWORDS = ["미세먼지", "황사", "바람", "습도", "자외선", "꽃가루"]
+
+DATE_LABELS = {"today": "오늘", "tomorrow": "내일", "this_weekend": "이번 주말"}
+
+
+def _contains_any(text: str, keywords: List[str]) -> bool:
+    return any(kw in text for kw in keywords)
+
+
+def can_answer_directly(prediction: CasePrediction, message: str, has_history: bool = False) -> bool:
+    """분류 결과와 메시지로 에이전트 없이 답할 수 있는 턴인지 (날씨는 도구 결과가 실패하면 여전히 폴백)"""
+    text = (message or "").strip()
+    if not text or prediction.confidence < settings.CASE_DIRECT_ANSWER_THRESHOLD:
+        return False
+
+    if prediction.label == "off_topic":
+        # 이전 대화가 있으면 짧은 후속 질문일 수 있어 에이전트에 맡김
+        if has_history or _contains_any(text, DOMAIN_KEYWORDS):
+            return False
+        return not (extract_location(text) or extract_rag_location(text))
+
+    if prediction.label == "weather":
+        if _contains_any(text, EVENT_KEYWORDS + REVIEW_KEYWORDS + MAP_KEYWORDS + PLACE_KEYWORDS):
+            return False
+        if _contains_any(text, UNSUPPORTED_WEATHER_KEYWORDS):
+            return False
+        return extract_location(text) is not None
+
+    return False
+
+
+def _weather_answer(weather: Dict[str, Any], date: str) -> str:
+    date_label = DATE_LABELS.get(date, weather.get("date", ""))
+    emoji = "☔" if weather.get("is_indoor") else "☀️"
+    lines = [
+        f"{emoji} {weather['city']} {date_label} 날씨는 **{weather['weather']}**, 기온은 약 **{weather['temp']:.0f}°C**예요.",
+    ]
+    if weather.get("is_indoor"):
+        lines.append("비나 눈 소식이 있어 아이와는 **실내 나들이**를 추천드려요. 실내 놀이 장소를 찾아드릴까요?")
+    else:
+        lines.append("야외 활동하기 괜찮은 날씨예요. 아이와 갈 만한 곳을 추천해 드릴까요?")
+    return "\n".join(lines)
+
+
+async def answer_directly(
+    prediction: CasePrediction,
+    message: str,
+    conversation_id: str,
+    chat_history: Optional[List[BaseMessage]] = None,
+    callbacks: Optional[List[Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    AgentExecutor.ainvoke와 같은 형태({"output", "intermediate_steps"})로 결과를 반환.
+    직접 답할 수 없으면 None → 에이전트 실행.
+    """
+    if not can_answer_directly(prediction, message, has_history=bool(chat_history)):
+        return None
+
+    if prediction.label == "off_topic":
+        return {"output": OFF_TOPIC_ANSWER, "intermediate_steps": []}
+
+    date = next((value for kw, value in DATE_KEYWORDS.items() if kw in message), "today")
+    weather_input = {"city_name": extract_location(message), "date": date, "conversation_id": conversation_id}
+    try:
+        weather_output = await get_weather_forecast.ainvoke(weather_input, config={"callbacks": list(callbacks or [])})
+        weather = json.loads(weather_output)
+    except Exception as e:
+        logger.error(f"[direct] 날씨 조회 실패 -> 에이전트 폴백: {e}")
+        return None
+    if not weather.get("success"):
+        return None
+
+    return {
+        "output": _weather_answer(weather, date),
+        "intermediate_steps": [(AgentAction("get_weather_forecast", weather_input, DIRECT_LOG), weather_output)],
+    }
@@ -0,0 +1,234 @@
+"""
+지도 후속 요청 fast lane
+- "2번째 지도 보여줘", "첫 번째랑 세 번째 위치", "둘 다 지도로" 같은 후속 요청은
+  메모리의 최근 검색 결과(last_search_results / last_result_source)만으로 결정되므로
+  에이전트(LLM) 없이 바로 MapResponse를 구성
+- 웹 결과는 저장 시 백그라운드로 채운 좌표(utils/location_prefetch)를 바로 사용
+- 애매하면(새 지역/행사/후기 언급, 결과 없음, 범위 밖 번호, 카페 결과 등) None → 에이전트 폴백
+"""
+
+import asyncio
+import json
+import logging
+import re
+from typing import List, Optional, Tuple
+
+from agent.planner import EVENT_KEYWORDS, REVIEW_KEYWORDS
+from config import settings
+from models.map_models import MapCenter, MapData, MapMarker, MapResponse
+from tools import search_map_by_address_core, show_map_for_facilities
+from utils.conversation_memory import get_last_result_source, get_last_search_results, set_status
+from utils.location_mapper import extract_location, extract_rag_location
+from utils.location_prefetch import location_query, wait_location_prefetch
+from utils.metrics import incr
+
+logger = logging.getLogger(__name__)
+
+# 새 검색이 아닌 후속 요청으로 볼 최대 길이
+MAX_FOLLOWUP_LENGTH = 40
+
+MAP_REQUEST_KEYWORDS = ["지도", "위치"]
+# "어디"는 "부산 어디 갈까?" 같은 새 질문에도 쓰여 번호가 함께 있을 때만 인정
+WHERE_KEYWORDS = ["어디"]
+# 새 검색 요청 표현
+NEW_SEARCH_KEYWORDS = ["추천", "찾아", "검색"]
+
+ORDINAL_WORDS = {
+    "첫": 1, "두": 2, "둘": 2, "세": 3, "셋": 3, "네": 4, "넷": 4,
+    "다섯": 5, "여섯": 6, "일곱": 7, "여덟": 8, "아홉": 9, "열": 10,
+}
+_ORDINAL_TOKEN = r"(?:\d+|" + "|".join(sorted(ORDINAL_WORDS, key=len, reverse=True)) + r")"
+_SEPARATOR = r"\s*(?:,|와|과|이랑|랑|하고|및|&)\s*"
+# "2번", "두 번째", "셋째", "1, 3번", "1번이랑 3번째"
+ORDINAL_PATTERN = re.compile(
+    rf"({_ORDINAL_TOKEN}(?:{_SEPARATOR}{_ORDINAL_TOKEN})*)\s*(?:번\s*째|째|번)"
+)
+TOKEN_PATTERN = re.compile(_ORDINAL_TOKEN)
+# "둘 다", "두 곳 다", "세 개 모두"
+BOTH_PATTERN = re.compile(rf"({_ORDINAL_TOKEN})\s*(?:곳|개|군데)?\s*(?:다|모두|전부)(?:\s|$|[?!.])")
+ALL_KEYWORDS = ["전부", "모두", "전체", "다 보여", "다 지도"]
+LAST_KEYWORDS = ["마지막"]
+
+# 후속 요청에 나올 수 있는 단어 (이 외의 단어 = 새 장소명일 수 있어 에이전트로)
+FOLLOWUP_WORDS = {
+    "지도", "위치", "어디", "어디야", "어디에", "어딘지", "어디있어", "링크", "주소",
+    "보여줘", "보여", "보여주세요", "보여줄래", "알려줘", "알려", "알려주세요", "줘", "주세요", "좀",
+    "표시", "표시해줘", "찍어줘", "확인", "확인하고", "싶어", "해줘", "부탁해", "있어", "있는지",
+    "거기", "그곳", "여기", "이곳", "저기", "그", "이", "저", "방금", "아까", "위", "위에", "앞",
+    "결과", "장소", "곳", "데", "두", "세", "개", "군데", "다", "둘", "셋", "넷",
+    "전부", "모두", "전체", "마지막", "것", "거", "그거", "이거", "중", "중에", "중에서",
+    "이랑", "랑", "하고", "와", "과", "및", "&", "만", "도", "한번", "한", "번",
+}
+PARTICLES = ("으로", "에서", "이랑", "로", "를", "을", "는", "은", "가", "에", "도", "만", "랑", "의")
+PUNCTUATION_PATTERN = re.compile(r"[,.?!~]")
+
+
+def _to_number(token: str) -> Optional[int]:
+    if token.isdigit():
+        return int(token)
+    return ORDINAL_WORDS.get(token)
+
+
+def parse_ordinals(text: str, count: int) -> Optional[List[int]]:
+    """
+    메시지에서 선택한 결과 번호(0-based)를 추출.
+    번호 표현이 없으면 None, 전체 선택이면 [0..count-1].
+    """
+    indices: List[int] = []
+    for match in ORDINAL_PATTERN.finditer(text):
+        for token in TOKEN_PATTERN.findall(match.group(1)):
+            number = _to_number(token)
+            if number:
+                indices.append(number - 1)
+
+    both = BOTH_PATTERN.search(text)
+    if both and not indices:
+        number = _to_number(both.group(1))
+        if number:
+            indices.extend(range(number))
+
+    if not indices and any(kw in text for kw in LAST_KEYWORDS):
+        indices.append(count - 1)
+    if not indices and any(kw in text for kw in ALL_KEYWORDS):
+        indices.extend(range(count))
+
+    if not indices:
+        return None
+    # 중복 제거 (순서 유지)
+    return list(dict.fromkeys(indices))
+
+
+def _only_followup_words(text: str) -> bool:
+    """번호 표현을 뺀 나머지가 모두 후속 요청 단어인지 ("서울역 지도 보여줘"처럼 장소명이 있으면 False)"""
+    text = PUNCTUATION_PATTERN.sub(" ", ORDINAL_PATTERN.sub(" ", text))
+    for word in text.split():
+        if word in FOLLOWUP_WORDS:
+            continue
+        stem = next((word[: -len(p)] for p in PARTICLES if word.endswith(p) and len(word) > len(p)), word)
+        if stem not in FOLLOWUP_WORDS:
+            return False
+    return True
+
+
+def is_map_followup(message: str) -> bool:
+    """새 검색 없이 최근 결과의 지도만 요청하는 후속 질문인지"""
+    text = (message or "").strip()
+    if not text or len(text) > MAX_FOLLOWUP_LENGTH:
+        return False
+    if any(kw in text for kw in EVENT_KEYWORDS + REVIEW_KEYWORDS + NEW_SEARCH_KEYWORDS):
+        return False
+    # 새 지역이 언급되면 새 검색 요청
+    if extract_rag_location(text) or extract_location(text):
+        return False
+
+    if not _only_followup_words(text):
+        return False
+
+    if any(kw in text for kw in MAP_REQUEST_KEYWORDS):
+        return True
+    return any(kw in text for kw in WHERE_KEYWORDS) and parse_ordinals(text, 1) is not None
+
+
+def build_map_data(facilities: List[dict]) -> Tuple[Optional[MapData], Optional[str]]:
+    """시설 목록(name/lat/lng) → 지도 데이터와 카카오맵 링크 (첫 번째 시설 기준)"""
+    markers = [
+        MapMarker(
+            name=f.get("name", "장소"),
+            lat=float(f.get("lat", 0.0)),
+            lng=float(f.get("lng", 0.0)),
+            desc=f.get("desc", "") or f.get("address", ""),
+        )
+        for f in facilities
+    ]
+    if not markers:
+        return None, None
+
+    map_data = MapData(center=MapCenter(lat=markers[0].lat, lng=markers[0].lng), markers=markers)
+    kakao_link = f"https://map.kakao.com/link/to/{markers[0].name},{markers[0].lat},{markers[0].lng}"
+    return map_data, kakao_link
+
+
+def _map_message(names: List[str]) -> str:
+    return f"요청하신 {', '.join(names)} 위치를 지도로 보여드릴게요! 📍"
+
+
+def _rag_map(conversation_id: str, indices: List[int]) -> Optional[MapResponse]:
+    result = json.loads(
+        show_map_for_facilities.invoke(
+            {"conversation_id": conversation_id, "facility_indices": ",".join(str(i) for i in indices)}
+        )
+    )
+    facilities = result.get("facilities") or []
+    if not result.get("success") or not facilities:
+        return None
+
+    map_data, kakao_link = build_map_data(facilities)
+    return MapResponse(
+        content=_map_message([f.get("name", "장소") for f in facilities]),
+        link=kakao_link,
+        data=map_data,
+    )
+
+
+async def _web_map(conversation_id: str, results: List[dict], indices: List[int]) -> Optional[MapResponse]:
+    set_status(conversation_id, "지도 데이터 구성 중..")
+    # 검색 결과 저장 시 시작한 백그라운드 지오코딩이 채운 좌표 사용 (진행 중이면 잠깐 기다림)
+    await wait_location_prefetch(conversation_id, settings.LOCATION_PREFETCH_WAIT_SECONDS)
+    selected = [results[i] for i in indices]
+    if all(r.get("lat") and r.get("lng") for r in selected):
+        incr("location_prefetch.map_hits")
+        places = [
+            {"name": r.get("place_name") or r.get("name", "장소"), "lat": r["lat"], "lng": r["lng"], "address": r.get("address", "")}
+            for r in selected
+        ]
+        map_data, kakao_link = build_map_data(places)
+        return MapResponse(content=_map_message([p["name"] for p in places]), link=kakao_link, data=map_data)
+
+    queries = [location_query(r) for r in selected]
+    responses = await asyncio.gather(*[search_map_by_address_core(query) for query in queries if query])
+
+    markers = [marker for response in responses if response.type == "map" for marker in response.data.markers]
+    # 하나라도 좌표를 못 찾으면 답변 문맥에서 장소명을 고를 수 있는 에이전트에 맡김
+    if not markers or len(markers) < len(queries):
+        return None
+
+    map_data = MapData(center=MapCenter(lat=markers[0].lat, lng=markers[0].lng), markers=markers)
+    return MapResponse(
+        content=_map_message([marker.name for marker in markers]),
+        link=responses[0].link,
+        data=map_data,
+    )
+
+
+async def answer_map_followup(message: str, conversation_id: str) -> Optional[MapResponse]:
+    """지도 후속 요청이면 MapResponse를 바로 만들어 반환, 아니면 None (에이전트 폴백)"""
+    if not conversation_id or not is_map_followup(message):
+        return None
+
+    results = get_last_search_results(conversation_id)
+    source = get_last_result_source(conversation_id)
+    if not results:
+        return None
+
+    indices = parse_ordinals(message, len(results))
+    if indices is None:
+        # 번호 없이 "지도 보여줘" → 최근 결과 전체
+        indices = list(range(len(results)))
+    if any(i < 0 or i >= len(results) for i in indices):
+        return None
+
+    try:
+        if source == "rag":
+            response = _rag_map(conversation_id, indices)
+        elif source == "web":
+            response = await _web_map(conversation_id, results, indices)
+        else:
+            # 카페 결과는 글 제목이라 장소명 추출이 필요 → 에이전트
+            response = None
+    except Exception as e:
+        logger.error(f"[MAP FASTLANE] 지도 구성 실패 -> 에이전트 폴백: {e}")
+        return None
+
+    if response is not None:
+        logger.info(f"[MAP FASTLANE] source={source} indices={indices}")
+    return response
@@ -0,0 +1,119 @@
+"""
+도구 결과 토큰 예산 (agent_scratchpad 압축)
+- 도구 결과가 그대로 scratchpad에 쌓이면 이후 매 LLM 반복마다 토큰이 늘어남
+- 모델에 보내는 scratchpad만 도구별 예산에 맞게 압축하고,
+  원본은 intermediate_steps에 그대로 남겨 routers/chat.py 응답 처리에서 사용
+"""
+
+import json
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple
+
+from langchain.agents.format_scratchpad.tools import format_to_tool_messages
+from langchain_core.agents import AgentAction
+from langchain_core.messages import BaseMessage
+
+from config import settings
+from utils.token_counter import count_tokens, truncate_to_tokens
+
+# 도구별 scratchpad 토큰 예산
+TOOL_OUTPUT_BUDGETS: Dict[str, int] = {
+    "extract_user_intent": 150,
+    "get_weather_forecast": 150,
+    "search_facilities": 400,
+    "naver_web_search": 600,
+    "naver_cafe_search": 500,
+}
+DEFAULT_TOOL_OUTPUT_BUDGET = 800
+
+# 모델이 쓰지 않는 필드 (좌표는 지도 도구가 메모리에서 직접 읽음)
+DROP_FIELDS = {"lat", "lng", "LAT", "LON"}
+# 예산 초과 시 시설 설명(desc)을 단계적으로 줄이는 길이
+DESC_LIMITS = (60, 30, 0)
+# 예산 초과 시 텍스트 결과의 각 줄을 단계적으로 줄이는 길이 (뒤쪽 항목이 잘려 나가지 않도록)
+LINE_LIMITS = (120, 60)
+
+ANCHOR_PATTERN = re.compile(r'<a\s+href="([^"]*)"[^>]*>(.*?)</a>', re.DOTALL)
+BLANK_LINES_PATTERN = re.compile(r"\n\s*\n+")
+# 웹 검색 결과 끝의 안내 문구 (모델 답변에는 불필요)
+WEB_FOOTER = "ℹ️ 자세한 일정/변경 사항은 각 행사 공식 홈페이지나 최신 공지를 다시 확인해 주세요."
+
+
+def _compact_json(data: Any, desc_limit: int = None) -> Any:
+    if isinstance(data, dict):
+        compacted = {}
+        for key, value in data.items():
+            if key in DROP_FIELDS or value in (None, ""):
+                continue
+            if key == "desc" and desc_limit is not None and isinstance(value, str):
+                if desc_limit == 0:
+                    continue
+                value = value[:desc_limit]
+            compacted[key] = _compact_json(value, desc_limit)
+        return compacted
+    if isinstance(data, list):
+        return [_compact_json(item, desc_limit) for item in data]
+    return data
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _compact_text(text: str) -> str:
+    # HTML 링크 → 마크다운 링크 (프론트에서 동일하게 렌더링됨)
+    text = ANCHOR_PATTERN.sub(lambda m: f"[{m.group(2).strip()}]({m.group(1)})", text)
+    text = text.replace(WEB_FOOTER, "")
+    return BLANK_LINES_PATTERN.sub("\n", text).strip()
+
+
+def _cap_lines(text: str, limit: int) -> str:
+    return "\n".join(line if len(line) <= limit else line[:limit] + "…" for line in text.split("\n"))
+
+
+@lru_cache(maxsize=512)
+def budget_tool_output(tool: str, observation: str) -> str:
+    """도구 결과를 도구별 토큰 예산 이내로 압축 (예산 이내면 불필요한 필드/공백만 정리)"""
+    budget = TOOL_OUTPUT_BUDGETS.get(tool, DEFAULT_TOOL_OUTPUT_BUDGET)
+
+    try:
+        data = json.loads(observation)
+    except (TypeError, ValueError):
+        data = None
+
+    if isinstance(data, (dict, list)):
+        compacted = _dumps(_compact_json(data))
+        for desc_limit in DESC_LIMITS:
+            if count_tokens(compacted) <= budget:
+                return compacted
+            compacted = _dumps(_compact_json(data, desc_limit))
+        return truncate_to_tokens(compacted, budget, marker="…(생략)")
+
+    compacted = _compact_text(observation)
+    for line_limit in LINE_LIMITS:
+        if count_tokens(compacted) <= budget:
+            return compacted
+        compacted = _cap_lines(compacted, line_limit)
+    return truncate_to_tokens(compacted, budget, marker="…(생략)")
+
+
+def _budgeted_steps(intermediate_steps: Sequence[Tuple[AgentAction, Any]]) -> List[Tuple[AgentAction, Any]]:
+    return [
+        (action, budget_tool_output(action.tool, observation) if isinstance(observation, str) else observation)
+        for action, observation in intermediate_steps
+    ]
+
+
+def format_budgeted_tool_messages(intermediate_steps: Sequence[Tuple[AgentAction, Any]]) -> List[BaseMessage]:
+    """create_tool_calling_agent의 message_formatter: 압축된 도구 결과로 scratchpad 구성"""
+    if not settings.TOOL_OUTPUT_BUDGET_ENABLED:
+        return format_to_tool_messages(intermediate_steps)
+    return format_to_tool_messages(_budgeted_steps(intermediate_steps))
+
+
+def scratchpad_tokens(intermediate_steps: Sequence[Tuple[AgentAction, Any]]) -> Tuple[int, int]:
+    """(원본, 압축 후) scratchpad 도구 결과 토큰 수"""
+    raw = sum(count_tokens(str(observation)) for _, observation in intermediate_steps)
+    budgeted = sum(count_tokens(str(observation)) for _, observation in _budgeted_steps(intermediate_steps))
+    return raw, budgeted
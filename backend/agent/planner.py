@@ -0,0 +1,248 @@
+"""
+Case 2(일반 장소/시설 추천) 결정적 파이프라인
+- 메시지만으로 Case 2임이 확실하면 AgentExecutor 루프를 건너뛰고
+  extract → (날씨) → search_facilities를 코드로 직접 실행한 뒤 최종 답변만 LLM 1회로 생성
+- 애매한 경우(행사/후기/지도/날씨 전용 질문, 지역 미상, RAG 0건 등) None을 반환해 에이전트로 폴백
+- 이전 대화가 있는 후속 턴("거기 말고 다른 곳")은 문맥이 필요하므로 호출 측에서 planner를 건너뜀
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from langchain_core.agents import AgentAction
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from agent.callbacks import ToolTimingCallbackHandler
+from agent.prompts import PLANNER_ANSWER_PROMPT
+from models.chat_models import get_llm
+from tools import get_weather_forecast, search_facilities
+from utils.conversation_memory import set_status
+from utils.location_mapper import extract_location, extract_rag_location
+
+logger = logging.getLogger(__name__)
+
+# intermediate_steps에 남기는 로그 (에이전트 실행 결과와 구분용)
+PLANNER_LOG = "[planner] Case 2 결정적 파이프라인"
+
+# Case 1(행사), Case 3(후기), 지도 요청 키워드 → 에이전트에 맡김
+EVENT_KEYWORDS = ["축제", "행사", "팝업", "페스티벌", "개최", "일정", "실시간", "전시", "체험전", "열리", "열려"]
+REVIEW_KEYWORDS = ["후기", "팁", "리뷰", "주차", "솔직", "단점", "평판", "기다려", "웨이팅"]
+MAP_KEYWORDS = ["지도", "위치", "어디"]
+
+# Case 2 핵심 키워드 (SYSTEM_PROMPT의 Case 2 목록 + 자주 쓰는 시설 유형)
+PLACE_KEYWORDS = [
+    "키즈카페", "박물관", "미술관", "과학관", "공원", "놀이터", "놀이시설", "도서관", "수영장",
+    "캠핑장", "체험", "수목원", "동물원", "관광지", "공연장", "갈만한", "갈 만한", "가볼만한", "가볼 만한",
+    "놀만한", "놀 만한", "추천", "근처", "아이랑", "아이와",
+]
+
+# 날씨 확인이 필요 없는 명확한 실내 시설
+INDOOR_FACILITY_KEYWORDS = ["키즈카페", "박물관", "미술관", "과학관", "도서관", "실내"]
+OUTDOOR_KEYWORDS = ["공원", "놀이터", "숲", "바다", "해변", "해수욕장", "야외", "실외", "캠핑", "산책", "자전거", "계곡", "수목원"]
+
+# 날짜 표현 → get_weather_forecast date 값
+DATE_KEYWORDS = {
+    "오늘": "today", "내일": "tomorrow", "이번 주말": "this_weekend", "주말": "this_weekend",
+    "토요일": "this_weekend", "일요일": "this_weekend",
+}
+
+# 사용자가 직접 언급한 날씨 → 실내/실외
+RAINY_KEYWORDS = ["비 오는", "비오는", "비가", "비 와", "비와", "눈 오는", "눈오는", "눈이", "추운", "더운", "미세먼지"]
+CLEAR_KEYWORDS = ["맑은", "맑으면", "화창", "날씨 좋은", "날씨좋은"]
+
+KOREAN_NUMBERS = {"한": 1, "두": 2, "세": 3, "네": 4, "다섯": 5, "여섯": 6, "일곱": 7, "여덟": 8, "아홉": 9, "열": 10}
+# 앞 글자가 한글이면 수사가 아님 ("갈만한 곳"의 "한 곳")
+COUNT_PATTERN = re.compile(r"(?<![가-힣])(\d+|" + "|".join(KOREAN_NUMBERS) + r")\s*(곳|개|군데)")
+
+
+@dataclass
+class Case2Plan:
+    """메시지에서 로컬로 추출한 Case 2 실행 계획"""
+    location: str
+    weather_city: str
+    date: str
+    needs_weather: bool
+    indoor_outdoor: str
+    k: int
+
+
+def _contains_any(text: str, keywords: List[str]) -> bool:
+    return any(kw in text for kw in keywords)
+
+
+def _parse_count(message: str, default: int = 3) -> int:
+    match = COUNT_PATTERN.search(message)
+    if not match:
+        return default
+    raw = match.group(1)
+    count = int(raw) if raw.isdigit() else KOREAN_NUMBERS.get(raw, default)
+    return max(1, min(count, 10))
+
+
+def plan_case2(message: str) -> Optional[Case2Plan]:
+    """
+    메시지가 Case 2(일반 장소/시설 추천)로 확실히 분류되면 실행 계획을, 아니면 None을 반환.
+    LLM 없이 키워드/지역 사전만 사용합니다.
+    """
+    text = (message or "").strip()
+    if not text:
+        return None
+
+    if _contains_any(text, EVENT_KEYWORDS + REVIEW_KEYWORDS + MAP_KEYWORDS):
+        return None
+    if not _contains_any(text, PLACE_KEYWORDS):
+        return None
+
+    location = extract_rag_location(text)
+    weather_city = extract_location(text) or location
+    if not location:
+        # 지역이 없으면 에이전트가 "어느 지역을 찾으시나요?"로 재질문
+        return None
+
+    indoor_outdoor = ""
+    if "실내" in text:
+        indoor_outdoor = "실내"
+    elif "실외" in text or "야외" in text:
+        indoor_outdoor = "실외"
+    elif _contains_any(text, RAINY_KEYWORDS):
+        indoor_outdoor = "실내"
+    elif _contains_any(text, CLEAR_KEYWORDS):
+        indoor_outdoor = "실외"
+
+    date = next((value for kw, value in DATE_KEYWORDS.items() if kw in text), "today")
+    date_mentioned = _contains_any(text, list(DATE_KEYWORDS))
+    weather_asked = "날씨" in text
+    outdoor_intent = _contains_any(text, OUTDOOR_KEYWORDS)
+    indoor_facility = _contains_any(text, INDOOR_FACILITY_KEYWORDS)
+
+    # [날씨 도구 호출 규칙] 날씨를 직접 물었거나, 날짜 + 야외 의도일 때 (명확한 실내/실외 지정 시 생략)
+    needs_weather = weather_asked or (
+        date_mentioned and outdoor_intent and not indoor_outdoor and not indoor_facility
+    )
+    if needs_weather and not weather_city:
+        return None
+
+    return Case2Plan(
+        location=location,
+        weather_city=weather_city or "",
+        date=date,
+        needs_weather=needs_weather,
+        indoor_outdoor=indoor_outdoor,
+        k=_parse_count(text),
+    )
+
+
+def speculative_targets(message: str) -> Dict[str, Optional[str]]:
+    """
+    LLM 의도 파악 전에 미리 시작할 조회 대상.
+    - weather_city: 지역 + (날씨/날짜/야외) 언급 시 날씨 예보
+    - rag_query: 지역 + 장소 추천 키워드 시 원본 질문 임베딩
+    행사/후기/지도 질문은 RAG·날씨를 쓰지 않으므로 대상 없음.
+    """
+    text = (message or "").strip()
+    targets: Dict[str, Optional[str]] = {"weather_city": None, "rag_query": None}
+    if not text or _contains_any(text, EVENT_KEYWORDS + REVIEW_KEYWORDS + MAP_KEYWORDS):
+        return targets
+
+    weather_city = extract_location(text)
+    rag_location = extract_rag_location(text)
+    if not (weather_city or rag_location):
+        return targets
+
+    if weather_city and ("날씨" in text or _contains_any(text, list(DATE_KEYWORDS) + OUTDOOR_KEYWORDS)):
+        targets["weather_city"] = weather_city
+    if _contains_any(text, PLACE_KEYWORDS):
+        targets["rag_query"] = text
+    return targets
+
+
+def _build_answer_context(message: str, child_age: Optional[int], weather: Optional[Dict], facilities: List[Dict]) -> str:
+    lines = [f"사용자 질문: {message}"]
+    if child_age:
+        lines.append(f"아이 나이: {child_age}세")
+    if weather:
+        lines.append(f"날씨 결과: {json.dumps(weather, ensure_ascii=False)}")
+    lines.append(f"시설 검색 결과: {json.dumps(facilities, ensure_ascii=False)}")
+    return "\n".join(lines)
+
+
+class Case2Pipeline:
+    """Case 2 요청을 도구 그래프로 직접 실행하고 LLM 1회로 답변을 생성"""
+
+    def __init__(self, llm=None):
+        self.llm = llm or get_llm("answer")
+        self.callbacks = [ToolTimingCallbackHandler()]
+
+    async def arun(
+        self,
+        plan: Case2Plan,
+        message: str,
+        conversation_id: str,
+        child_age: Optional[int] = None,
+        callbacks: Optional[List[Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        AgentExecutor.ainvoke와 같은 형태({"output", "intermediate_steps"})로 결과를 반환.
+        RAG 결과가 0건(Case 4)이거나 실행 중 오류가 나면 None → 에이전트 폴백.
+        """
+        config = {"callbacks": self.callbacks + list(callbacks or [])}
+        steps = []
+        indoor_outdoor = plan.indoor_outdoor
+        weather = None
+
+        try:
+            # (1) 날씨 확인 (필요 시) - intent는 로컬에서 이미 추출되어 즉시 시작
+            if plan.needs_weather:
+                weather_input = {"city_name": plan.weather_city, "date": plan.date, "conversation_id": conversation_id}
+                weather_output = await get_weather_forecast.ainvoke(weather_input, config=config)
+                steps.append((AgentAction("get_weather_forecast", weather_input, PLANNER_LOG), weather_output))
+
+                weather = json.loads(weather_output)
+                # 사용자가 실내/실외를 직접 지정했다면 그 값을 우선
+                if not indoor_outdoor and weather.get("success") and weather.get("condition"):
+                    indoor_outdoor = weather["condition"]
+
+            # (2) RAG 시설 검색
+            search_input = {
+                "original_query": message,
+                "conversation_id": conversation_id,
+                "location": plan.location,
+                "indoor_outdoor": indoor_outdoor,
+                "k": plan.k,
+            }
+            search_output = await search_facilities.ainvoke(search_input, config=config)
+            steps.append((AgentAction("search_facilities", search_input, PLANNER_LOG), search_output))
+
+            search_result = json.loads(search_output)
+            facilities = search_result.get("facilities") or []
+            if not search_result.get("success") or not facilities:
+                logger.info("[planner] RAG 결과 0건 -> 에이전트 폴백 (Case 4)")
+                return None
+
+            # (3) 최종 답변 (LLM 1회, 스트리밍 엔드포인트로 토큰이 전달되도록 astream 사용)
+            set_status(conversation_id, "답변 작성 중..")
+            chunks = []
+            async for chunk in self.llm.astream(
+                [
+                    SystemMessage(content=PLANNER_ANSWER_PROMPT),
+                    HumanMessage(content=_build_answer_context(message, child_age, weather, facilities)),
+                ],
+                config=config,
+            ):
+                chunks.append(chunk.content if hasattr(chunk, "content") else str(chunk))
+        except Exception as e:
+            logger.error(f"[planner] 파이프라인 실패 -> 에이전트 폴백: {e}")
+            return None
+
+        return {
+            "output": "".join(chunks),
+            "intermediate_steps": steps,
+        }
+
+
+def create_planner() -> Case2Pipeline:
+    """Case 2 결정적 파이프라인 생성"""
+    return Case2Pipeline()
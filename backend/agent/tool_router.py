@@ -0,0 +1,92 @@
+"""
+턴 단위 도구/프롬프트 사전 라우팅
+- LLM 없이 키워드로 이번 턴에 필요한 도구 부분집합과 SYSTEM_PROMPT 섹션을 선택
+- 애매하면(여러 Case 키워드가 섞임, 키워드 없음 등) 전체 도구 + 전체 프롬프트(full)를 사용
+"""
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from agent.planner import EVENT_KEYWORDS, MAP_KEYWORDS, PLACE_KEYWORDS, REVIEW_KEYWORDS
+from agent.prompts import ALL_PROMPT_SECTIONS, ALL_PROMPT_TOOLS
+
+
+@dataclass(frozen=True)
+class AgentRoute:
+    """이번 턴에 에이전트에 노출할 도구와 프롬프트 섹션"""
+    name: str
+    tools: Tuple[str, ...]
+    sections: Tuple[str, ...]
+
+
+FULL_ROUTE = AgentRoute("full", ALL_PROMPT_TOOLS, ALL_PROMPT_SECTIONS)
+
+ROUTES = {
+    # 지도 후속 요청 (직전 검색 결과가 있을 때만)
+    "map": AgentRoute(
+        "map",
+        ("show_map_for_facilities", "search_map_by_address"),
+        ("common", "map", "style"),
+    ),
+    # 날씨만 묻는 질문
+    "weather": AgentRoute(
+        "weather",
+        ("extract_user_intent", "get_weather_forecast"),
+        ("common", "weather", "workflow", "style"),
+    ),
+    # Case 1: 행사/축제 (DB에 상설 전시/체험 시설이 있을 수 있어 RAG도 함께 노출)
+    "event": AgentRoute(
+        "event",
+        ("extract_user_intent", "get_weather_forecast", "search_facilities", "naver_web_search"),
+        ("common", "weather", "case1", "case2", "case4", "workflow", "style"),
+    ),
+    # Case 3: 후기/팁 (행사성 후기는 웹 검색일 수 있어 함께 노출)
+    "review": AgentRoute(
+        "review",
+        ("extract_user_intent", "naver_web_search", "naver_cafe_search"),
+        ("common", "case1", "case3", "workflow", "style"),
+    ),
+    # Case 2 + Case 4(RAG 0건 시 웹 검색 폴백)
+    "place": AgentRoute(
+        "place",
+        ("extract_user_intent", "get_weather_forecast", "search_facilities", "naver_web_search"),
+        ("common", "weather", "case2", "case4", "workflow", "style"),
+    ),
+}
+
+
+def _contains_any(text: str, keywords: List[str]) -> bool:
+    return any(kw in text for kw in keywords)
+
+
+def select_route(message: str, last_result_source: str = "") -> AgentRoute:
+    """메시지(와 직전 검색 출처)로 이번 턴의 도구/프롬프트 부분집합 선택"""
+    text = (message or "").strip()
+    if not text:
+        return FULL_ROUTE
+
+    is_map = _contains_any(text, MAP_KEYWORDS)
+    is_event = _contains_any(text, EVENT_KEYWORDS)
+    is_review = _contains_any(text, REVIEW_KEYWORDS)
+    is_place = _contains_any(text, PLACE_KEYWORDS)
+    is_weather = "날씨" in text
+
+    if is_map:
+        # 직전 검색 결과가 없으면 검색부터 다시 해야 할 수 있으므로 전체 사용
+        if last_result_source and not (is_event or is_review or is_place or is_weather):
+            return ROUTES["map"]
+        return FULL_ROUTE
+
+    if is_event and is_review:
+        return FULL_ROUTE
+    # SYSTEM_PROMPT 우선순위: 행사 키워드가 있으면 Case 1
+    if is_event:
+        return ROUTES["event"]
+    if is_review:
+        # "OO 키즈카페 후기"처럼 시설 검색과 후기 검색이 모두 가능한 경우는 모델이 판단
+        return FULL_ROUTE if (is_weather or is_place) else ROUTES["review"]
+    if is_place:
+        return ROUTES["place"]
+    if is_weather:
+        return ROUTES["weather"]
+    return FULL_ROUTE
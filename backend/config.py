@@ -19,10 +19,144 @@ class Settings(BaseSettings):
     CHROMA_COLLECTION: str = "kid_program_collection_v2"
     
     # 새로운 LLM 백엔드 설정
-    LLM_BACKEND: str = ""  # "auto" | "openai" | "vllm"
+    LLM_BACKEND: str = ""  # "auto" | "openai" | "vllm" | "pool"
     VLLM_ENDPOINT: str = ""
     VLLM_MODEL_NAME: str = "" 
 
+    # pool 모드: OpenAI 호환 엔드포인트 여러 개 (쉼표 구분, 예: "http://gpu1:8000/v1,http://gpu2:8000/v1")
+    LLM_POOL_ENDPOINTS: str = ""
+    LLM_POOL_EJECT_FAILURES: int = 3
+    LLM_POOL_EJECT_SECONDS: float = 30.0
+    # 응답이 풀 p95 지연(최소 MIN_DELAY초)까지 없으면 다른 엔드포인트에 같은 요청을 한 번 더 보냄
+    LLM_POOL_HEDGE_ENABLED: bool = False
+    LLM_POOL_HEDGE_MIN_DELAY: float = 0.5
+
+    # 작업 유형별 OpenAI 모델 (max_tokens/timeout은 models/chat_models.py LLM_TASK_POLICIES)
+    LLM_ANSWER_MODEL: str = "gpt-4o-mini"
+    LLM_EXTRACT_MODEL: str = "gpt-4.1-nano"
+    LLM_SELECT_MODEL: str = "gpt-4o-mini"
+    LLM_SUMMARIZE_MODEL: str = "gpt-4.1-nano"
+
+    # Case 2 결정적 파이프라인 (에이전트 루프 우회)
+    PLANNER_ENABLED: bool = True
+
+    # 의도 파악 전 날씨/임베딩 추측 선행 조회
+    PREFETCH_ENABLED: bool = True
+
+    # 에이전트 한 스텝에서 동시에 실행할 도구 호출 수 상한
+    AGENT_MAX_CONCURRENT_TOOLS: int = 4
+
+    # 대화 히스토리 예산: 최근 N턴은 원문 유지, 그 이전은 누적 요약으로 압축
+    HISTORY_RECENT_TURNS: int = 3
+    HISTORY_TOKEN_BUDGET: int = 1500
+
+    # 도구 결과를 도구별 토큰 예산으로 압축해 scratchpad에 전달
+    TOOL_OUTPUT_BUDGET_ENABLED: bool = True
+
+    # 턴마다 필요한 도구/프롬프트 섹션만 골라 에이전트 실행
+    AGENT_ROUTING_ENABLED: bool = True
+
+    # 지도 후속 요청("N번째 지도 보여줘")은 에이전트 없이 바로 응답
+    MAP_FASTLANE_ENABLED: bool = True
+
+    # 로컬 Case 분류기 (관련 없음/날씨 전용 질문 직접 응답, 그 외 에이전트 힌트)
+    CASE_CLASSIFIER_ENABLED: bool = True
+    CASE_DIRECT_ANSWER_THRESHOLD: float = 0.6
+    CASE_HINT_THRESHOLD: float = 0.6
+
+    # 첫 턴 응답 캐시 (exact + 임베딩 유사도 semantic)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_SEMANTIC_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_SIZE: int = 512
+    RESPONSE_CACHE_SEMANTIC_THRESHOLD: float = 0.95
+    # 캐시 키 구성(날씨 예보)/임베딩을 기다리는 최대 시간 (초과 시 캐시 건너뜀)
+    RESPONSE_CACHE_WAIT_SECONDS: float = 0.3
+
+    # 동시 쿼리 임베딩 micro-batching (WINDOW_MS 안에 들어온 요청을 최대 MAX_SIZE개씩 한 번에 호출)
+    EMBEDDING_BATCH_ENABLED: bool = True
+    EMBEDDING_BATCH_WINDOW_MS: float = 8.0
+    EMBEDDING_BATCH_MAX_SIZE: int = 64
+
+    # 카페 후기 본문 꿀팁 요약: 동시 실행 수(1이면 순차)와 글당 timeout(초)
+    CAFE_SUMMARY_CONCURRENCY: int = 3
+    CAFE_SUMMARY_TIMEOUT: float = 8.0
+
+    # 맘카페 캐시: 검색 API 응답/선별 결과(짧게), 추출 본문(길게), 크롤링 실패/차단 URL, 꿀팁 요약 (TTL 초)
+    CAFE_CACHE_ENABLED: bool = True
+    CAFE_SEARCH_CACHE_TTL: float = 600.0
+    CAFE_SEARCH_CACHE_SIZE: int = 512
+    CAFE_ARTICLE_CACHE_TTL: float = 24 * 3600.0
+    CAFE_ARTICLE_CACHE_SIZE: int = 2048
+    CAFE_NEGATIVE_CACHE_TTL: float = 600.0
+    CAFE_TIP_CACHE_TTL: float = 7 * 24 * 3600.0
+
+    # 앱 공유 aiohttp 세션 (연결 재사용, DNS 캐시 초, 전체/호스트별 동시 연결 상한)
+    HTTP_POOL_LIMIT: int = 100
+    HTTP_POOL_LIMIT_PER_HOST: int = 20
+    HTTP_DNS_CACHE_TTL: int = 300
+    HTTP_KEEPALIVE_TIMEOUT: float = 30.0
+    HTTP_DEFAULT_TIMEOUT: float = 10.0
+
+    # Perplexity 행사 검색: 공유 async 클라이언트 timeout(초)/재시도 수, (질의, 오늘 날짜) 결과 캐시 (자정 만료)
+    PERPLEXITY_TIMEOUT: float = 40.0
+    PERPLEXITY_MAX_RETRIES: int = 1
+    PERPLEXITY_CACHE_ENABLED: bool = True
+    PERPLEXITY_CACHE_SIZE: int = 512
+
+    # Case 1 행사 인덱스: 지역(쉼표 구분) × 구간(today/this_week/this_weekend/next_weekend)을
+    # REFRESH_INTERVAL초마다 백그라운드로 미리 조회 (MAX_AGE초보다 오래된 항목은 쓰지 않음, PERPLEXITY_API_KEY 필요)
+    EVENT_INDEX_ENABLED: bool = True
+    EVENT_INDEX_REGIONS: str = "서울,경기,인천,부산,제주"
+    EVENT_INDEX_WINDOWS: str = "this_week,this_weekend,next_weekend"
+    EVENT_INDEX_REFRESH_INTERVAL: float = 6 * 3600.0
+    EVENT_INDEX_REFRESH_CONCURRENCY: int = 2
+    EVENT_INDEX_MAX_AGE: float = 12 * 3600.0
+
+    # 날씨 예보: API timeout(초), 도시별 예보 캐시 (다음 3시간 단위 갱신 + GRACE초까지 유지)
+    WEATHER_TIMEOUT: float = 5.0
+    WEATHER_CACHE_ENABLED: bool = True
+    WEATHER_CACHE_SIZE: int = 256
+    WEATHER_UPDATE_GRACE_SECONDS: float = 600.0
+
+    # 날씨 예보 백그라운드 갱신: 최근 DEMAND_WINDOW초 조회 상위 TOP_N 도시(부족하면 기본 도시)를
+    # 만료 LEAD + 0~JITTER초 전에 미리 조회 (LEAD + JITTER < WEATHER_UPDATE_GRACE_SECONDS 권장)
+    # 외부 호출이 최근 1시간 BUDGET_PER_HOUR회에 닿으면 백그라운드 갱신 중단
+    WEATHER_PREFETCH_ENABLED: bool = True
+    WEATHER_PREFETCH_TOP_N: int = 20
+    WEATHER_PREFETCH_DEFAULT_CITIES: str = "서울,부산,인천,대구,대전,광주,수원,제주"
+    WEATHER_PREFETCH_DEMAND_WINDOW: float = 6 * 3600.0
+    WEATHER_PREFETCH_LEAD_SECONDS: float = 120.0
+    WEATHER_PREFETCH_JITTER_SECONDS: float = 300.0
+    WEATHER_PREFETCH_TICK_SECONDS: float = 30.0
+    WEATHER_PROVIDER_BUDGET_PER_HOUR: int = 300
+
+    # 장소 지오코딩: Kakao 키워드 검색 timeout(초), 질의별 결과 캐시(찾지 못한 결과는 NEGATIVE_TTL초)
+    # 캐시는 서버 종료 시 CACHE_PATH에 저장하고 시작 시 다시 읽음 (빈 값이면 저장 안 함)
+    # GAZETTEER_ENABLED면 벡터 DB 메타데이터의 시설명/좌표에서 먼저 찾음
+    GEOCODE_TIMEOUT: float = 5.0
+    GEOCODE_CACHE_ENABLED: bool = True
+    GEOCODE_CACHE_SIZE: int = 4096
+    GEOCODE_CACHE_TTL: float = 7 * 24 * 3600.0
+    GEOCODE_NEGATIVE_TTL: float = 24 * 3600.0
+    GEOCODE_CACHE_PATH: str = ".cache/geocode_cache.json"
+    GEOCODE_GAZETTEER_ENABLED: bool = True
+    # 웹 검색 결과 저장 시 장소 좌표를 백그라운드로 미리 지오코딩 (지도 후속 요청은 WAIT초까지만 기다림)
+    LOCATION_PREFETCH_ENABLED: bool = True
+    LOCATION_PREFETCH_WAIT_SECONDS: float = 5.0
+
+    # 인기 시설 맘카페 후기 요약: 최근 DEMAND_WINDOW초 후기 질문이 많은 상위 TOP_N 시설(부족하면 기본 시설)의
+    # 후기 파이프라인을 INTERVAL초마다 확인해 요약이 없거나 REFRESH_AFTER초 지난 시설만 다시 생성
+    # MAX_AGE초 안의 요약은 naver_cafe_search가 바로 사용 (서버 종료 시 PATH에 저장하고 시작 시 읽음, 네이버 API 키 필요)
+    REVIEW_DIGEST_ENABLED: bool = True
+    REVIEW_DIGEST_TOP_N: int = 20
+    REVIEW_DIGEST_DEFAULT_FACILITIES: str = "에버랜드,롯데월드,서울숲,국립중앙박물관,국립과천과학관"
+    REVIEW_DIGEST_DEMAND_WINDOW: float = 24 * 3600.0
+    REVIEW_DIGEST_REFRESH_AFTER: float = 24 * 3600.0
+    REVIEW_DIGEST_MAX_AGE: float = 3 * 24 * 3600.0
+    REVIEW_DIGEST_INTERVAL: float = 1800.0
+    REVIEW_DIGEST_CONCURRENCY: int = 2
+    REVIEW_DIGEST_PATH: str = ".cache/review_digests.json"
+
     SUPABASE_URL: str = ""
     SUPABASE_KEY: str = ""
     
@@ -3,6 +3,27 @@ from fastapi.middleware.cors import CORSMiddleware
 from routers import chat_router  # 수정
 import requests
 from config import settings
+from models.chat_models import get_llm_pool_stats
+from tools.event_index import get_event_index_stats, start_event_index_refresher, stop_event_index_refresher
+from tools.facility_gazetteer import get_gazetteer_stats, start_gazetteer_load
+from tools.geocoding_tool import get_geocode_cache_stats, load_geocode_cache, save_geocode_cache
+from tools.naver_cafe_search_tool import get_cafe_cache_stats
+from tools.perplexity_client import close_perplexity_client, get_perplexity_cache_stats
+from tools.review_digest import (
+    get_review_digest_stats,
+    load_review_digests,
+    save_review_digests,
+    start_review_digest_builder,
+    stop_review_digest_builder,
+)
+from tools.weather_prefetch import get_weather_prefetch_stats, start_weather_prefetch, stop_weather_prefetch
+from tools.weather_tool import get_weather_cache_stats
+from utils.http_session import close_http_session
+from utils.location_prefetch import get_location_prefetch_stats
+from utils.metrics import snapshot as metrics_snapshot
+from utils.prefetch import get_prefetch_stats
+from utils.response_cache import get_response_cache_stats
+from utils.singleflight import get_singleflight_stats
 from routers.facilities_router import router as facilities_router
 from routers.programs_router import router as programs_router
 
@@ -21,7 +42,57 @@ app.include_router(facilities_router, tags=["facilities"])
 app.include_router(programs_router, tags=["programs"])
 
 
+@app.on_event("startup")
+async def startup():
+    if settings.GEOCODE_CACHE_ENABLED:
+        load_geocode_cache()
+    if settings.GEOCODE_GAZETTEER_ENABLED:
+        start_gazetteer_load()
+    if settings.REVIEW_DIGEST_ENABLED:
+        load_review_digests()
+        if settings.NAVER_CLIENT_ID and settings.NAVER_CLIENT_SECRET:
+            start_review_digest_builder()
+    if settings.EVENT_INDEX_ENABLED and settings.PERPLEXITY_API_KEY:
+        start_event_index_refresher()
+    if settings.WEATHER_PREFETCH_ENABLED and settings.WEATHER_CACHE_ENABLED and settings.OPENWEATHER_API_KEY:
+        start_weather_prefetch()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_event_index_refresher()
+    await stop_weather_prefetch()
+    await stop_review_digest_builder()
+    await close_http_session()
+    await close_perplexity_client()
+    if settings.GEOCODE_CACHE_ENABLED:
+        save_geocode_cache()
+    if settings.REVIEW_DIGEST_ENABLED:
+        save_review_digests()
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+
+@app.get("/metrics")
+async def metrics():
+    """경로별 지연 시간(p50/p95), LLM 호출 수, 카운터, 선행 조회 / 응답 캐시 / 맘카페 / Perplexity / 날씨 예보 / 지오코딩 캐시 적중률, 행사 인덱스, 시설 지명 사전, 검색 결과 좌표 선행 조회, 맘카페 후기 요약, LLM 풀 상태"""
+    return {
+        **metrics_snapshot(),
+        "prefetch": get_prefetch_stats(),
+        "response_cache": get_response_cache_stats(),
+        "llm_pool": get_llm_pool_stats(),
+        "cafe_cache": get_cafe_cache_stats(),
+        "perplexity_cache": get_perplexity_cache_stats(),
+        "event_index": get_event_index_stats(),
+        "weather_cache": get_weather_cache_stats(),
+        "weather_prefetch": get_weather_prefetch_stats(),
+        "geocode_cache": get_geocode_cache_stats(),
+        "gazetteer": get_gazetteer_stats(),
+        "location_prefetch": get_location_prefetch_stats(),
+        "review_digest": get_review_digest_stats(),
+        "singleflight": get_singleflight_stats(),
+    }
+
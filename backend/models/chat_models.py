@@ -1,31 +1,152 @@
 from langchain_openai import ChatOpenAI
 from langchain_community.llms import HuggingFacePipeline
+from langchain_core.callbacks import BaseCallbackHandler
 from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline, BitsAndBytesConfig
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from uuid import UUID
 import torch
+import httpx
 import requests
 import logging
+import time
 from config import settings
+from models.llm_pool import POOL_BASE_URL, LLMEndpointPool, PoolAsyncTransport, PoolTransport, parse_endpoints
+from utils.metrics import incr, record_request
 
 logger = logging.getLogger(__name__)
 
-def get_llm():
-    if settings.LLM_BACKEND == "auto":
-        try:
-            response = requests.get(f"{settings.VLLM_ENDPOINT}/models", timeout=2)
-            if response.status_code == 200:
-                print(f"✅ vLLM 서버 감지됨: {settings.VLLM_ENDPOINT}")
-                return ChatOpenAI(
-                    model=settings.VLLM_MODEL_NAME,
-                    openai_api_key="EMPTY",
-                    base_url=settings.VLLM_ENDPOINT,
-                    temperature=0.7,
-                )
-        except Exception as e:
-            print(f"⚠️ vLLM 서버 연결 실패, OpenAI로 폴백: {e}")
-    
-    # OpenAI 사용 (auto 실패 시 또는 openai 모드)
+
+@dataclass(frozen=True)
+class LLMTaskPolicy:
+    """작업 유형별 모델 설정 (모델명은 settings.LLM_{TASK}_MODEL)"""
+    temperature: float
+    max_tokens: Optional[int]
+    timeout: float
+
+
+# 작업 유형별 정책
+# - answer: 에이전트/planner 최종 답변 (도구 선택 포함)
+# - extract: extract_user_intent 같은 짧은 JSON 추출
+# - select: 카페 글 중 후기 3개 선별 (JSON 목록)
+# - summarize: 카페 본문 한 줄 꿀팁, 대화 히스토리 요약
+LLM_TASK_POLICIES: Dict[str, LLMTaskPolicy] = {
+    "answer": LLMTaskPolicy(temperature=0.3, max_tokens=None, timeout=60),
+    "extract": LLMTaskPolicy(temperature=0.0, max_tokens=200, timeout=10),
+    "select": LLMTaskPolicy(temperature=0.0, max_tokens=800, timeout=15),
+    "summarize": LLMTaskPolicy(temperature=0.3, max_tokens=300, timeout=15),
+}
+
+
+def get_task_model(task: str) -> str:
+    return getattr(settings, f"LLM_{task.upper()}_MODEL")
+
+
+class LLMTaskTimingHandler(BaseCallbackHandler):
+    """작업 유형별 LLM 호출 지연 기록 (/metrics의 paths["llm:{task}"])"""
+
+    def __init__(self, task: str):
+        self.task = task
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages, *, run_id: UUID, **kwargs: Any):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any):
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            record_request(f"llm:{self.task}", time.perf_counter() - started)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        self._started.pop(run_id, None)
+        incr(f"llm.{self.task}.errors")
+
+
+@lru_cache(maxsize=1)
+def _vllm_available() -> bool:
+    """vLLM 서버 감지 (프로세스당 1회, 호출마다 헬스 체크하지 않음)"""
+    try:
+        response = requests.get(f"{settings.VLLM_ENDPOINT}/models", timeout=2)
+        if response.status_code == 200:
+            print(f"✅ vLLM 서버 감지됨: {settings.VLLM_ENDPOINT}")
+            return True
+    except Exception as e:
+        print(f"⚠️ vLLM 서버 연결 실패, OpenAI로 폴백: {e}")
+    return False
+
+
+@lru_cache(maxsize=1)
+def get_llm_pool() -> Optional[LLMEndpointPool]:
+    """pool 모드 엔드포인트 풀 (프로세스당 1개, 모든 작업이 공유)"""
+    endpoints = parse_endpoints(settings.LLM_POOL_ENDPOINTS)
+    if settings.LLM_BACKEND != "pool" or not endpoints:
+        return None
+    print(f"✅ LLM 풀 구성: {len(endpoints)}개 엔드포인트 (hedging {'on' if settings.LLM_POOL_HEDGE_ENABLED else 'off'})")
+    return LLMEndpointPool(
+        endpoints,
+        eject_failures=settings.LLM_POOL_EJECT_FAILURES,
+        eject_seconds=settings.LLM_POOL_EJECT_SECONDS,
+        hedge_enabled=settings.LLM_POOL_HEDGE_ENABLED,
+        hedge_min_delay=settings.LLM_POOL_HEDGE_MIN_DELAY,
+    )
+
+
+def get_llm_pool_stats() -> Optional[Dict[str, Any]]:
+    pool = get_llm_pool()
+    return pool.stats() if pool else None
+
+
+def _openai_llm(task: str, callbacks: list) -> ChatOpenAI:
+    policy = LLM_TASK_POLICIES[task]
     return ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.3,
-        openai_api_key=settings.OPENAI_API_KEY
-    )
\ No newline at end of file
+        model=get_task_model(task),
+        temperature=policy.temperature,
+        max_tokens=policy.max_tokens,
+        timeout=policy.timeout,
+        openai_api_key=settings.OPENAI_API_KEY,
+        callbacks=callbacks,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_llm(task: str = "answer"):
+    """
+    작업 유형(answer/extract/select/summarize)에 맞는 모델, max_tokens, timeout으로 LLM 생성.
+    작업별로 1개만 만들어 재사용합니다.
+    """
+    policy = LLM_TASK_POLICIES[task]
+    callbacks = [LLMTaskTimingHandler(task)]
+
+    pool = get_llm_pool()
+    if pool is not None:
+        # 풀 멤버를 모두 써도 실패하면(openai 클라이언트 재시도 포함) OpenAI로 폴백
+        pooled = ChatOpenAI(
+            model=settings.VLLM_MODEL_NAME,
+            openai_api_key="EMPTY",
+            base_url=POOL_BASE_URL,
+            temperature=0.7,
+            max_tokens=policy.max_tokens,
+            timeout=policy.timeout,
+            callbacks=callbacks,
+            http_client=httpx.Client(transport=PoolTransport(pool)),
+            http_async_client=httpx.AsyncClient(transport=PoolAsyncTransport(pool)),
+        )
+        if not settings.OPENAI_API_KEY:
+            return pooled
+        return pooled.with_fallbacks([_openai_llm(task, callbacks)])
+
+    if settings.LLM_BACKEND == "auto" and _vllm_available():
+        # vLLM은 서빙 중인 모델 1개를 모든 작업에 사용 (출력 길이/timeout만 작업별로 적용)
+        return ChatOpenAI(
+            model=settings.VLLM_MODEL_NAME,
+            openai_api_key="EMPTY",
+            base_url=settings.VLLM_ENDPOINT,
+            temperature=0.7,
+            max_tokens=policy.max_tokens,
+            timeout=policy.timeout,
+            callbacks=callbacks,
+        )
+
+    # OpenAI 사용 (auto 실패 시 또는 openai 모드)
+    return _openai_llm(task, callbacks)
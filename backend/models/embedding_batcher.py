@@ -0,0 +1,82 @@
+"""
+동시 쿼리 임베딩 micro-batching
+- 짧은 구간(window) 안에 들어온 aembed_query 요청을 모아 임베딩 API 1회(배치)로 처리하고 결과를 나눠 줌
+- 첫 요청이 들어온 뒤 window가 지나거나 max_batch_size개가 모이면 바로 전송
+  → 배치 대기로 늘어나는 지연은 요청당 최대 window
+- 같은 텍스트는 배치 안에서 한 번만 보냄
+- 요청마다 자기 future를 기다리므로 호출 측이 취소해도 같은 배치의 다른 요청에는 영향 없음
+  (전송 전에 모두 취소된 텍스트는 배치에서 빠짐)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from utils.metrics import incr, record_request
+
+logger = logging.getLogger(__name__)
+
+EmbedBatchFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+class EmbeddingBatcher:
+    def __init__(self, embed_batch: EmbedBatchFn, max_batch_size: int = 64, window: float = 0.008):
+        self.embed_batch = embed_batch
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # 이벤트 루프가 바뀌면(테스트/스크립트의 asyncio.run 반복) 이전 루프의 대기 상태는 버림
+            self._loop, self._pending, self._timer = loop, {}, None
+
+        future = loop.create_future()
+        self._pending.setdefault(text, []).append(future)
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+
+        batch = {text: [f for f in futures if not f.done()] for text, futures in pending.items()}
+        batch = {text: futures for text, futures in batch.items() if futures}
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, batch: Dict[str, List[asyncio.Future]]):
+        texts = list(batch)
+        started = time.perf_counter()
+        try:
+            embeddings = await self.embed_batch(texts)
+        except Exception as e:
+            incr("embedding_batch.errors")
+            logger.error(f"❌ [EMBED BATCH] 배치 임베딩 실패 ({len(texts)}개): {e}")
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        record_request("embedding_batch", time.perf_counter() - started)
+        incr("embedding_batch.batches")
+        incr("embedding_batch.texts", len(texts))
+        incr("embedding_batch.requests", sum(len(futures) for futures in batch.values()))
+        for text, embedding in zip(texts, embeddings):
+            for future in batch[text]:
+                if not future.done():
+                    future.set_result(embedding)
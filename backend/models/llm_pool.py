@@ -0,0 +1,383 @@
+"""
+OpenAI 호환 LLM 엔드포인트 풀 (vLLM 여러 대 등)
+- ChatOpenAI의 httpx transport로 끼워 넣어 요청마다 멤버를 고름 (도구 바인딩/스트리밍은 그대로 동작)
+  ChatOpenAI base_url은 가상 주소(POOL_BASE_URL)로 두고, transport가 실제 멤버 주소로 바꿔 보냄
+- 라우팅: (진행 중 요청 수 + 1) × 관측 지연(EWMA)이 가장 작은 멤버 (아직 관측 없는 멤버는 풀 평균 지연으로 계산)
+- 연결 오류/timeout/5xx/429면 아직 안 보낸 멤버로 바로 다시 보냄 (모두 실패하면 오류를 그대로 전달)
+- 연속 실패가 eject_failures번이면 eject_seconds 동안 제외,
+  이후 재시험 요청이 실패하면 제외 시간을 두 배로 (최대 MAX_EJECT_SECONDS)
+- hedging(비동기만): 응답 헤더가 풀 전체 p95 지연(최소 hedge_min_delay)까지 안 오면
+  다른 멤버에 같은 요청을 보내 먼저 온 응답 사용, 나머지는 취소
+- 지연은 응답 헤더 도착까지 (스트리밍이면 첫 청크 전후), 진행 중 수는 본문을 다 읽거나 닫을 때까지
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+import httpx
+
+from utils.metrics import incr, percentile
+
+logger = logging.getLogger(__name__)
+
+# ChatOpenAI에 넘기는 가상 base_url (transport가 멤버 주소로 바꿈)
+POOL_BASE_URL = "http://llm-pool/v1"
+POOL_PATH_PREFIX = "/v1"
+
+# 관측 지연이 없는 멤버의 초기 추정값 (초)
+DEFAULT_LATENCY = 1.0
+LATENCY_ALPHA = 0.3
+LATENCY_SAMPLES = 200
+# p95 기반 hedge 지연을 쓰기 위한 최소 표본 수
+HEDGE_MIN_SAMPLES = 20
+MAX_EJECT_SECONDS = 300.0
+
+
+class PoolMember:
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint.rstrip("/")
+        self.url = httpx.URL(self.endpoint)
+        self.outstanding = 0
+        self.latency_ewma: Optional[float] = None
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.eject_seconds = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    def is_ejected(self, now: float) -> bool:
+        return self.ejected_until > now
+
+    def score(self, default_latency: float) -> float:
+        return (self.outstanding + 1) * (self.latency_ewma or default_latency)
+
+    def stats(self, now: float) -> Dict[str, Any]:
+        return {
+            "endpoint": self.endpoint,
+            "outstanding": self.outstanding,
+            "latency_ewma": self.latency_ewma,
+            "p95": percentile(list(self.latencies), 95),
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+            "ejected": self.is_ejected(now),
+        }
+
+
+class LLMEndpointPool:
+    def __init__(
+        self,
+        endpoints: Iterable[str],
+        eject_failures: int = 3,
+        eject_seconds: float = 30.0,
+        hedge_enabled: bool = False,
+        hedge_min_delay: float = 0.5,
+    ):
+        self.members: List[PoolMember] = [PoolMember(e) for e in endpoints if e.strip()]
+        if not self.members:
+            raise ValueError("LLM 풀 엔드포인트가 비어 있습니다")
+        self.eject_failures = eject_failures
+        self.base_eject_seconds = eject_seconds
+        self.hedge_enabled = hedge_enabled and len(self.members) > 1
+        self.hedge_min_delay = hedge_min_delay
+        self._recent: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+
+    def acquire(self, exclude: Iterable[PoolMember] = ()) -> Optional[PoolMember]:
+        """점수가 가장 낮은 멤버를 골라 진행 중 수를 올림 (모두 제외 상태면 가장 먼저 풀리는 멤버로 재시험)"""
+        excluded = set(id(m) for m in exclude)
+        now = time.monotonic()
+        with self._lock:
+            candidates = [m for m in self.members if id(m) not in excluded]
+            if not candidates:
+                return None
+            healthy = [m for m in candidates if not m.is_ejected(now)]
+            if healthy:
+                observed = [m.latency_ewma for m in self.members if m.latency_ewma is not None]
+                default_latency = (sum(observed) / len(observed)) if observed else DEFAULT_LATENCY
+                scores = [(m.score(default_latency), m) for m in healthy]
+                best = min(score for score, _ in scores)
+                member = random.choice([m for score, m in scores if score == best])
+            else:
+                member = min(candidates, key=lambda m: m.ejected_until)
+            member.outstanding += 1
+            member.requests += 1
+        return member
+
+    def release(self, member: PoolMember):
+        with self._lock:
+            member.outstanding = max(0, member.outstanding - 1)
+
+    def record_success(self, member: PoolMember, latency: float):
+        with self._lock:
+            member.latencies.append(latency)
+            self._recent.append(latency)
+            if member.latency_ewma is None:
+                member.latency_ewma = latency
+            else:
+                member.latency_ewma = LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * member.latency_ewma
+            readmitted = member.eject_seconds > 0
+            member.consecutive_failures = 0
+            member.eject_seconds = 0.0
+        if readmitted:
+            incr("llm_pool.readmitted")
+            logger.info(f"✅ [LLM POOL] 재투입: {member.endpoint}")
+
+    def record_failure(self, member: PoolMember, reason: str):
+        now = time.monotonic()
+        with self._lock:
+            member.failures += 1
+            member.consecutive_failures += 1
+            probing = member.eject_seconds > 0
+            if member.is_ejected(now):
+                # 제외 전에 보낸 요청들의 실패 → 제외 시간은 그대로
+                ejected = False
+            elif not probing and member.consecutive_failures < self.eject_failures:
+                ejected = False
+            else:
+                # 재시험 실패면 제외 시간 두 배
+                member.eject_seconds = (
+                    min(member.eject_seconds * 2, MAX_EJECT_SECONDS) if probing else self.base_eject_seconds
+                )
+                member.ejected_until = now + member.eject_seconds
+                member.ejections += 1
+                ejected = True
+        incr("llm_pool.failures")
+        if ejected:
+            incr("llm_pool.ejected")
+            logger.warning(
+                f"⚠️ [LLM POOL] 제외: {member.endpoint} ({reason}) {member.eject_seconds:.0f}초 후 재시험"
+            )
+
+    def hedge_delay(self) -> float:
+        with self._lock:
+            recent = list(self._recent)
+        if len(recent) < HEDGE_MIN_SAMPLES:
+            return max(self.hedge_min_delay, DEFAULT_LATENCY)
+        return max(self.hedge_min_delay, percentile(recent, 95))
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            members = [m.stats(now) for m in self.members]
+        return {"hedge_enabled": self.hedge_enabled, "hedge_delay": self.hedge_delay(), "members": members}
+
+
+def _is_failure(response: httpx.Response) -> bool:
+    return response.status_code >= 500 or response.status_code == 429
+
+
+def _member_request(member: PoolMember, request: httpx.Request) -> httpx.Request:
+    """가상 주소 요청을 멤버 주소로 복사 (Host 헤더는 새 URL 기준으로 다시 계산)"""
+    path = request.url.path
+    if path.startswith(POOL_PATH_PREFIX):
+        path = path[len(POOL_PATH_PREFIX):]
+    url = member.url.copy_with(path=member.url.path.rstrip("/") + path, query=request.url.query or None)
+    headers = [(k, v) for k, v in request.headers.multi_items() if k.lower() != "host"]
+    return httpx.Request(request.method, url, headers=headers, content=request.content, extensions=request.extensions)
+
+
+class _ReleasingSyncStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._on_close()
+
+
+class _ReleasingAsyncStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._on_close()
+
+
+def _once(fn):
+    called = False
+
+    def wrapper():
+        nonlocal called
+        if not called:
+            called = True
+            fn()
+
+    return wrapper
+
+
+class PoolTransport(httpx.BaseTransport):
+    """동기 호출(invoke)용 transport (hedging 없음)"""
+
+    def __init__(self, pool: LLMEndpointPool, transport: Optional[httpx.BaseTransport] = None):
+        self.pool = pool
+        self._transport = transport or httpx.HTTPTransport()
+
+    def _send(self, member: PoolMember, request: httpx.Request) -> httpx.Response:
+        release = _once(lambda: self.pool.release(member))
+        started = time.perf_counter()
+        try:
+            response = self._transport.handle_request(_member_request(member, request))
+        except Exception as e:
+            release()
+            self.pool.record_failure(member, type(e).__name__)
+            raise
+        if _is_failure(response):
+            self.pool.record_failure(member, f"HTTP {response.status_code}")
+        else:
+            self.pool.record_success(member, time.perf_counter() - started)
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_ReleasingSyncStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        tried: List[PoolMember] = []
+        while True:
+            member = self.pool.acquire(exclude=tried)
+            tried.append(member)
+            last = len(tried) >= len(self.pool.members)
+            try:
+                response = self._send(member, request)
+            except httpx.TransportError:
+                if last:
+                    raise
+                incr("llm_pool.failover")
+                continue
+            if _is_failure(response) and not last:
+                response.close()
+                incr("llm_pool.failover")
+                continue
+            return response
+
+    def close(self):
+        self._transport.close()
+
+
+class PoolAsyncTransport(httpx.AsyncBaseTransport):
+    """비동기 호출(ainvoke/astream)용 transport (hedging 지원)"""
+
+    def __init__(self, pool: LLMEndpointPool, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.pool = pool
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def _send(self, member: PoolMember, request: httpx.Request) -> httpx.Response:
+        release = _once(lambda: self.pool.release(member))
+        started = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(_member_request(member, request))
+        except BaseException as e:
+            release()
+            if not isinstance(e, asyncio.CancelledError):
+                self.pool.record_failure(member, type(e).__name__)
+            raise
+        if _is_failure(response):
+            self.pool.record_failure(member, f"HTTP {response.status_code}")
+        else:
+            self.pool.record_success(member, time.perf_counter() - started)
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_ReleasingAsyncStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    async def _send_with_failover(self, request: httpx.Request, tried: List[PoolMember]) -> httpx.Response:
+        """연결 오류/5xx면 아직 안 보낸 멤버로 바로 다시 보냄 (tried는 hedged 요청과 공유)"""
+        while True:
+            member = self.pool.acquire(exclude=tried)
+            if member is None:
+                raise httpx.ConnectError("LLM 풀에 보낼 수 있는 멤버가 없습니다", request=request)
+            tried.append(member)
+            last = len(tried) >= len(self.pool.members)
+            try:
+                response = await self._send(member, request)
+            except httpx.TransportError:
+                if last:
+                    raise
+                incr("llm_pool.failover")
+                continue
+            if _is_failure(response) and not last:
+                await response.aclose()
+                incr("llm_pool.failover")
+                continue
+            return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        tried: List[PoolMember] = []
+        if not self.pool.hedge_enabled:
+            return await self._send_with_failover(request, tried)
+
+        first = asyncio.ensure_future(self._send_with_failover(request, tried))
+        try:
+            done, _ = await asyncio.wait({first}, timeout=self.pool.hedge_delay())
+        except asyncio.CancelledError:
+            first.cancel()
+            raise
+        if done or len(tried) >= len(self.pool.members):
+            return await first
+
+        incr("llm_pool.hedged")
+        second = asyncio.ensure_future(self._send_with_failover(request, tried))
+        return await self._first_success(first, second)
+
+    async def _first_success(self, first: asyncio.Future, second: asyncio.Future) -> httpx.Response:
+        """먼저 성공한 응답 사용, 나머지는 취소(이미 받은 응답이면 닫음). 둘 다 실패하면 먼저 시작한 쪽 결과"""
+        pending = {first, second}
+        winner = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and not _is_failure(task.result()):
+                        winner = task
+                        break
+        finally:
+            # 둘 다 실패로 끝났으면 먼저 시작한 쪽 결과를 그대로 돌려주므로 닫지 않음
+            keep = winner or (first if not pending else None)
+            for task in (first, second):
+                if task is keep:
+                    continue
+                if not task.done():
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                elif not task.cancelled() and task.exception() is None:
+                    await task.result().aclose()
+        if winner is None:
+            # 둘 다 실패 → 먼저 시작한 요청의 결과(예외/5xx)를 전달해 openai 클라이언트가 재시도
+            return first.result()
+        if winner is second:
+            incr("llm_pool.hedge_won")
+        return winner.result()
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def parse_endpoints(value: str) -> List[str]:
+    return [e.strip() for e in (value or "").split(",") if e.strip()]
@@ -1,5 +1,7 @@
 from langchain_openai import OpenAIEmbeddings
 from config import settings
+from models.embedding_batcher import EmbeddingBatcher
+from utils.singleflight import SingleFlight, request_signature
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,20 +21,36 @@ class OpenAIEmbeddingWrapper:
         except Exception as e:
             logger.error(f"❌ OpenAI Embeddings 초기화 실패: {e}")
             raise
-        
+        # 동시에 들어온 쿼리 임베딩을 모아 API 1회로 처리
+        self.batcher = EmbeddingBatcher(
+            self._aembed_batch,
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            window=settings.EMBEDDING_BATCH_WINDOW_MS / 1000,
+        )
+        # 배치 구간이 지난 뒤에 들어온 같은 쿼리도 진행 중인 임베딩 호출을 공유
+        self.flight: SingleFlight[list[float]] = SingleFlight("embedding")
+
+    async def _aembed_batch(self, texts: list[str]) -> list[list[float]]:
+        return await self.embeddings.aembed_documents(texts)
+
     async def aembed_query(self, text: str) -> list[float]:
         """
         쿼리 텍스트를 비동기로 임베딩 변환
         """
         try:
-            # langchain_openai의 aembed_query 사용
-            embedding = await self.embeddings.aembed_query(text)
+            embedding = await self.flight.do(request_signature(text), lambda: self._aembed_query(text))
             logger.info(f"✅ (Async) 쿼리 임베딩 생성 완료: {len(embedding)}차원")
             return embedding
         except Exception as e:
             logger.error(f"❌ (Async) 쿼리 임베딩 생성 실패: {e}")
             raise
     
+    async def _aembed_query(self, text: str) -> list[float]:
+        if settings.EMBEDDING_BATCH_ENABLED:
+            return await self.batcher.embed(text)
+        # langchain_openai의 aembed_query 사용
+        return await self.embeddings.aembed_query(text)
+
     def embed_query(self, text: str) -> list[float]:
         """
         쿼리 텍스트를 임베딩으로 변환
@@ -1,71 +1,218 @@
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
+from langchain_core.messages import SystemMessage
 from models.schemas import ChatRequest, ChatResponse
-from models.map_models import MapResponse, MapData, MapMarker, MapCenter
-from agent import create_agent
+from models.map_models import MapResponse
+from agent import create_planner, create_routed_agent, plan_case2, speculative_targets
+from agent.callbacks import ChatStreamCallbackHandler, LLMCallCounterHandler
+from agent.map_fastlane import answer_map_followup, build_map_data
+from agent.case_classifier import LABEL_DESCRIPTIONS, get_case_classifier, predict_case
+from agent.direct_answer import answer_directly
+from agent.prompts import CASE_HINT_PROMPT
+from agent.output_budget import scratchpad_tokens
+from config import settings
+from models.pca_embeddings import pca_embeddings
+from tools.rag_tool import embedding_prefetch_key
+from tools.weather_tool import fetch_forecast, weather_prefetch_key
+from utils.history_manager import build_prompt_history, schedule_fold
+from utils.metrics import incr, record_request
+from utils.prefetch import finish_prefetch, start_prefetch
+from utils.response_cache import build_lookup, lookup_response, store_response
 from utils.conversation_memory import (
-    get_conversation_history,
     add_message,
     save_search_results,
+    format_search_result_summary,
     set_status,
     get_status,
+    clear_status,
+    subscribe_status,
+    unsubscribe_status,
     get_last_result_source,
+    is_first_turn,
 )
+from typing import List, Optional
 import json
 import logging
 import uuid
 import asyncio
+import time
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-agent_executor = create_agent()
+# 턴마다 필요한 도구/프롬프트 섹션만 노출하는 에이전트
+agent_executor = create_routed_agent()
+case2_pipeline = create_planner()
+# 로컬 Case 분류기는 첫 요청이 학습 시간을 기다리지 않도록 미리 학습
+if settings.CASE_CLASSIFIER_ENABLED:
+    get_case_classifier()
 
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
-    """채팅 엔드포인트"""
-    
-    # 1. conversation_id 처리
+def start_speculative_prefetch(conversation_id: str, message: str):
+    """
+    메시지에 지역이 보이면 의도 파악(LLM)을 기다리지 않고
+    날씨 예보 / 질문 임베딩 조회를 미리 시작 (도구가 consume_prefetch로 재사용)
+    """
+    targets = speculative_targets(message)
+
+    weather_city = targets.get("weather_city")
+    if weather_city:
+        start_prefetch(
+            conversation_id,
+            weather_prefetch_key(weather_city),
+            fetch_forecast(weather_city),
+        )
+
+    rag_query = targets.get("rag_query")
+    if rag_query:
+        start_prefetch(
+            conversation_id,
+            embedding_prefetch_key(rag_query),
+            pca_embeddings.aembed_query(rag_query),
+        )
+
+
+def resolve_conversation_id(request: ChatRequest) -> str:
+    """conversation_id가 없으면 서버에서 생성"""
     conversation_id = request.conversation_id
     if not conversation_id or conversation_id.strip() == "":
         conversation_id = str(uuid.uuid4())
-    
+    return conversation_id
+
+
+async def run_chat(request: ChatRequest, conversation_id: str, callbacks: Optional[List] = None) -> ChatResponse:
+    """
+    채팅 1턴 처리 (planner/agent 실행 + 도구 결과 후처리).
+    callbacks는 planner/agent 실행 전체에 전달됩니다 (스트리밍 이벤트 수집 등).
+    오류는 호출 측(엔드포인트)에서 처리합니다.
+    """
     user_message = request.message
 
     # 진행 상태 초기화
     set_status(conversation_id, "요청 분석 중..")
 
+    if settings.PREFETCH_ENABLED:
+        start_speculative_prefetch(conversation_id, user_message)
+
     try:
         # 2. 대화 히스토리 로드 및 사용자 메시지 저장
-        chat_history = get_conversation_history(conversation_id)
+        #    토큰 예산 내 히스토리 (이전 대화 요약 + 최근 N턴 원문), 현재 메시지는 input으로 전달
+        chat_history = build_prompt_history(conversation_id)
+        first_turn = is_first_turn(conversation_id)
         add_message(conversation_id, "user", user_message)
-        
-        # RAG 툴 등을 위한 문자열 히스토리 생성
-        history_str = "\n\n".join([
-            f"[{msg.type.upper()}]\n{msg.content}" 
-            for msg in chat_history
-        ])
 
         # 최근 검색 출처(rag/web/cafe)를 에이전트에 전달 (지도 도구 선택용)
         last_source = get_last_result_source(conversation_id) or ""
         
-        # 3. Agent 실행 (비동기 실행: async tools 지원)
-        result = await agent_executor.ainvoke(
-            {
-                "input": user_message,
-                "chat_history": chat_history,
-                "conversation_history": history_str,
-                "child_age": request.child_age,
-                "original_query": user_message,
-                "conversation_id": conversation_id,
-                "last_result_source": last_source,
-            }
-        )
-        
+        # 3. 실행 경로 선택
+        #   - Case 2가 확실하면 결정적 파이프라인 (LLM 1회)
+        #   - 그 외/실패 시 Agent 실행 (비동기 실행: async tools 지원)
+        started_at = time.perf_counter()
+
+        # 지도 후속 요청("2번째 지도 보여줘")은 최근 검색 결과만으로 바로 응답
+        if settings.MAP_FASTLANE_ENABLED:
+            map_output = await answer_map_followup(user_message, conversation_id)
+            if map_output is not None:
+                elapsed = time.perf_counter() - started_at
+                record_request("map_fastlane", elapsed, 0)
+                logger.info(f"⏱️ path=map_fastlane llm_calls=0 latency={elapsed:.3f}s")
+                add_message(conversation_id, "ai", map_output)
+                return ChatResponse(
+                    conversation_id=conversation_id,
+                    role="ai",
+                    type=map_output.type,
+                    content=map_output.content,
+                    link=map_output.link,
+                    data=map_output.data
+                )
+
+        # 첫 턴 응답 캐시: 같은 질문(정규화/임베딩 유사) + 같은 날짜/날씨 조건/아이 나이면 이전 응답 재사용
+        cache_lookup = None
+        if settings.RESPONSE_CACHE_ENABLED and first_turn:
+            if settings.RESPONSE_CACHE_SEMANTIC_ENABLED:
+                start_prefetch(
+                    conversation_id,
+                    embedding_prefetch_key(user_message),
+                    pca_embeddings.aembed_query(user_message.strip()),
+                )
+            cache_lookup = await build_lookup(user_message, request.child_age, conversation_id)
+            cached = await lookup_response(cache_lookup, conversation_id) if cache_lookup else None
+            if cached:
+                cached_response, tier, original_latency = cached
+                elapsed = time.perf_counter() - started_at
+                record_request(f"cache_{tier}", elapsed, 0)
+                incr("response_cache.saved_seconds", max(0.0, original_latency - elapsed))
+                logger.info(f"⏱️ path=cache_{tier} llm_calls=0 latency={elapsed:.3f}s (원래 {original_latency:.2f}s)")
+                return cached_response
+
+        llm_counter = LLMCallCounterHandler()
+        result = None
+        path = "agent"
+
+        # 로컬 Case 분류기: 관련 없는 질문/날씨 전용 질문은 에이전트 없이 답변, 그 외에는 에이전트 힌트로 사용
+        case_prediction = None
+        if settings.CASE_CLASSIFIER_ENABLED:
+            case_prediction = predict_case(user_message)
+            logger.info(f"🏷️ Case 분류: {case_prediction.label} ({case_prediction.confidence:.2f})")
+            result = await answer_directly(
+                case_prediction,
+                user_message,
+                conversation_id,
+                chat_history=chat_history,
+                callbacks=[llm_counter, *(callbacks or [])],
+            )
+            if result is not None:
+                path = "direct"
+
+        # 후속 턴은 이전 대화 문맥이 필요하므로 (direct answer와 같이) 에이전트에 맡김
+        if result is None and settings.PLANNER_ENABLED and not chat_history:
+            plan = plan_case2(user_message)
+            if plan:
+                logger.info(f"🧭 Case 2 파이프라인 실행: {plan}")
+                result = await case2_pipeline.arun(
+                    plan,
+                    user_message,
+                    conversation_id,
+                    child_age=request.child_age,
+                    callbacks=[llm_counter, *(callbacks or [])],
+                )
+                if result is not None:
+                    path = "planner"
+
+        if result is None:
+            if case_prediction and case_prediction.confidence >= settings.CASE_HINT_THRESHOLD:
+                hint = CASE_HINT_PROMPT.format(
+                    case=LABEL_DESCRIPTIONS[case_prediction.label],
+                    confidence=case_prediction.confidence,
+                )
+                chat_history = [*chat_history, SystemMessage(content=hint)]
+
+            result = await agent_executor.ainvoke(
+                {
+                    "input": user_message,
+                    "chat_history": chat_history,
+                    "child_age": request.child_age,
+                    "original_query": user_message,
+                    "conversation_id": conversation_id,
+                    "last_result_source": last_source,
+                },
+                config={"callbacks": [llm_counter, *(callbacks or [])]},
+            )
+
+        elapsed = time.perf_counter() - started_at
+        record_request(path, elapsed, llm_counter.count)
+        logger.info(f"⏱️ path={path} llm_calls={llm_counter.count} latency={elapsed:.2f}s")
+
         output = result["output"]
         intermediate_steps = result.get("intermediate_steps", [])
-        
+
+        if path == "agent" and intermediate_steps:
+            raw_tokens, budgeted_tokens = scratchpad_tokens(intermediate_steps)
+            incr("scratchpad.requests")
+            incr("scratchpad.raw_tokens", raw_tokens)
+            incr("scratchpad.budgeted_tokens", budgeted_tokens)
+            logger.info(f"📦 scratchpad 도구 결과 토큰: {raw_tokens} -> {budgeted_tokens}")
+
         # -------------------------------------------------------
         # [Step Processing] 툴 실행 결과 후처리
         # -------------------------------------------------------
@@ -98,10 +245,11 @@ async def chat(request: ChatRequest):
                             ]
 
                             save_search_results(conversation_id, saving_facilities_data, source="rag")
+                            # 히스토리에는 전체 dump 대신 시설 이름만 남김 (좌표/주소는 last_search_results에 있음)
                             add_message(
                                 conversation_id, 
                                 "search_result", 
-                                f"RAG 검색 결과: {facilities_data}"
+                                format_search_result_summary(facilities_data, source="rag")
                             )
                             logger.info(f"✅ RAG 검색 결과 저장: {len(facilities_data)}개 시설")
                         else:
@@ -124,7 +272,7 @@ async def chat(request: ChatRequest):
             # AI 응답 저장 (MapResponse는 add_message 내부에서 안전하게 처리됨)
             add_message(conversation_id, "ai", map_output)
             
-            return ChatResponse(
+            response = ChatResponse(
                 conversation_id=conversation_id,
                 role="ai",
                 type=map_output.type,       # 'map'
@@ -155,28 +303,9 @@ async def chat(request: ChatRequest):
                             if facilities:
                                 logger.info(f"✅ 지도 생성 툴 결과 감지: {len(facilities)}개")
                                 
-                                # MapMarker 리스트 생성
-                                markers = [
-                                    MapMarker(
-                                        name=f.get("name", "장소"),
-                                        lat=float(f.get("lat", 0.0)),
-                                        lng=float(f.get("lng", 0.0)),
-                                        desc=f.get("desc", "") or f.get("address", "")
-                                    )
-                                    for f in facilities
-                                ]
-                                
-                                # 중심점 잡기 (첫 번째 시설 기준)
-                                if markers:
-                                    center_lat = markers[0].lat
-                                    center_lng = markers[0].lng
-                                    
-                                    map_data = MapData(
-                                        center=MapCenter(lat=center_lat, lng=center_lng),
-                                        markers=markers
-                                    )
-                                    
-                                    kakao_link = f"https://map.kakao.com/link/to/{markers[0].name},{markers[0].lat},{markers[0].lng}"
+                                # 마커 + 중심점(첫 번째 시설 기준) + 카카오맵 링크
+                                map_data, kakao_link = build_map_data(facilities)
+                                if map_data:
                                     response_type = "map"
 
                     except Exception as e:
@@ -185,7 +314,7 @@ async def chat(request: ChatRequest):
             # AI 응답 저장
             add_message(conversation_id, "ai", final_output_text)
             
-            return ChatResponse(
+            response = ChatResponse(
                 conversation_id=conversation_id,
                 role="ai",
                 type=response_type,
@@ -193,7 +322,29 @@ async def chat(request: ChatRequest):
                 link=kakao_link,
                 data=map_data
             )
+
+        if cache_lookup and path in ("planner", "agent"):
+            store_response(cache_lookup, response, conversation_id, intermediate_steps, elapsed)
+        return response
     
+    finally:
+        # 쓰이지 않은 선행 조회는 취소
+        finish_prefetch(conversation_id)
+        # 상태 구독자(SSE)에게 요청 종료 알림
+        clear_status(conversation_id)
+        # 오래된 턴은 백그라운드에서 누적 요약으로 압축
+        schedule_fold(conversation_id)
+
+
+@router.post("/chat", response_model=ChatResponse)
+async def chat(request: ChatRequest):
+    """채팅 엔드포인트"""
+    
+    # 1. conversation_id 처리
+    conversation_id = resolve_conversation_id(request)
+
+    try:
+        return await run_chat(request, conversation_id)
     except Exception as e:
         logger.error(f"채팅 오류: {e}")
         import traceback
@@ -201,27 +352,139 @@ async def chat(request: ChatRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _sse(payload: dict) -> str:
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+# 이벤트가 없을 때 연결 유지를 위한 heartbeat 주기 (초)
+STATUS_HEARTBEAT_INTERVAL = 15
+SSE_HEARTBEAT = ": heartbeat\n\n"
+
+
+class _QueueReader:
+    """
+    heartbeat 주기마다 깨어나는 queue 읽기
+    - Python 3.10의 wait_for(queue.get(), timeout)은 timeout 직전에 들어온 항목을 버릴 수 있음 (3.12에서 수정)
+      → 버려진 항목이 종료 신호면 final 없이 heartbeat만 계속 보냄
+    - queue.get() 작업 하나를 timeout이 지나도 취소하지 않고 다음 get()에서 이어서 기다림
+    """
+
+    def __init__(self, queue: asyncio.Queue, timeout: float):
+        self.queue = queue
+        self.timeout = timeout
+        self._get_task: Optional[asyncio.Task] = None
+
+    async def get(self):
+        """다음 항목 (timeout 동안 없으면 asyncio.TimeoutError)"""
+        if self._get_task is None:
+            self._get_task = asyncio.ensure_future(self.queue.get())
+        done, _ = await asyncio.wait({self._get_task}, timeout=self.timeout)
+        if not done:
+            raise asyncio.TimeoutError
+        task, self._get_task = self._get_task, None
+        return task.result()
+
+    def close(self):
+        if self._get_task is not None:
+            self._get_task.cancel()
+            self._get_task = None
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    SSE 기반 채팅 스트리밍 엔드포인트 (POST).
+    data 라인의 JSON "type" 값으로 이벤트를 구분합니다.
+    - start: 요청 수신 (conversation_id 포함)
+    - status: 진행 상태 변경 (set_status)
+    - tool_start / tool_end: 도구 실행 시작/종료 (도구 결과 미리보기 포함)
+    - token: 최종 답변 LLM 토큰 delta
+    - final: /api/chat과 동일한 ChatResponse (type=map이면 MapResponse 데이터 포함)
+    - error: 처리 실패
+    """
+    conversation_id = resolve_conversation_id(request)
+    queue: asyncio.Queue = asyncio.Queue()
+    handler = ChatStreamCallbackHandler(queue, loop=asyncio.get_running_loop())
+
+    async def event_generator():
+        yield _sse({"type": "start", "conversation_id": conversation_id})
+
+        # 상태 변경(set_status)도 같은 queue로 즉시 전달받음
+        subscribe_status(conversation_id, queue)
+        task = asyncio.create_task(run_chat(request, conversation_id, callbacks=[handler]))
+        # 작업이 끝나면 대기 중인 queue.get()을 바로 깨우기 위한 종료 신호
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        reader = _QueueReader(queue, STATUS_HEARTBEAT_INTERVAL)
+
+        try:
+            while True:
+                try:
+                    event = await reader.get()
+                except asyncio.TimeoutError:
+                    yield SSE_HEARTBEAT
+                    continue
+
+                if event is None:
+                    break
+                # 종료는 task 완료 신호(None)로 판단
+                if event.get("type") == "done":
+                    continue
+                yield _sse(event)
+
+            try:
+                response = task.result()
+                yield _sse({"type": "final", "data": response.model_dump()})
+            except Exception as e:
+                logger.error(f"스트리밍 채팅 오류: {e}")
+                yield _sse({"type": "error", "detail": str(e)})
+        finally:
+            reader.close()
+            unsubscribe_status(conversation_id, queue)
+            # 클라이언트가 연결을 끊으면 진행 중인 처리도 중단
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
 @router.get("/chat/stream/{conversation_id}")
 async def chat_status_stream(conversation_id: str):
     """
     SSE 기반 진행 상태 스트리밍 엔드포인트.
-    - tools에서 set_status(conversation_id, "...")가 호출될 때마다
-      상태가 변경되면 이벤트를 푸시합니다.
+    - tools에서 set_status(conversation_id, "...")가 호출되면 즉시 이벤트를 푸시합니다 (polling 없음).
+    - 이벤트가 없는 동안에는 heartbeat 주석을 보내 연결을 유지합니다.
+    - 요청 처리가 끝나면(clear_status) 스트림을 종료합니다.
     - 프론트에서는 EventSource로 구독해서 실시간 상태를 표시할 수 있습니다.
     """
 
     async def event_generator():
+        queue = subscribe_status(conversation_id)
+        reader = _QueueReader(queue, STATUS_HEARTBEAT_INTERVAL)
         last_status = None
         try:
+            # 구독 전에 이미 시작된 요청이면 현재 상태부터 전달
+            status = get_status(conversation_id)
             while True:
-                status = get_status(conversation_id)
                 if status and status != last_status:
                     payload = json.dumps({"conversation_id": conversation_id, "status": status}, ensure_ascii=False)
                     yield f"data: {payload}\n\n"
                     last_status = status
-                await asyncio.sleep(1)
+
+                try:
+                    event = await reader.get()
+                except asyncio.TimeoutError:
+                    yield SSE_HEARTBEAT
+                    status = None
+                    continue
+
+                if event.get("type") == "done":
+                    break
+                status = event.get("status")
         except asyncio.CancelledError:
             # 클라이언트가 연결을 끊으면 여기로 들어옴
             return
+        finally:
+            reader.close()
+            unsubscribe_status(conversation_id, queue)
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
\ No newline at end of file
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
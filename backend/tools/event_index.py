@@ -0,0 +1,305 @@
+"""
+Case 1(축제/행사/팝업) 로컬 행사 인덱스
+- 질문 대부분이 같은 몇 개 지역 × "오늘/이번 주/이번 주말/다음 주말" 구간이라,
+  백그라운드 갱신기가 주기적으로 (지역, 구간) 조합을 행사 소스에 미리 조회해 인덱스에 저장
+- naver_web_search는 lookup_events로 인덱스를 먼저 찾고, 없을 때만 실시간 검색
+  (지역 + 구간 + 일반적인 표현만 있는 질문만 인덱스로 답함. 구체 장소/날짜가 섞이면 실시간 검색)
+- 행사 소스는 EventSource(fetch(query) → 원본 항목 목록)로 바꿔 끼울 수 있음 (기본: Perplexity, 벤치/테스트: 로컬 stub)
+  결과는 perplexity_client._normalize_results로 같은 형식으로 정리
+"""
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+from config import settings
+from tools.perplexity_client import _normalize_results, search_events_with_perplexity
+from utils.metrics import get_counter, incr, record_request
+
+logger = logging.getLogger(__name__)
+
+# 구간 이름 → 조회 질의에 넣을 표현
+WINDOW_LABELS = {
+    "today": "오늘",
+    "this_week": "이번 주",
+    "this_weekend": "이번 주말",
+    "next_weekend": "다음 주말",
+}
+
+# 질문에서 구간 표현 찾기 (앞에서부터 우선, 없으면 기본 7일 = this_week)
+WINDOW_PATTERNS = [
+    ("next_weekend", re.compile(r"다음\s*주\s*말")),
+    ("this_weekend", re.compile(r"(?:이번\s*)?주\s*말")),
+    ("this_week", re.compile(r"이번\s*주")),
+    ("today", re.compile(r"오늘")),
+]
+
+REGION_SUFFIXES = ("", "시", "도", "특별시", "광역시", "특별자치시", "특별자치도", "에서", "에", "쪽", "시에서", "도에서")
+
+# 인덱스로 답해도 되는 일반적인 표현 (이 외의 단어가 있으면 구체적인 질문으로 보고 실시간 검색)
+GENERIC_WORDS = {
+    "아이", "아이들", "아기", "애들", "어린이", "유아", "키즈", "가족", "우리", "같이", "함께",
+    "갈", "갈만한", "가볼만한", "가볼", "볼만한", "할만한", "놀만한", "만한", "놀거리", "볼거리", "데려갈",
+    "축제", "행사", "팝업", "팝업스토어", "페스티벌", "이벤트", "전시", "체험", "공연", "일정", "개최",
+    "하는", "열리는", "진행", "진행하는", "진행중인", "중인", "요즘", "최근", "근처", "주변",
+    "뭐", "뭐가", "뭐있어", "어디", "좀", "추천", "추천해줘", "추천해주세요", "알려줘", "알려주세요",
+    "찾아줘", "있어", "있어요", "있나요", "있을까", "있을까요", "없을까", "없을까요",
+}
+PARTICLES = ("", "을", "를", "이", "가", "은", "는", "도", "에", "에서", "랑", "이랑", "하고", "와", "과", "들", "?", "!")
+
+
+class EventSource(Protocol):
+    """행사 소스: 질의 → 원본 항목 목록 ({name, link, description, location} 형태의 dict)"""
+
+    async def fetch(self, query: str) -> List[Dict[str, Any]]:
+        ...
+
+
+class PerplexityEventSource:
+    """기본 소스: Perplexity 행사 검색 (당일 결과 캐시를 거치지 않고 항상 새로 조회)"""
+
+    async def fetch(self, query: str) -> List[Dict[str, Any]]:
+        return await search_events_with_perplexity(query, use_cache=False)
+
+
+def window_range(window: str, today: date) -> Tuple[date, date]:
+    if window == "today":
+        return today, today
+    if window == "this_week":
+        return today, today + timedelta(days=6)
+    saturday = today + timedelta(days=(5 - today.weekday()) % 7)
+    if today.weekday() == 6:
+        saturday = today - timedelta(days=1)
+    if window == "next_weekend":
+        saturday += timedelta(days=7)
+    start = max(today, saturday)
+    return start, saturday + timedelta(days=1)
+
+
+def build_refresh_query(region: str, window: str) -> str:
+    return f"{region} {WINDOW_LABELS[window]} 아이와 함께 갈 만한 축제/행사/팝업"
+
+
+def _is_word(token: str, words) -> bool:
+    return any(token == w + p for w in words for p in PARTICLES)
+
+
+def match_index_key(query: str, regions: List[str]) -> Optional[Tuple[str, str]]:
+    """인덱스로 답할 수 있는 질문이면 (지역, 구간), 아니면 None"""
+    window = "this_week"
+    text = query
+    for name, pattern in WINDOW_PATTERNS:
+        if pattern.search(text):
+            window = name
+            text = pattern.sub(" ", text)
+            break
+
+    found = None
+    for token in re.sub(r"[,.~/]", " ", text).split():
+        region = next((r for r in regions if any(token == r + s for s in REGION_SUFFIXES)), None)
+        if region:
+            if found and found != region:
+                return None
+            found = region
+        elif not _is_word(token, GENERIC_WORDS):
+            return None
+    return (found, window) if found else None
+
+
+_PERIOD_RE = re.compile(r"(\d{4}-\d{2}-\d{2})\s*~\s*(\d{4}-\d{2}-\d{2})")
+
+
+def _event_end(item: Dict[str, str]) -> Optional[date]:
+    """description의 '기간 해석: YYYY-MM-DD ~ YYYY-MM-DD'에서 종료일 (없으면 None)"""
+    match = _PERIOD_RE.search(item.get("description", ""))
+    if not match:
+        return None
+    try:
+        return date.fromisoformat(match.group(2))
+    except ValueError:
+        return None
+
+
+@dataclass
+class IndexedEvents:
+    region: str
+    window: str
+    start: date
+    end: date
+    events: List[Dict[str, str]]
+    refreshed_at: float = field(default_factory=time.time)
+
+
+class EventIndex:
+    """(지역, 구간, 구간 시작일) → 행사 목록. 날짜가 바뀌면 구간 시작일이 달라져 예전 항목은 자연히 쓰이지 않음"""
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._entries: Dict[Tuple[str, str, date], IndexedEvents] = {}
+
+    def put(self, region: str, window: str, today: date, events: List[Dict[str, str]]):
+        start, end = window_range(window, today)
+        self._entries[(region, window, start)] = IndexedEvents(region, window, start, end, events)
+        # 지난 구간 정리
+        for key in [k for k, v in self._entries.items() if v.end < today]:
+            del self._entries[key]
+
+    def get(self, region: str, window: str, today: date) -> Optional[List[Dict[str, str]]]:
+        start, _ = window_range(window, today)
+        entry = self._entries.get((region, window, start))
+        if entry is None or time.time() - entry.refreshed_at > self.max_age:
+            return None
+        # 갱신 후 종료된 행사는 제외
+        events = [e for e in entry.events if (_event_end(e) or today) >= today]
+        return [dict(e) for e in events] or None
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "entries": len(self._entries),
+            "events": sum(len(v.events) for v in self._entries.values()),
+            "oldest_age_seconds": max((now - v.refreshed_at for v in self._entries.values()), default=None),
+        }
+
+    def clear(self):
+        self._entries.clear()
+
+
+class EventIndexRefresher:
+    """주기적으로 (지역, 구간) 조합을 소스에 조회해 인덱스를 채우는 백그라운드 작업"""
+
+    def __init__(
+        self,
+        index: EventIndex,
+        source: EventSource,
+        regions: List[str],
+        windows: List[str],
+        interval: float,
+        concurrency: int = 2,
+    ):
+        self.index = index
+        self.source = source
+        self.regions = regions
+        self.windows = windows
+        self.interval = interval
+        self.concurrency = concurrency
+        self._task: Optional[asyncio.Task] = None
+        self.last_refresh_at: Optional[float] = None
+
+    async def refresh_once(self) -> int:
+        """모든 조합을 한 번 갱신하고 성공한 조합 수를 반환 (실패한 조합은 기존 항목 유지)"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        today = datetime.now().date()
+
+        async def _refresh(region: str, window: str) -> bool:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    raw = await self.source.fetch(build_refresh_query(region, window))
+                except Exception as e:
+                    incr("event_index.refresh_errors")
+                    logger.warning(f"⚠️ [EVENT INDEX] {region}/{window} 갱신 실패: {e}")
+                    return False
+                record_request("event_index.refresh", time.perf_counter() - started)
+            events = _normalize_results(raw or [])
+            if not events:
+                incr("event_index.refresh_empty")
+                return False
+            self.index.put(region, window, today, events)
+            return True
+
+        results = await asyncio.gather(*(_refresh(r, w) for r in self.regions for w in self.windows))
+        self.last_refresh_at = time.time()
+        ok = sum(results)
+        incr("event_index.refreshed", ok)
+        logger.info(f"✅ [EVENT INDEX] 갱신 완료 {ok}/{len(results)}")
+        return ok
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("❌ [EVENT INDEX] 갱신 루프 오류")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def _parse_list(value: str) -> List[str]:
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+
+_index = EventIndex(max_age=settings.EVENT_INDEX_MAX_AGE)
+_refresher: Optional[EventIndexRefresher] = None
+
+
+def get_event_regions() -> List[str]:
+    return _parse_list(settings.EVENT_INDEX_REGIONS)
+
+
+def lookup_events(query: str) -> Optional[List[Dict[str, str]]]:
+    """인덱스로 답할 수 있는 질문이면 행사 목록, 아니면 None (None이면 실시간 검색)"""
+    if not settings.EVENT_INDEX_ENABLED:
+        return None
+    key = match_index_key(query, get_event_regions())
+    events = _index.get(*key, datetime.now().date()) if key else None
+    incr("event_index.hit" if events else "event_index.miss")
+    return events
+
+
+def start_event_index_refresher(source: Optional[EventSource] = None) -> EventIndexRefresher:
+    """백그라운드 갱신 시작 (source를 주지 않으면 Perplexity)"""
+    global _refresher
+    windows = [w for w in _parse_list(settings.EVENT_INDEX_WINDOWS) if w in WINDOW_LABELS]
+    _refresher = EventIndexRefresher(
+        _index,
+        source or PerplexityEventSource(),
+        regions=get_event_regions(),
+        windows=windows,
+        interval=settings.EVENT_INDEX_REFRESH_INTERVAL,
+        concurrency=settings.EVENT_INDEX_REFRESH_CONCURRENCY,
+    )
+    _refresher.start()
+    logger.info(f"✅ [EVENT INDEX] 백그라운드 갱신 시작 (지역 {len(_refresher.regions)} × 구간 {len(windows)})")
+    return _refresher
+
+
+async def stop_event_index_refresher():
+    global _refresher
+    if _refresher is not None:
+        await _refresher.stop()
+        _refresher = None
+
+
+def get_event_index_stats() -> Dict[str, Any]:
+    hits, misses = get_counter("event_index.hit"), get_counter("event_index.miss")
+    return {
+        **_index.stats(),
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": (hits / (hits + misses)) if (hits + misses) else None,
+        "running": _refresher is not None,
+        "last_refresh_at": _refresher.last_refresh_at if _refresher else None,
+    }
+
+
+def clear_event_index():
+    _index.clear()
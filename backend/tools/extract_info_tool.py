@@ -14,7 +14,7 @@ def extract_user_intent(user_message: str) -> str:
     Returns:
         JSON 문자열
     """
-    llm = get_llm()
+    llm = get_llm("extract")
     
     # 현재 날짜 정보
     today = datetime.now()
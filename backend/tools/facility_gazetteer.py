@@ -0,0 +1,94 @@
+"""
+시설 지명 사전 (gazetteer)
+- 벡터 DB(ChromaDB) 메타데이터에 이미 있는 시설명/주소/좌표(Name, Address, LAT, LON)를 한 번 읽어
+  정규화한 이름 → 좌표 사전으로 보관 → 지오코딩 시 Kakao 호출 전에 먼저 찾음
+- 같은 이름이 여러 곳(지점)에 있으면 어느 곳인지 알 수 없으므로 사전에서 제외
+- 서버 시작 시 백그라운드 스레드에서 읽고, 읽기 전/실패 시에는 사전 없이 동작
+"""
+
+import logging
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 읽을 메타데이터 수
+PAGE_SIZE = 5000
+
+_entries: Dict[str, Dict[str, Any]] = {}
+_loaded = threading.Event()
+
+
+def normalize_place_name(name: str) -> str:
+    return re.sub(r"[\s\-_.,·()\[\]'\"]", "", name or "").lower()
+
+
+def build_gazetteer(metadatas: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """메타데이터 목록 → {정규화 이름: {name, address, lat, lng}} (좌표 없음/중복 이름 제외)"""
+    entries: Dict[str, Dict[str, Any]] = {}
+    ambiguous = set()
+    for metadata in metadatas:
+        name = str(metadata.get("Name", metadata.get("name", ""))).strip()
+        try:
+            lat, lng = float(metadata.get("LAT") or 0), float(metadata.get("LON") or 0)
+        except (TypeError, ValueError):
+            continue
+        key = normalize_place_name(name)
+        if not key or not lat or not lng:
+            continue
+        entry = {"name": name, "address": metadata.get("Address", ""), "lat": lat, "lng": lng}
+        existing = entries.get(key)
+        if existing and (round(existing["lat"], 4), round(existing["lng"], 4)) != (round(lat, 4), round(lng, 4)):
+            ambiguous.add(key)
+        entries.setdefault(key, entry)
+    for key in ambiguous:
+        del entries[key]
+    return entries
+
+
+def load_gazetteer(collection=None):
+    """ChromaDB 컬렉션의 메타데이터로 사전을 채움 (블로킹, 스레드에서 호출)"""
+    global _entries
+    if collection is None:
+        from tools.rag_tool import collection
+    if collection is None:
+        logger.warning("⚠️ [GAZETTEER] ChromaDB 컬렉션이 없어 지명 사전 없이 동작")
+        return
+
+    metadatas: List[Dict[str, Any]] = []
+    offset = 0
+    try:
+        while True:
+            page = collection.get(include=["metadatas"], limit=PAGE_SIZE, offset=offset)
+            batch = page.get("metadatas") or []
+            metadatas.extend(m for m in batch if m)
+            if len(batch) < PAGE_SIZE:
+                break
+            offset += PAGE_SIZE
+    except Exception as e:
+        logger.error(f"❌ [GAZETTEER] 메타데이터 로드 실패: {e}")
+        return
+
+    _entries = build_gazetteer(metadatas)
+    _loaded.set()
+    logger.info(f"✅ [GAZETTEER] 시설 {len(metadatas)}건 → 지명 {len(_entries)}개")
+
+
+def start_gazetteer_load():
+    threading.Thread(target=load_gazetteer, name="gazetteer-load", daemon=True).start()
+
+
+def set_gazetteer(entries: Dict[str, Dict[str, Any]]):
+    """사전을 직접 지정 (벤치/테스트용)"""
+    global _entries
+    _entries = entries
+    _loaded.set()
+
+
+def lookup_place(query: str) -> Optional[Dict[str, Any]]:
+    return _entries.get(normalize_place_name(query)) if _entries else None
+
+
+def get_gazetteer_stats() -> Dict[str, Any]:
+    return {"loaded": _loaded.is_set(), "entries": len(_entries)}
@@ -1,18 +1,147 @@
-import requests
+"""
+장소명/주소 → 지도 좌표 (Kakao 키워드 검색)
+- 검색 실패 시 뒤에서부터 단어를 하나씩 뺀 질의로 다시 찾음 (예: '벡스코 4홀' -> '벡스코', 최대 3번)
+  → 원본과 줄인 질의를 순서대로 기다리지 않고 동시에 보내고, 가장 긴(원본에 가까운) 성공 결과를 사용
+- 벡터 DB에 있는 시설명은 시설 지명 사전(facility_gazetteer)에서 먼저 찾아, 사전 결과보다 긴 질의만 Kakao에 보냄
+- Kakao 결과는 질의별 LRU 캐시에 보관 (찾지 못한 결과도 NEGATIVE_TTL 동안 캐시, 호출 오류는 캐시하지 않음)
+  → 서버 종료 시 GEOCODE_CACHE_PATH에 저장하고 시작 시 다시 읽음
+"""
+
+import asyncio
+import json
 import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
 from config import settings
 from models.map_models import MapResponse, MapData, MapCenter, MapMarker
+from tools.facility_gazetteer import lookup_place
+from utils.http_session import get_http_session
+from utils.metrics import get_counter, incr, record_request
+from utils.singleflight import SingleFlight, request_signature
+from utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
-def search_map_by_address_core(place_name_or_address: str) -> MapResponse:
+KAKAO_KEYWORD_URL = "https://dapi.kakao.com/v2/local/search/keyword.json"
+
+# 최대 3번까지만 단어를 줄여봄 (원본 포함 질의 최대 4개)
+MAX_TRUNCATIONS = 3
+
+# 정규화한 질의 → Kakao 첫 번째 결과 문서 (찾지 못했으면 빈 dict)
+_geocode_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    "geocode", max_size=settings.GEOCODE_CACHE_SIZE, default_ttl=settings.GEOCODE_CACHE_TTL
+)
+# 같은 질의로 진행 중인 Kakao 호출 (동시에 들어온 같은 장소는 한 번만 호출)
+_flight: SingleFlight[Optional[Dict[str, Any]]] = SingleFlight("kakao_keyword")
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.split())
+
+
+def query_variants(place_name_or_address: str) -> List[str]:
+    """원본 질의와 뒤에서부터 단어를 하나씩 뺀 질의 (긴 것부터)"""
+    words = place_name_or_address.split()
+    return [" ".join(words[:n]) for n in range(len(words), max(0, len(words) - MAX_TRUNCATIONS - 1), -1)]
+
+
+async def _request_keyword(api_key: str, query: str) -> Optional[Dict[str, Any]]:
+    """Kakao 키워드 검색 1회 (결과 문서, 결과 없음이면 빈 dict, 호출 오류면 None)"""
+    session = await get_http_session()
+    headers = {"Authorization": f"KakaoAK {api_key}"}
+    started = time.perf_counter()
+    incr("geocode.kakao_calls")
+    try:
+        async with session.get(
+            KAKAO_KEYWORD_URL,
+            headers=headers,
+            params={"query": query, "size": 1},
+            timeout=aiohttp.ClientTimeout(total=settings.GEOCODE_TIMEOUT),
+        ) as response:
+            if response.status != 200:
+                incr("geocode.kakao_errors")
+                logger.warning(f"Kakao 검색 응답 오류 ('{query}'): {response.status}")
+                return None
+            data = await response.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        incr("geocode.kakao_errors")
+        logger.warning(f"검색 중 오류 발생 ('{query}'): {e!r}")
+        return None
+    record_request("kakao_keyword", time.perf_counter() - started)
+
+    documents = data.get("documents") or []
+    return documents[0] if documents else {}
+
+
+async def _search_keyword(api_key: str, query: str) -> Optional[Dict[str, Any]]:
+    """캐시 → 진행 중인 같은 질의 → Kakao"""
+    if settings.GEOCODE_CACHE_ENABLED:
+        cached = _geocode_cache.get(query)
+        if cached is not None:
+            return cached
+
+    def _store(document: Optional[Dict[str, Any]]):
+        if document is None or not settings.GEOCODE_CACHE_ENABLED:
+            return
+        ttl = settings.GEOCODE_CACHE_TTL if document else settings.GEOCODE_NEGATIVE_TTL
+        _geocode_cache.set(query, document, ttl=ttl)
+
+    return await _flight.do(request_signature(query), lambda: _request_keyword(api_key, query), on_success=_store)
+
+
+def _gazetteer_document(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """시설 지명 사전 항목을 Kakao 결과 문서 모양으로 변환"""
+    return {"place_name": entry["name"], "road_address_name": entry.get("address", ""), "y": entry["lat"], "x": entry["lng"]}
+
+
+async def _find_document(api_key: str, place_name_or_address: str) -> Optional[Dict[str, Any]]:
+    variants = query_variants(place_name_or_address)
+
+    # 사전에 있는 가장 긴 질의보다 짧은 질의는 보낼 필요 없음
+    gazetteer_doc = None
+    if settings.GEOCODE_GAZETTEER_ENABLED:
+        for i, variant in enumerate(variants):
+            entry = lookup_place(variant)
+            if entry is not None:
+                gazetteer_doc = _gazetteer_document(entry)
+                variants = variants[:i]
+                break
+
+    if variants:
+        if not api_key:
+            logger.error("KAKAO_REST_API_KEY가 설정되지 않았습니다.")
+        else:
+            documents = await asyncio.gather(*(_search_keyword(api_key, variant) for variant in variants))
+            for variant, document in zip(variants, documents):
+                if document:
+                    logger.info(f"✅ 검색 성공: '{variant}' (원본: {place_name_or_address})")
+                    return document
+
+    if gazetteer_doc is not None:
+        incr("geocode.gazetteer_hits")
+        logger.info(f"✅ 시설 사전에서 찾음: '{gazetteer_doc['place_name']}' (원본: {place_name_or_address})")
+    return gazetteer_doc
+
+
+async def search_map_by_address_core(place_name_or_address: str) -> MapResponse:
     """
-    Kakao API를 호출해 MapResponse 객체를 직접 반환하는 '핵심 로직 함수'
-    검색 실패 시, 단어를 뒤에서부터 하나씩 제거하며 재시도합니다. (예: '벡스코 4홀' -> '벡스코')
+    장소명/주소를 지오코딩해 MapResponse 객체를 직접 반환하는 '핵심 로직 함수'
+    시설 사전 → 캐시 → Kakao 순으로 찾고, 원본에서 뒤 단어를 뺀 질의까지 동시에 검색합니다.
     """
+    started = time.perf_counter()
+    try:
+        return await _search_map(place_name_or_address)
+    finally:
+        record_request("geocode", time.perf_counter() - started)
+
 
+async def _search_map(place_name_or_address: str) -> MapResponse:
     api_key = settings.KAKAO_REST_API_KEY
-    
+
     # 기본 실패 응답 (API 키 없음 등)
     default_fail_response = MapResponse(
         link="",
@@ -21,50 +150,13 @@ def search_map_by_address_core(place_name_or_address: str) -> MapResponse:
         content="지도를 생성할 수 있는 장소를 찾지 못했어요. 😢"
     )
 
-    if not api_key:
-        logger.error("KAKAO_REST_API_KEY가 설정되지 않았습니다.")
+    query = _normalize_query(place_name_or_address)
+    if not query:
         return default_fail_response
 
-    url = "https://dapi.kakao.com/v2/local/search/keyword.json"
-    headers = {"Authorization": f"KakaoAK {api_key}"}
-
-    # 🟢 [핵심 수정] 재귀적 검색 로직 (Smart Retry)
-    current_query = place_name_or_address.strip()
-    found_document = None
-    
-    # 최대 3번까지만 단어를 줄여봄 (무한 루프 방지)
-    max_retries = 3
-    retry_count = 0
-
-    while current_query and retry_count <= max_retries:
-        try:
-            params = {"query": current_query, "size": 1}
-            response = requests.get(url, headers=headers, params=params, timeout=5)
-            
-            if response.status_code == 200:
-                data = response.json()
-                documents = data.get("documents", [])
-                
-                if documents:
-                    # 찾았다!
-                    found_document = documents[0]
-                    logger.info(f"✅ 검색 성공: '{current_query}' (원본: {place_name_or_address})")
-                    break 
-            
-        except Exception as e:
-            logger.warning(f"검색 중 오류 발생: {e}")
-            break
-
-        # 못 찾았으면 뒤에서 한 단어 제거하고 재시도
-        # 예: "부산 벡스코 4홀" (실패) -> "부산 벡스코" (재시도)
-        words = current_query.split()
-        if len(words) > 1:
-            removed_word = words[-1]
-            current_query = " ".join(words[:-1])
-            retry_count += 1
-            logger.info(f"검색 실패 ('{removed_word}' 제거), 재시도: '{current_query}'")
-        else:
-            break # 단어가 1개뿐이면 더 이상 줄일 수 없음
+    found_document = await _find_document(api_key, query)
+    if found_document is None and not api_key:
+        return default_fail_response
 
     # --- 결과 처리 ---
 
@@ -106,4 +198,77 @@ def search_map_by_address_core(place_name_or_address: str) -> MapResponse:
                 )
             ]
         )
-    )
\ No newline at end of file
+    )
+
+
+def load_geocode_cache(path: Optional[str] = None) -> int:
+    """저장해 둔 Kakao 결과 캐시를 읽어 채움 (만료된 항목 제외, 읽은 항목 수 반환)"""
+    path = path or settings.GEOCODE_CACHE_PATH
+    if not path or not os.path.exists(path):
+        return 0
+    try:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ 지오코딩 캐시 파일을 읽지 못함 ({path}): {e}")
+        return 0
+
+    if not isinstance(entries, list):
+        logger.warning(f"⚠️ 지오코딩 캐시 파일 형식이 아님 ({path}): {type(entries).__name__}")
+        return 0
+
+    now = time.time()
+    loaded = skipped = 0
+    for entry in entries:
+        # [질의, 결과 문서(dict), 만료 시각] 모양이 아니면 건너뜀 (캐시 파일 때문에 서버 시작이 실패하지 않도록)
+        try:
+            query, document, expires_at = entry
+            expires_at = float(expires_at)
+            valid = isinstance(query, str) and isinstance(document, dict)
+        except (TypeError, ValueError):
+            valid = False
+        if not valid:
+            skipped += 1
+            continue
+        if expires_at > now:
+            _geocode_cache.set(query, document, ttl=expires_at - now)
+            loaded += 1
+    if skipped:
+        logger.warning(f"⚠️ 지오코딩 캐시에서 형식이 잘못된 항목 {skipped}건 건너뜀 ({path})")
+    logger.info(f"✅ 지오코딩 캐시 {loaded}건 로드 ({path})")
+    return loaded
+
+
+def save_geocode_cache(path: Optional[str] = None) -> int:
+    """Kakao 결과 캐시를 파일로 저장 (만료 시각은 절대 시각으로, 저장한 항목 수 반환)"""
+    path = path or settings.GEOCODE_CACHE_PATH
+    if not path:
+        return 0
+    now = time.time()
+    entries = [[query, document, now + ttl] for query, document, ttl in _geocode_cache.export_items()]
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"⚠️ 지오코딩 캐시 저장 실패 ({path}): {e}")
+        return 0
+    logger.info(f"✅ 지오코딩 캐시 {len(entries)}건 저장 ({path})")
+    return len(entries)
+
+
+def get_geocode_cache_stats() -> Dict[str, Any]:
+    return {
+        **_geocode_cache.stats(),
+        "inflight": len(_flight),
+        "gazetteer_hits": get_counter("geocode.gazetteer_hits"),
+        "kakao_calls": get_counter("geocode.kakao_calls"),
+        "kakao_errors": get_counter("geocode.kakao_errors"),
+    }
+
+
+def clear_geocode_cache():
+    _geocode_cache.clear()
+    _flight.clear()
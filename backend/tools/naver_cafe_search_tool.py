@@ -1,48 +1,242 @@
 import json
 import asyncio
+import hashlib
+import logging
 import aiohttp
-from bs4 import BeautifulSoup
+from lxml import etree
 from langchain_core.tools import tool
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Any, AsyncIterator, Collection, Dict, List, Optional
 from config import settings
 from models.chat_models import get_llm
+from tools.review_digest import lookup_review_digest, store_review_digest
 from utils.conversation_memory import save_search_results, get_shown_facility_names, set_status 
+from utils.http_session import get_http_session
+from utils.metrics import incr
+from utils.singleflight import SingleFlight, request_signature
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 # 맘카페 차단 회피를 위한 완전한 User-Agent
 USER_AGENT = "Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1"
+NAVER_CAFE_API_URL = "https://openapi.naver.com/v1/search/cafearticle.json"
+
+# 본문 추출: 본문 컨테이너(div.se-main-container 또는 div#postContent)의 텍스트 앞부분만 사용
+MAX_CONTENT_CHARS = 850
+READ_CHUNK_SIZE = 16 * 1024
+# 본문 뒤 남은 응답이 이보다 작으면 읽어 버리고 연결 재사용, 크면 연결을 닫음
+DRAIN_LIMIT = 64 * 1024
+SKIP_TEXT_TAGS = {"script", "style"}
+
+# 프로세스 공유 캐시 (인기 질의는 같은 검색 결과/글/요약이 반복됨)
+# - 검색 API 응답: 짧게 (새 글 반영)
+# - 후기 3개 선별 결과: (질의, 후보 목록 해시) 기준, 검색 응답과 같은 TTL
+# - 추출한 본문: 길게 (URL 기준, 글 내용은 거의 안 바뀜)
+# - 크롤링 실패/차단 URL: 짧게 (같은 글을 매번 3초 timeout까지 기다리지 않도록)
+# - 꿀팁 요약: (URL, 본문 해시) 기준 (본문이 바뀌면 다시 요약)
+_search_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    "cafe_search", max_size=settings.CAFE_SEARCH_CACHE_SIZE, default_ttl=settings.CAFE_SEARCH_CACHE_TTL
+)
+_selection_cache: TTLCache[List[Dict[str, Any]]] = TTLCache(
+    "cafe_selection", max_size=settings.CAFE_SEARCH_CACHE_SIZE, default_ttl=settings.CAFE_SEARCH_CACHE_TTL
+)
+_article_cache: TTLCache[str] = TTLCache(
+    "cafe_article", max_size=settings.CAFE_ARTICLE_CACHE_SIZE, default_ttl=settings.CAFE_ARTICLE_CACHE_TTL
+)
+_negative_cache: TTLCache[str] = TTLCache(
+    "cafe_negative", max_size=settings.CAFE_ARTICLE_CACHE_SIZE, default_ttl=settings.CAFE_NEGATIVE_CACHE_TTL
+)
+_tip_cache: TTLCache[str] = TTLCache(
+    "cafe_tip", max_size=settings.CAFE_ARTICLE_CACHE_SIZE, default_ttl=settings.CAFE_TIP_CACHE_TTL
+)
+# 진행 중인 카페 검색 API 호출 (같은 검색어는 한 번만 호출)
+_search_flight: SingleFlight[Dict[str, Any]] = SingleFlight("naver_cafe")
+
+TIP_PROMPT = """
+맘카페 후기 본문을 보고 '엄마들을 위한 찐 꿀팁'을 한 줄로 요약해줘.
+(예: 주차장 만차 시간, 준비물, 비추천 이유 등)
+
+[본문]: {full_text}
+"""
 
 # ============================================
 # 1. 비동기 크롤링 헬퍼 함수
 # ============================================
 
+def _is_content_container(el) -> bool:
+    if el.tag != "div":
+        return False
+    return "se-main-container" in (el.get("class") or "").split() or el.get("id") == "postContent"
+
+def _collect_text(node, parts: List[str]):
+    """BeautifulSoup get_text와 같은 순서로 텍스트 수집 (script/style/주석 제외)"""
+    if node.text:
+        parts.append(node.text)
+    for child in node:
+        if isinstance(child.tag, str) and child.tag not in SKIP_TEXT_TAGS:
+            _collect_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+def container_text(container) -> str:
+    parts: List[str] = []
+    _collect_text(container, parts)
+    return " ".join(p.strip() for p in parts if p.strip())[:MAX_CONTENT_CHARS]
+
+async def extract_cafe_content(chunks: AsyncIterator[bytes], encoding: str = "utf-8") -> str:
+    """
+    HTML을 받는 대로 lxml로 점진 파싱하고, 본문 컨테이너가 닫히면 바로 반환
+    (본문 뒤의 댓글/추천글/스크립트는 파싱하지 않음)
+    """
+    parser = etree.HTMLPullParser(events=("end",), encoding=encoding)
+    async for chunk in chunks:
+        parser.feed(chunk)
+        for _, el in parser.read_events():
+            if _is_content_container(el):
+                return container_text(el)
+    parser.close()
+    for _, el in parser.read_events():
+        if _is_content_container(el):
+            return container_text(el)
+    return ""
+
+async def _drain_or_close(resp):
+    drained = 0
+    while drained <= DRAIN_LIMIT:
+        chunk = await resp.content.readany()
+        if not chunk:
+            return
+        drained += len(chunk)
+    resp.close()
+
+async def _crawl_cafe(session, link: str) -> str:
+    """본문을 가져오지 못하면(상태 코드 오류/차단/본문 없음) 이유를 담은 예외"""
+    # 모바일 링크로 변환하여 본문 접근 용이하게 함
+    target = link.replace("cafe.naver.com", "m.cafe.naver.com")
+    headers = {"User-Agent": USER_AGENT} 
+    
+    async with session.get(target, headers=headers, timeout=aiohttp.ClientTimeout(total=3)) as resp:
+        if resp.status != 200:
+            raise ValueError(f"HTTP {resp.status}")
+        content = await extract_cafe_content(
+            resp.content.iter_chunked(READ_CHUNK_SIZE), encoding=resp.charset or "utf-8"
+        )
+        await _drain_or_close(resp)
+    if not content:
+        # 로그인/멤버 공개 글은 본문 컨테이너 없이 안내 페이지가 옴
+        raise ValueError("본문 없음")
+    return content
+
 async def fetch_single_cafe(session, link: str) -> str:
-    """개별 카페 글을 비동기로 크롤링."""
-    try:
-        # 모바일 링크로 변환하여 본문 접근 용이하게 함
-        target = link.replace("cafe.naver.com", "m.cafe.naver.com")
-        headers = {"User-Agent": USER_AGENT} 
-        
-        async with session.get(target, headers=headers, timeout=3) as resp:
-            if resp.status != 200: return ""
-            html = await resp.text()
-            soup = BeautifulSoup(html, 'html.parser')
-        
-            # 본문 내용 추출
-            content = soup.find("div", class_="se-main-container")
-            if not content: content = soup.find("div", id="postContent")
-            
-            if content: return content.get_text(" ", strip=True)[:850]
+    """개별 카페 글을 비동기로 크롤링 (본문/실패 URL 캐시 사용)."""
+    if settings.CAFE_CACHE_ENABLED:
+        cached = _article_cache.get(link)
+        if cached is not None:
+            return cached
+        if _negative_cache.get(link) is not None:
             return ""
-    except:
+
+    try:
+        content = await _crawl_cafe(session, link)
+    except Exception as e:
+        logger.debug(f"[CAFE] 본문 크롤링 실패 {link}: {e}")
+        if settings.CAFE_CACHE_ENABLED:
+            _negative_cache.set(link, str(e) or type(e).__name__)
         return ""
 
+    if settings.CAFE_CACHE_ENABLED:
+        _article_cache.set(link, content)
+    return content
+
 async def fetch_cafe_urls(links: List[str]):
-    """여러 카페 글을 병렬로 크롤링."""
-    async with aiohttp.ClientSession() as session:
-        return await asyncio.gather(*[fetch_single_cafe(session, l) for l in links])
+    """여러 카페 글을 병렬로 크롤링 (앱 공유 세션으로 연결 재사용)."""
+    session = await get_http_session()
+    return await asyncio.gather(*[fetch_single_cafe(session, l) for l in links])
+
+async def summarize_tip(full_text: str) -> Optional[str]:
+    """본문 한 건을 한 줄 꿀팁으로 요약 (시간 초과/실패 시 None)"""
+    try:
+        tip_msg = await asyncio.wait_for(
+            get_llm("summarize").ainvoke(TIP_PROMPT.format(full_text=full_text)),
+            timeout=settings.CAFE_SUMMARY_TIMEOUT,
+        )
+        return tip_msg.content.strip()
+    except asyncio.TimeoutError:
+        incr("cafe.summary_timeout")
+        logger.warning(f"⚠️ [CAFE] 꿀팁 요약 시간 초과 ({settings.CAFE_SUMMARY_TIMEOUT}s) -> 선별 요약만 사용")
+    except Exception as e:
+        logger.warning(f"⚠️ [CAFE] 꿀팁 요약 실패: {e}")
+    return None
+
+def _tip_key(link: str, full_text: str):
+    return (link, hashlib.sha1(full_text.encode("utf-8")).hexdigest())
+
+async def summarize_tips(links: List[str], contents: List[str]) -> List[Optional[str]]:
+    """
+    크롤링한 본문들을 동시에(최대 CAFE_SUMMARY_CONCURRENCY개) 요약.
+    글마다 timeout을 따로 적용해 늦은 글이 있어도 나머지 결과는 유지.
+    (URL, 본문 해시)가 같은 요약은 캐시에서 재사용 (실패/시간 초과는 저장하지 않음)
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.CAFE_SUMMARY_CONCURRENCY))
+
+    async def _bounded(link: str, full_text: str) -> Optional[str]:
+        if not full_text:
+            return None
+        key = _tip_key(link, full_text)
+        if settings.CAFE_CACHE_ENABLED:
+            cached = _tip_cache.get(key)
+            if cached is not None:
+                return cached
+        async with semaphore:
+            tip = await summarize_tip(full_text)
+        if tip and settings.CAFE_CACHE_ENABLED:
+            _tip_cache.set(key, tip)
+        return tip
+
+    return await asyncio.gather(*[_bounded(link, text) for link, text in zip(links, contents)])
+
+class CafeSearchError(Exception):
+    def __init__(self, status: int):
+        super().__init__(f"네이버 API 오류 발생 (상태코드: {status})")
+        self.status = status
+
+async def search_cafe_articles(session, query: str, headers: Dict[str, str]) -> Dict[str, Any]:
+    """네이버 카페 검색 API (정상 응답만 짧게 캐시). 실패하면 상태 코드를 담은 예외"""
+    params = {"query": query, "display": 10, "sort": "sim"} 
+    key = (query, params["display"], params["sort"])
+    if settings.CAFE_CACHE_ENABLED:
+        cached = _search_cache.get(key)
+        if cached is not None:
+            return cached
+
+    async def _request() -> Dict[str, Any]:
+        async with session.get(NAVER_CAFE_API_URL, headers=headers, params=params) as resp:
+            # API 호출 실패 오류 방지 (resp.status 사용)
+            if resp.status != 200:
+                raise CafeSearchError(resp.status)
+            # 응답 JSON을 비동기로 가져오기
+            return await resp.json()
+
+    def _store(data: Dict[str, Any]):
+        if settings.CAFE_CACHE_ENABLED:
+            _search_cache.set(key, data)
+
+    # 동시에 들어온 같은 검색은 진행 중인 API 호출 1개의 결과(또는 오류)를 공유
+    return await _search_flight.do(request_signature(*key), _request, on_success=_store)
+
+_CAFE_CACHES = (_search_cache, _selection_cache, _article_cache, _negative_cache, _tip_cache)
+
+def get_cafe_cache_stats() -> Dict[str, Any]:
+    """검색 응답/선별/본문/실패 URL/꿀팁 캐시별 크기와 적중률"""
+    return {cache.name: cache.stats() for cache in _CAFE_CACHES}
+
+def clear_cafe_cache():
+    for cache in _CAFE_CACHES:
+        cache.clear()
+    _search_flight.clear()
 
 # ============================================
 # 2. AI 분석 데이터 모델
@@ -58,61 +252,13 @@ class CafeAnalysis(BaseModel):
     results: List[CafeItem]
 
 # ============================================
-# 3. 툴 정의 
+# 3. 후기 파이프라인 / 툴 정의
 # ============================================
 
-@tool
-async def naver_cafe_search(query: str, conversation_id: str) -> str:
-    """
-    네이버 맘카페를 검색하여 '솔직 후기', '장단점', '주차/웨이팅 꿀팁'을 확인합니다. (완전 비동기)
-    검증이나 평판 조회가 필요할 때 사용하세요.
-    """
-    naver_id = settings.NAVER_CLIENT_ID
-    naver_secret = settings.NAVER_CLIENT_SECRET
-    
-    if not naver_id or not naver_secret:
-        return "오류: 서버 설정(config)에 네이버 API 키가 누락되었습니다."
+class CafeReviewsNotFound(Exception):
+    """보여줄 후기가 없음 (검색 결과 없음 / 이미 보여준 글뿐)"""
 
-    # [Step 1] 카페 검색 API 설정
-    url = "https://openapi.naver.com/v1/search/cafearticle.json"
-    headers = {
-        "X-Naver-Client-Id": naver_id, 
-        "X-Naver-Client-Secret": naver_secret
-    }
-    params = {"query": query, "display": 10, "sort": "sim"} 
-    
-    try:
-        if conversation_id:
-            set_status(conversation_id, "후기 검색 중...")
-            
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, params=params) as resp:
-        
-                # API 호출 실패 오류 방지 (resp.status 사용)
-                if resp.status != 200:
-                    return f"네이버 API 오류 발생 (상태코드: {resp.status})"
-
-                # 응답 JSON을 비동기로 가져오기
-                data = await resp.json() 
-        
-        if not data.get('items'): return "관련 카페 후기가 없습니다."
-
-        raw_items = []
-        shown = set(get_shown_facility_names(conversation_id)) if conversation_id else set()
-        
-        for item in data['items']:
-            title = item['title'].replace("<b>","").replace("</b>","")
-            if title in shown: continue
-            raw_items.append({"title": title, "link": item['link'], "desc": item['description']})
-
-        if not raw_items: return "새로운 후기가 없습니다."
-
-        # [Step 2] LLM 1차 선별 (
-        llm = get_llm()
-        parser = JsonOutputParser(pydantic_object=CafeAnalysis)
-        
-        prompt = PromptTemplate(
-            template="""
+SELECT_PROMPT = """
             사용자 질문: {user_query}
             아래 맘카페 글 중 **가장 솔직하고 도움되는 후기 3개**를 골라주세요.
             (단순 홍보, 질문글 제외. '다녀왔어요' 후기 우선)
@@ -122,53 +268,106 @@ async def naver_cafe_search(query: str, conversation_id: str) -> str:
             
             출력 형식: JSON
             {format_instructions}
-            """,
-            input_variables=["user_query", "raw_data"],
-            partial_variables={"format_instructions": parser.get_format_instructions()}
-        )
-        
-        raw_text = "\n".join([f"- {i['title']} ({i['link']}) : {i['desc']}" for i in raw_items[:10]])
-        
+            """
+
+async def collect_cafe_reviews(query: str, shown: Collection[str] = ()) -> List[Dict[str, Any]]:
+    """
+    카페 검색 → LLM 후기 3개 선별 → 본문 병렬 크롤링 → 꿀팁 요약
+    후기 목록({title, link, summary, sentiment, tip})을 반환. 네이버 API 오류는 CafeSearchError, 후기가 없으면 CafeReviewsNotFound
+    """
+    # [Step 1] 카페 검색 API 설정
+    headers = {
+        "X-Naver-Client-Id": settings.NAVER_CLIENT_ID,
+        "X-Naver-Client-Secret": settings.NAVER_CLIENT_SECRET
+    }
+    session = await get_http_session()
+    data = await search_cafe_articles(session, query, headers)
+
+    if not data.get('items'):
+        raise CafeReviewsNotFound("관련 카페 후기가 없습니다.")
+
+    raw_items = []
+    for item in data['items']:
+        title = item['title'].replace("<b>","").replace("</b>","")
+        if title in shown: continue
+        raw_items.append({"title": title, "link": item['link'], "desc": item['description']})
+
+    if not raw_items:
+        raise CafeReviewsNotFound("새로운 후기가 없습니다.")
+
+    # [Step 2] LLM 1차 선별
+    llm = get_llm("select")
+    parser = JsonOutputParser(pydantic_object=CafeAnalysis)
+    
+    prompt = PromptTemplate(
+        template=SELECT_PROMPT,
+        input_variables=["user_query", "raw_data"],
+        partial_variables={"format_instructions": parser.get_format_instructions()}
+    )
+    
+    raw_text = "\n".join([f"- {i['title']} ({i['link']}) : {i['desc']}" for i in raw_items[:10]])
+    
+    selection_key = (query, hashlib.sha1(raw_text.encode("utf-8")).hexdigest())
+    cached_top_3 = _selection_cache.get(selection_key) if settings.CAFE_CACHE_ENABLED else None
+    if cached_top_3 is not None:
+        top_3 = [dict(item) for item in cached_top_3]
+    else:
         chain = prompt | llm | parser
         analysis = await chain.ainvoke({"user_query": query, "raw_data": raw_text})
         top_3 = analysis['results']
+        if settings.CAFE_CACHE_ENABLED:
+            _selection_cache.set(selection_key, [dict(item) for item in top_3])
 
-        # [Step 3] 비동기 병렬 크롤링 (await 사용)
-        target_links = [item['link'] for item in top_3]
-        contents = await fetch_cafe_urls(target_links) 
+    # [Step 3] 비동기 병렬 크롤링 (await 사용)
+    target_links = [item['link'] for item in top_3]
+    contents = await fetch_cafe_urls(target_links) 
 
-        final_results = []
-        for idx, item in enumerate(top_3):
-            full_text = contents[idx]
-            
-            if full_text:
-                refine_prompt = f"""
-                맘카페 후기 본문을 보고 '엄마들을 위한 찐 꿀팁'을 한 줄로 요약해줘.
-                (예: 주차장 만차 시간, 준비물, 비추천 이유 등)
-                
-                [본문]: {full_text}
-                """
-                try:
-                    tip_msg = await llm.ainvoke(refine_prompt)
-                    tip = tip_msg.content.strip()
-                    item['summary'] = f"{item['summary']} (💡 {tip})"
-                except: pass
-            
-            final_results.append(item)
-
-        # [Step 4] 반환
-        if conversation_id:
-             save_data = [{"name": i['title'], "link": i['link']} for i in final_results]
-             # 맘카페 검색 결과이므로 source="cafe"로 저장
-             save_search_results(conversation_id, save_data, source="cafe")
-
-        res_text = f"☕ **'{query}' 맘카페 찐후기**:\n\n"
-        for i, item in enumerate(final_results, 1):
-            icon = "👍" if item['sentiment'] == "긍정" else "💬"
-            link = f'<a href="{item["link"]}" target="_blank">글 보기</a>'
-            res_text += f"{i}. {icon} **{item['title']}**\n   🗣️ {item['summary']}\n   🔗 {link}\n\n"
-            
-        return res_text
+    # [Step 3-1] 본문별 꿀팁 요약 (동시 실행, 글마다 timeout)
+    tips = await summarize_tips(target_links, contents)
 
-    except Exception as e:
-        return f"카페 검색 오류: {e}"
+    return [{**item, "tip": tip} for item, tip in zip(top_3, tips)]
+
+def format_cafe_reviews(query: str, reviews: List[Dict[str, Any]]) -> str:
+    res_text = f"☕ **'{query}' 맘카페 찐후기**:\n\n"
+    for i, item in enumerate(reviews, 1):
+        icon = "👍" if item['sentiment'] == "긍정" else "💬"
+        summary = f"{item['summary']} (💡 {item['tip']})" if item.get('tip') else item['summary']
+        link = f'<a href="{item["link"]}" target="_blank">글 보기</a>'
+        res_text += f"{i}. {icon} **{item['title']}**\n   🗣️ {summary}\n   🔗 {link}\n\n"
+    return res_text
+
+@tool
+async def naver_cafe_search(query: str, conversation_id: str) -> str:
+    """
+    네이버 맘카페를 검색하여 '솔직 후기', '장단점', '주차/웨이팅 꿀팁'을 확인합니다. (완전 비동기)
+    검증이나 평판 조회가 필요할 때 사용하세요.
+    """
+    shown = set(get_shown_facility_names(conversation_id)) if conversation_id else set()
+
+    # 인기 시설은 백그라운드로 미리 만든 후기 요약(digest)이 있으면 파이프라인 생략
+    reviews = lookup_review_digest(query, shown)
+
+    if reviews is None:
+        if not settings.NAVER_CLIENT_ID or not settings.NAVER_CLIENT_SECRET:
+            return "오류: 서버 설정(config)에 네이버 API 키가 누락되었습니다."
+
+        try:
+            if conversation_id:
+                set_status(conversation_id, "후기 검색 중...")
+            reviews = await collect_cafe_reviews(query, shown)
+        except (CafeSearchError, CafeReviewsNotFound) as e:
+            return str(e)
+        except Exception as e:
+            return f"카페 검색 오류: {e}"
+
+        # 이미 보여준 글로 걸러지지 않은 결과면 다음 질문을 위해 후기 요약으로 저장
+        if not shown:
+            store_review_digest(query, reviews)
+
+    # [Step 4] 반환
+    if conversation_id:
+         save_data = [{"name": i['title'], "link": i['link']} for i in reviews]
+         # 맘카페 검색 결과이므로 source="cafe"로 저장
+         save_search_results(conversation_id, save_data, source="cafe")
+
+    return format_cafe_reviews(query, reviews)
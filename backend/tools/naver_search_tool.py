@@ -1,9 +1,9 @@
-import asyncio
 import logging
-from typing import Dict, List
+from typing import Dict, List, Set
 
 from langchain_core.tools import tool
 
+from tools.event_index import lookup_events
 from tools.perplexity_client import (
     PerplexityClientError,
     PerplexityResponseFormatError,
@@ -40,26 +40,8 @@ def _format_results(results: List[Dict[str, str]], query: str) -> str:
     return "\n".join(lines)
 
 
-@tool
-async def naver_web_search(query: str, conversation_id: str) -> str:
-    """
-    Perplexity를 통해 최신 행사/이벤트 정보를 검색합니다.
-    """
-    if conversation_id:
-        set_status(conversation_id, "웹 정보 확인 중..")
-
-    shown_names = set(get_shown_facility_names(conversation_id)) if conversation_id else set()
-
-    try:
-        # Perplexity wrapper(search_events_with_perplexity) 를 백그라운드 스레드에서 호출
-        raw_results = await asyncio.to_thread(search_events_with_perplexity, query)
-    except (PerplexityClientError, PerplexityResponseFormatError) as exc:
-        logger.error("Perplexity 검색 오류: %s", exc)
-        return f"웹 검색 오류: {exc}"
-    except Exception as exc:
-        logger.exception("Perplexity 검색 중 알 수 없는 오류")
-        return f"웹 검색 중 알 수 없는 오류가 발생했습니다: {exc}"
-
+def _filter_new_results(raw_results: List[Dict[str, str]], shown_names: Set[str]) -> List[Dict[str, str]]:
+    """이미 보여준 행사를 뺀 결과"""
     filtered_results = []
     for item in raw_results:
         name = item.get("name") or ""
@@ -74,13 +56,46 @@ async def naver_web_search(query: str, conversation_id: str) -> str:
                 "location": item.get("location", ""),
             }
         )
+    return filtered_results
+
+
+@tool
+async def naver_web_search(query: str, conversation_id: str) -> str:
+    """
+    Perplexity를 통해 최신 행사/이벤트 정보를 검색합니다.
+    """
+    if conversation_id:
+        set_status(conversation_id, "웹 정보 확인 중..")
+
+    shown_names = set(get_shown_facility_names(conversation_id)) if conversation_id else set()
+
+    # 백그라운드로 미리 채운 행사 인덱스(인기 지역 × 이번 주/주말)에 있으면 실시간 검색 생략
+    indexed_results = lookup_events(query)
+    filtered_results = _filter_new_results(indexed_results, shown_names) if indexed_results is not None else []
+
+    # 인덱스에 없거나, 인덱스 행사를 이미 모두 보여줬으면("더 알려줘") 실시간 검색으로 새 행사를 찾음
+    if not filtered_results:
+        try:
+            # Perplexity wrapper(search_events_with_perplexity): 공유 async 클라이언트 + 당일 결과 캐시
+            raw_results = await search_events_with_perplexity(query)
+            filtered_results = _filter_new_results(raw_results, shown_names)
+            if not filtered_results and shown_names:
+                # 당일 캐시 결과를 이미 모두 보여줬으면("더 알려줘") 캐시 없이 다시 검색해 새 행사를 찾음
+                raw_results = await search_events_with_perplexity(query, use_cache=False)
+                filtered_results = _filter_new_results(raw_results, shown_names)
+        except (PerplexityClientError, PerplexityResponseFormatError) as exc:
+            logger.error("Perplexity 검색 오류: %s", exc)
+            return f"웹 검색 오류: {exc}"
+        except Exception as exc:
+            logger.exception("Perplexity 검색 중 알 수 없는 오류")
+            return f"웹 검색 중 알 수 없는 오류가 발생했습니다: {exc}"
 
     if not filtered_results:
         return "새로운 웹 검색 결과가 없습니다."
 
     if conversation_id:
         save_data = [
-            {"name": i.get("name", ""), "link": i.get("link", "")}
+            {"name": i.get("name", ""), "link": i.get("link", ""), "location": i.get("location", "")}
             for i in filtered_results
             if i.get("name") or i.get("link")
         ]
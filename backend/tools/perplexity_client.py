@@ -1,19 +1,36 @@
+import asyncio
 import json
 import logging
 import os
 import re
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict, List, Optional
 
+import httpx
 from dotenv import load_dotenv
-from perplexity import Perplexity
-from datetime import datetime
+from perplexity import AsyncPerplexity
+from datetime import datetime, timedelta
 
 from config import settings
+from utils.metrics import incr, record_request
+from utils.singleflight import SingleFlight, request_signature
+from utils.ttl_cache import TTLCache
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# 행사 답변은 하루 단위로만 바뀌므로 (정규화한 질의, 오늘 날짜) 기준으로 자정까지 캐시
+_event_cache: TTLCache[List[Dict[str, str]]] = TTLCache(
+    "perplexity_events", max_size=settings.PERPLEXITY_CACHE_SIZE, default_ttl=24 * 3600.0
+)
+# 같은 질의로 진행 중인 호출 (동시에 들어온 같은 질의는 API를 한 번만 호출하고 결과/오류를 나눠 받음)
+_flight: SingleFlight[List[Dict[str, str]]] = SingleFlight("perplexity")
+
+# 프로세스당 클라이언트 1개 (연결 재사용). httpx 연결은 이벤트 루프에 묶이므로 루프가 바뀌면 새로 만듦
+_client: Optional[AsyncPerplexity] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
 SYSTEM_PROMPT = (
     "응답 전체를 JSON 배열 하나로만 반환하라. 절대 마크다운, 코드펜스, 추가 설명을 쓰지 말고 순수 JSON만 출력하라. "
     "각 요소는 {\"name\": \"...\", \"link\": \"https://...\", \"description\": \"...\", \"location\": \"...\"} 형식이며 모든 필드는 비어 있지 않은 문자열이어야 한다. "
@@ -108,64 +125,61 @@ def _normalize_results(raw_results: List[Any]) -> List[Dict[str, str]]:
     return normalized
 
 
-def search_events_with_perplexity(original_query: str, model: str = "sonar-pro") -> List[Dict[str, str]]:
-    """
-    Perplexity wrapper
-    Perplexity API를 호출하여 행사/이벤트 정보를 검색합니다.
-    
-    상세:
-    API 키 로드와 오늘 날짜 계산 → 프롬프트 구성.
-    Perplexity chat.completions.create 호출.
-    응답 JSON을 파싱/정규화해 [{name, link, description, location}, ...] 리스트로 반환.
-    호출/파싱 오류를 PerplexityClientError/PerplexityResponseFormatError로 정리.
-    """
-    api_key = os.getenv("PERPLEXITY_API_KEY") or settings.PERPLEXITY_API_KEY
-    if not api_key:
-        raise PerplexityClientError("PERPLEXITY_API_KEY가 설정되지 않았습니다. .env 또는 환경변수를 확인하세요.")
+def _today_text(now: datetime) -> str:
+    weekday_names = ["월", "화", "수", "목", "금", "토", "일"]
+    return now.strftime("%Y-%m-%d") + f" ({weekday_names[now.weekday()]})"
 
-    if not original_query:
-        raise PerplexityClientError("검색어가 비어 있습니다.")
 
-    now = datetime.now()
-    weekday_names = ["월", "화", "수", "목", "금", "토", "일"]
-    weekday_text = weekday_names[now.weekday()]
-    today_text = now.strftime("%Y-%m-%d") + f" ({weekday_text})"
+def _normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", query).strip().lower()
 
-    client = Perplexity(api_key=api_key)
-    user_prompt = _build_user_prompt(original_query, today_text)
 
-    try:
-        completion = client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt},
-            ],
-            model=model,
+def _seconds_until_midnight(now: datetime) -> float:
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return max(1.0, (midnight - now).total_seconds())
+
+
+def _get_client(api_key: str) -> AsyncPerplexity:
+    """공유 AsyncPerplexity 반환 (없거나 다른 루프/다른 키의 클라이언트면 새로 생성)"""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop or _client.api_key != api_key:
+        timeout = settings.PERPLEXITY_TIMEOUT
+        _client = AsyncPerplexity(
+            api_key=api_key,
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 5.0)),
+            max_retries=settings.PERPLEXITY_MAX_RETRIES,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0),
+            ),
         )
-    except Exception as exc:
-        logger.error("Perplexity API 호출 실패: %s", exc)
-        raise PerplexityClientError(f"Perplexity API 호출 실패: {exc}") from exc
+        _client_loop = loop
+        logger.info(f"✅ Perplexity 클라이언트 생성 (timeout {timeout}s)")
+    return _client
 
-    content = None
-    if completion and getattr(completion, "choices", None) and completion.choices:
-        message = getattr(completion.choices[0], "message", None)
-        content = getattr(message, "content", None) if message else None
+
+async def close_perplexity_client():
+    global _client, _client_loop
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        await _client.close()
+    _client, _client_loop = None, None
+
+
+def _parse_content(content: Any) -> List[Dict[str, str]]:
+    """응답 본문 → [{name, link, description, location}, ...] (형식 오류는 PerplexityResponseFormatError)"""
     if not content:
         raise PerplexityResponseFormatError("Perplexity 응답이 비어 있습니다.")
 
     raw_content = str(content).strip()
-    logger.warning("Perplexity raw content (first 500 chars): %s", raw_content[:500])
-    
+    logger.debug("Perplexity raw content (first 500 chars): %s", raw_content[:500])
+
     json_str = _extract_json_array(raw_content)
-    logger.warning("Perplexity json_str: %s", (json_str[:500] + "...") if len(json_str) > 500 else json_str)
-    
     if not json_str:
         logger.error("Perplexity 응답에서 JSON 배열을 찾지 못했습니다. raw=%s", raw_content[:300])
         raise PerplexityResponseFormatError("Perplexity 응답이 비어 있거나 JSON 배열을 찾지 못했습니다.")
 
     try:
         parsed = json.loads(json_str)
-        logger.warning("Perplexity parsed object: %s", parsed)
     except json.JSONDecodeError as exc:
         logger.error("Perplexity 응답 파싱 실패: %s / raw=%s", exc, raw_content[:300])
         raise PerplexityResponseFormatError(f"Perplexity 응답 JSON 파싱 실패: {exc}") from exc
@@ -174,8 +188,87 @@ def search_events_with_perplexity(original_query: str, model: str = "sonar-pro")
         raise PerplexityResponseFormatError("Perplexity 응답이 JSON 배열 형식이 아닙니다.")
 
     normalized = _normalize_results(parsed)
-    logger.warning("Perplexity normalized: %s", normalized)
+    logger.debug("Perplexity normalized: %s", normalized)
     if not normalized:
         raise PerplexityResponseFormatError("Perplexity 응답에서 유효한 항목을 찾지 못했습니다.")
 
     return normalized
+
+
+async def _call_perplexity(api_key: str, original_query: str, today_text: str, model: str) -> List[Dict[str, str]]:
+    client = _get_client(api_key)
+    user_prompt = _build_user_prompt(original_query, today_text)
+
+    started = time.perf_counter()
+    try:
+        completion = await client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt},
+            ],
+            model=model,
+        )
+    except Exception as exc:
+        incr("perplexity.errors")
+        logger.error("Perplexity API 호출 실패: %s", exc)
+        raise PerplexityClientError(f"Perplexity API 호출 실패: {exc}") from exc
+    record_request("perplexity", time.perf_counter() - started)
+    incr("perplexity.calls")
+
+    content = None
+    if completion and getattr(completion, "choices", None) and completion.choices:
+        message = getattr(completion.choices[0], "message", None)
+        content = getattr(message, "content", None) if message else None
+    return _parse_content(content)
+
+
+async def search_events_with_perplexity(
+    original_query: str, model: str = "sonar-pro", use_cache: bool = True
+) -> List[Dict[str, str]]:
+    """
+    Perplexity wrapper
+    Perplexity API를 호출하여 행사/이벤트 정보를 검색합니다.
+    
+    상세:
+    API 키 로드와 오늘 날짜 계산 → 프롬프트 구성.
+    (정규화한 질의, 오늘 날짜, 모델) 캐시를 먼저 확인하고, 없으면 공유 AsyncPerplexity로
+    chat.completions.create 호출 (같은 키로 진행 중인 호출이 있으면 그 결과를 함께 기다림).
+    응답 JSON을 파싱/정규화해 [{name, link, description, location}, ...] 리스트로 반환하고 자정까지 캐시.
+    호출/파싱 오류를 PerplexityClientError/PerplexityResponseFormatError로 정리 (오류는 캐시하지 않음).
+    use_cache=False면 캐시/진행 중 호출을 거치지 않고 항상 새로 호출 (행사 인덱스 백그라운드 갱신용).
+    """
+    api_key = os.getenv("PERPLEXITY_API_KEY") or settings.PERPLEXITY_API_KEY
+    if not api_key:
+        raise PerplexityClientError("PERPLEXITY_API_KEY가 설정되지 않았습니다. .env 또는 환경변수를 확인하세요.")
+
+    if not original_query:
+        raise PerplexityClientError("검색어가 비어 있습니다.")
+
+    now = datetime.now()
+    today_text = _today_text(now)
+    if not (use_cache and settings.PERPLEXITY_CACHE_ENABLED):
+        return await _call_perplexity(api_key, original_query, today_text, model)
+
+    key = (_normalize_query(original_query), now.date().isoformat(), model)
+    cached = _event_cache.get(key)
+    if cached is not None:
+        return [dict(item) for item in cached]
+
+    def _store(results: List[Dict[str, str]]):
+        _event_cache.set(key, results, ttl=_seconds_until_midnight(datetime.now()))
+
+    results = await _flight.do(
+        request_signature(*key),
+        lambda: _call_perplexity(api_key, original_query, today_text, model),
+        on_success=_store,
+    )
+    return [dict(item) for item in results]
+
+
+def get_perplexity_cache_stats() -> Dict[str, Any]:
+    return {**_event_cache.stats(), "inflight": len(_flight)}
+
+
+def clear_perplexity_cache():
+    _event_cache.clear()
+    _flight.clear()
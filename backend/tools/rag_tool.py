@@ -3,11 +3,14 @@ import chromadb
 from chromadb.config import Settings as ChromaSettings
 from config import settings
 from models.pca_embeddings import pca_embeddings
-from typing import Optional
+from typing import Any, Dict, List, Optional
+import asyncio
 import json
 import logging
 from utils.conversation_memory import get_shown_facility_names, set_status
 from utils.location_mapper import CITY_TO_PROVINCE_SIGNGU, extract_location
+from utils.prefetch import consume_prefetch
+from utils.singleflight import SingleFlight, request_signature
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +32,28 @@ except Exception as e:
     logger.error(f"❌ ChromaDB 연결 실패: {e}")
     collection = None
 
+# 동시에 들어온 같은 조건의 Chroma 조회는 한 번만 호출 (임베딩은 pca_embeddings에서 합침)
+_chroma_flight: SingleFlight[Dict[str, Any]] = SingleFlight("chroma")
+
+
+def embedding_prefetch_key(query: str) -> tuple:
+    """선행 조회 캐시 키 (원본 질문 그대로 전달되는 경우 적중)"""
+    return ("embedding", query.strip())
+
+
+async def _query_collection(query: str, query_embedding: List[float], where: Optional[dict]) -> Dict[str, Any]:
+    """Chroma 조회 (임베딩은 질문으로 정해지므로 질문 + where 조건을 요청 서명으로 사용)"""
+    def _query() -> Dict[str, Any]:
+        return collection.query(
+            query_embeddings=[query_embedding],
+            n_results=20,
+            where=where,
+            include=["metadatas", "documents", "distances"]
+        )
+
+    return await _chroma_flight.do(request_signature(query, where, 20), lambda: asyncio.to_thread(_query))
+
+
 @tool
 async def search_facilities(
     original_query: str,
@@ -50,8 +75,10 @@ async def search_facilities(
         return json.dumps({"success": False, "facilities": []})
     
     try:
-        # 임베딩 생성 (비동기 전환)
-        query_embedding = await pca_embeddings.aembed_query(original_query)
+        # 임베딩 생성 (비동기 전환) - /api/chat에서 선행 조회한 임베딩이 있으면 재사용
+        query_embedding = await consume_prefetch(conversation_id, embedding_prefetch_key(original_query))
+        if query_embedding is None:
+            query_embedding = await pca_embeddings.aembed_query(original_query)
         shown_facilities = get_shown_facility_names(conversation_id) if conversation_id else []
 
         # [Normalization] indoor_outdoor 값 정규화 (indoor -> 실내, outdoor -> 실외)
@@ -120,12 +147,7 @@ async def search_facilities(
         print(f"[RAG] 최종 where_clause: {json.dumps(where_clause, ensure_ascii=False) if where_clause else 'None'}")
 
         # 쿼리 실행 (사전 필터 where_clause 적용)
-        results = collection.query(
-            query_embeddings=[query_embedding],
-            n_results=20,
-            where=where_clause,
-            include=["metadatas", "documents", "distances"]
-        )
+        results = await _query_collection(original_query, query_embedding, where_clause)
 
         # 지역 where 필터로 0건이면 location 조건만 제거 후 재시도
         if (
@@ -151,12 +173,7 @@ async def search_facilities(
 
             print(f"[RAG] fallback where_clause (location 제거): {json.dumps(fallback_where, ensure_ascii=False) if fallback_where else 'None'}")
 
-            results = collection.query(
-                query_embeddings=[query_embedding],
-                n_results=20,
-                where=fallback_where,
-                include=["metadatas", "documents", "distances"]
-            )
+            results = await _query_collection(original_query, query_embedding, fallback_where)
         
         facilities = []
         
@@ -0,0 +1,388 @@
+"""
+인기 시설 맘카페 후기 요약(digest)
+- 같은 유명 시설의 후기 질문(Case 3)마다 카페 검색 → LLM 선별 → 크롤링 → 글별 꿀팁 요약을 다시 돌림
+  → 후기 질문이 많은 시설(부족하면 기본 시설)의 파이프라인을 백그라운드로 미리 돌려
+    시설별 요약(후기 제목/링크/요약/평가/꿀팁 + 생성 시각)을 보관, naver_cafe_search는 신선한 요약이 있으면 바로 사용
+- 시설명만 있는 일반 후기 질문("에버랜드 솔직 후기")만 대상, 주차/웨이팅처럼 특정 측면을 묻는 질문은 실시간 검색
+- 요청 경로에서 만든 결과도 요약으로 저장 (이미 보여준 글로 걸러진 결과는 제외)
+- 서버 종료 시 REVIEW_DIGEST_PATH에 저장하고 시작 시 다시 읽음 (python -m tools.review_digest 시설명... 으로 오프라인 생성)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Collection, Deque, Dict, List, Optional, Tuple
+
+from config import settings
+from tools.facility_gazetteer import lookup_place
+from utils.location_mapper import city_mapping
+from utils.metrics import get_counter, incr, record_request
+
+logger = logging.getLogger(__name__)
+
+# 시설명 외에 있어도 같은 요약으로 답할 수 있는 일반 후기 표현
+GENERAL_REVIEW_WORDS = {
+    "후기", "찐후기", "솔직", "솔직후기", "리뷰", "맘카페", "카페후기", "평판", "평가", "장단점",
+    "다녀온", "방문", "방문후기", "어때", "어때요", "어떤가요", "아이랑", "아기랑", "가족", "추천",
+    "좀", "요즘", "최근", "진짜", "실제", "엄마들", "아이", "아기", "애기", "애들", "같이", "함께",
+}
+# 요청 동사/어미 (단어 앞부분으로 비교: "알려줘", "알려주세요", "궁금해요", "다녀왔어요" ...)
+REQUEST_PREFIXES = ("알려", "보여", "찾아", "궁금", "어때", "어떤", "어떻", "어땠", "다녀", "갔다", "가본", "가봤", "괜찮")
+# 특정 측면을 묻는 표현 (요약의 꿀팁만으로는 답이 달라질 수 있어 실시간 검색)
+# 단어 앞부분으로 비교 ("주차장", "예약방법"은 측면 질문, "장단점"은 일반 후기 표현)
+ASPECT_WORDS = ("주차", "웨이팅", "기다려", "대기", "단점", "팁", "꿀팁", "유모차", "예약", "수유실", "가격", "할인")
+# 시설명이 아닌 일반 장소/활동 표현 (시설 사전에 없는 키에 있으면 시설 질문으로 보지 않음)
+GENERIC_PLACE_WORDS = {
+    "갈만한", "가볼만한", "놀만한", "곳", "장소", "데", "근처", "주변", "주말", "나들이", "여행", "코스", "데이트",
+    "실내", "실외", "야외", "놀이", "놀거리", "체험", "키즈카페", "놀이터", "공원", "박물관", "미술관", "도서관",
+    "수영장", "캠핑장", "식당", "맛집", "카페", "행사", "축제", "전시", "어디", "여기", "거기",
+    "아쿠아리움", "동물원", "식물원", "수목원", "과학관", "놀이공원", "테마파크", "워터파크", "물놀이장",
+    "눈썰매장", "썰매장", "스키장", "체험관", "전시관", "호텔", "리조트", "펜션", "글램핑", "목장", "농장",
+    "해수욕장", "바다", "계곡", "숲", "백화점", "쇼핑몰", "마트", "시장", "키즈풀", "키즈존", "실내놀이터",
+}
+PUNCTUATION_PATTERN = re.compile(r"[\"'?!,.~()\[\]]")
+# 시설명으로 볼 최대 단어 수
+MAX_FACILITY_WORDS = 3
+DEMAND_SAMPLES = 5000
+
+
+def _is_general(token: str) -> bool:
+    return token in GENERAL_REVIEW_WORDS or token.startswith(REQUEST_PREFIXES)
+
+
+def _looks_like_facility(words: List[str]) -> bool:
+    """시설 사전에 있는 이름이거나, 지역명/일반 장소 명사("아쿠아리움", "키즈카페")가 없는 고유한 이름"""
+    if lookup_place(" ".join(words)) is not None:
+        return True
+    return not any(w in GENERIC_PLACE_WORDS or w in city_mapping for w in words)
+
+
+def digest_key(query: str) -> Optional[str]:
+    """후기 질문 → 시설명 키 (시설명 + 일반 후기 표현만 있는 질문이 아니면 None)"""
+    tokens = PUNCTUATION_PATTERN.sub(" ", query or "").lower().split()
+    if any(token.startswith(ASPECT_WORDS) for token in tokens if not _is_general(token)):
+        return None
+    words = [w for w in tokens if not _is_general(w)]
+    if not words or len(words) > MAX_FACILITY_WORDS or not _looks_like_facility(words):
+        return None
+    return " ".join(words)
+
+
+@dataclass
+class ReviewDigest:
+    facility: str
+    reviews: List[Dict[str, Any]]
+    built_at: float = field(default_factory=time.time)
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now or time.time()) - self.built_at
+
+
+class ReviewDigestStore:
+    """시설명 키 → 후기 요약 (MAX_AGE보다 오래된 요약은 쓰지 않음)"""
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._digests: Dict[str, ReviewDigest] = {}
+
+    def get(self, facility: str) -> Optional[ReviewDigest]:
+        digest = self._digests.get(facility)
+        if digest is None or digest.age() > self.max_age:
+            return None
+        return digest
+
+    def peek(self, facility: str) -> Optional[ReviewDigest]:
+        return self._digests.get(facility)
+
+    def put(self, facility: str, reviews: List[Dict[str, Any]], built_at: Optional[float] = None) -> bool:
+        # 링크/요약이 없는 항목은 저장하지 않음 (남는 항목이 없으면 기존 요약 유지)
+        compact = [
+            {k: r.get(k) for k in ("title", "link", "summary", "sentiment", "tip")}
+            for r in reviews
+            if r.get("link") and r.get("summary")
+        ]
+        if not compact:
+            return False
+        self._digests[facility] = ReviewDigest(facility, compact, built_at or time.time())
+        return True
+
+    def load(self, path: str) -> int:
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ [REVIEW DIGEST] 파일을 읽지 못함 ({path}): {e}")
+            return 0
+        if not isinstance(entries, list):
+            logger.warning(f"⚠️ [REVIEW DIGEST] 파일 형식이 아님 ({path}): {type(entries).__name__}")
+            return 0
+
+        loaded = skipped = 0
+        for entry in entries:
+            # 모양이 다른 항목은 건너뜀 (요약 파일 때문에 서버 시작이 실패하지 않도록)
+            try:
+                ok = self.put(str(entry["facility"]), list(entry["reviews"]), float(entry["built_at"]))
+            except (KeyError, TypeError, ValueError, AttributeError):
+                ok = False
+            if ok:
+                loaded += 1
+            else:
+                skipped += 1
+        if skipped:
+            logger.warning(f"⚠️ [REVIEW DIGEST] 형식이 잘못된 항목 {skipped}건 건너뜀 ({path})")
+        logger.info(f"✅ [REVIEW DIGEST] 후기 요약 {loaded}건 로드 ({path})")
+        return loaded
+
+    def save(self, path: str) -> int:
+        if not path:
+            return 0
+        entries = [
+            {"facility": d.facility, "reviews": d.reviews, "built_at": d.built_at}
+            for d in self._digests.values()
+            if d.age() <= self.max_age
+        ]
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"⚠️ [REVIEW DIGEST] 저장 실패 ({path}): {e}")
+            return 0
+        logger.info(f"✅ [REVIEW DIGEST] 후기 요약 {len(entries)}건 저장 ({path})")
+        return len(entries)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "entries": len(self._digests),
+            "fresh": sum(1 for d in self._digests.values() if d.age(now) <= self.max_age),
+            "oldest_age_seconds": max((d.age(now) for d in self._digests.values()), default=None),
+        }
+
+    def clear(self):
+        self._digests.clear()
+
+
+# 후기 질문 → 후기 목록 (기본: naver_cafe_search_tool.collect_cafe_reviews)
+ReviewPipeline = Callable[[str], Awaitable[List[Dict[str, Any]]]]
+
+
+class ReviewDigestBuilder:
+    """후기 질문이 많은 시설의 요약을 주기적으로 (다시) 만드는 백그라운드 작업"""
+
+    def __init__(
+        self,
+        store: ReviewDigestStore,
+        pipeline: ReviewPipeline,
+        top_n: int,
+        default_facilities: List[str],
+        demand_window: float,
+        refresh_after: float,
+        interval: float,
+        concurrency: int = 2,
+    ):
+        self.store = store
+        self.pipeline = pipeline
+        self.top_n = top_n
+        self.default_facilities = default_facilities
+        self.demand_window = demand_window
+        self.refresh_after = refresh_after
+        self.interval = interval
+        self.concurrency = concurrency
+        self._task: Optional[asyncio.Task] = None
+        self.last_build_at: Optional[float] = None
+
+    def targets(self) -> List[str]:
+        facilities = top_facilities(self.top_n, self.demand_window)
+        for facility in self.default_facilities:
+            if len(facilities) >= self.top_n:
+                break
+            key = digest_key(facility)
+            if key and key not in facilities:
+                facilities.append(key)
+        return facilities
+
+    async def build_once(self, facilities: Optional[List[str]] = None) -> int:
+        """요약이 없거나 REFRESH_AFTER보다 오래된 시설의 요약을 만들고 성공한 수를 반환 (실패하면 기존 요약 유지)"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        now = time.time()
+        due = []
+        for facility in facilities if facilities is not None else self.targets():
+            digest = self.store.peek(facility)
+            if digest is None or digest.age(now) > self.refresh_after:
+                due.append(facility)
+
+        async def _build(facility: str) -> bool:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    reviews = await self.pipeline(f"{facility} 후기")
+                except Exception as e:
+                    incr("review_digest.build_errors")
+                    logger.warning(f"⚠️ [REVIEW DIGEST] '{facility}' 요약 생성 실패: {e!r}")
+                    return False
+                record_request("review_digest.build", time.perf_counter() - started)
+            return self.store.put(facility, reviews)
+
+        results = await asyncio.gather(*(_build(f) for f in due))
+        self.last_build_at = time.time()
+        ok = sum(results)
+        incr("review_digest.built", ok)
+        if due:
+            logger.info(f"✅ [REVIEW DIGEST] 요약 생성 {ok}/{len(due)}")
+        return ok
+
+    async def _run(self):
+        while True:
+            try:
+                await self.build_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("❌ [REVIEW DIGEST] 생성 루프 오류")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def _parse_list(value: str) -> List[str]:
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+
+_store = ReviewDigestStore(max_age=settings.REVIEW_DIGEST_MAX_AGE)
+_builder: Optional[ReviewDigestBuilder] = None
+# (조회 시각, 시설명 키)
+_demand: Deque[Tuple[float, str]] = deque(maxlen=DEMAND_SAMPLES)
+
+
+def top_facilities(n: int, window: float) -> List[str]:
+    """최근 window초 동안 후기 질문이 많았던 시설명 키 상위 n개"""
+    cutoff = time.time() - window
+    counts = Counter(facility for ts, facility in _demand if ts > cutoff)
+    return [facility for facility, _ in counts.most_common(n)]
+
+
+def lookup_review_digest(query: str, shown: Collection[str] = ()) -> Optional[List[Dict[str, Any]]]:
+    """신선한 요약으로 답할 수 있는 질문이면 (이미 보여준 글을 뺀) 후기 목록, 아니면 None (None이면 실시간 검색)"""
+    if not settings.REVIEW_DIGEST_ENABLED:
+        return None
+    facility = digest_key(query)
+    if facility is None:
+        return None
+    _demand.append((time.time(), facility))
+    incr("review_digest.lookups")
+
+    digest = _store.get(facility)
+    if digest is None:
+        return None
+    reviews = [dict(r) for r in digest.reviews if r["title"] not in shown]
+    if not reviews:
+        return None
+    incr("review_digest.hits")
+    return reviews
+
+
+def store_review_digest(query: str, reviews: List[Dict[str, Any]]):
+    """요청 경로에서 만든 후기 목록을 요약으로 저장 (시설명 질문일 때만)"""
+    facility = digest_key(query) if settings.REVIEW_DIGEST_ENABLED else None
+    if facility is not None:
+        _store.put(facility, reviews)
+
+
+async def _collect_reviews(query: str) -> List[Dict[str, Any]]:
+    # naver_cafe_search_tool이 이 모듈을 import하므로 순환 import를 피해 여기서 가져옴
+    from tools.naver_cafe_search_tool import collect_cafe_reviews
+
+    return await collect_cafe_reviews(query)
+
+
+def create_review_digest_builder(pipeline: Optional[ReviewPipeline] = None) -> ReviewDigestBuilder:
+    return ReviewDigestBuilder(
+        store=_store,
+        pipeline=pipeline or _collect_reviews,
+        top_n=settings.REVIEW_DIGEST_TOP_N,
+        default_facilities=_parse_list(settings.REVIEW_DIGEST_DEFAULT_FACILITIES),
+        demand_window=settings.REVIEW_DIGEST_DEMAND_WINDOW,
+        refresh_after=settings.REVIEW_DIGEST_REFRESH_AFTER,
+        interval=settings.REVIEW_DIGEST_INTERVAL,
+        concurrency=settings.REVIEW_DIGEST_CONCURRENCY,
+    )
+
+
+def start_review_digest_builder(pipeline: Optional[ReviewPipeline] = None) -> ReviewDigestBuilder:
+    global _builder
+    _builder = create_review_digest_builder(pipeline)
+    _builder.start()
+    logger.info(f"✅ [REVIEW DIGEST] 백그라운드 생성 시작 (상위 {_builder.top_n}개 시설)")
+    return _builder
+
+
+async def stop_review_digest_builder():
+    global _builder
+    if _builder is not None:
+        await _builder.stop()
+        _builder = None
+
+
+def load_review_digests(path: Optional[str] = None) -> int:
+    return _store.load(path or settings.REVIEW_DIGEST_PATH)
+
+
+def save_review_digests(path: Optional[str] = None) -> int:
+    return _store.save(path or settings.REVIEW_DIGEST_PATH)
+
+
+def get_review_digest_stats() -> Dict[str, Any]:
+    lookups = get_counter("review_digest.lookups")
+    return {
+        **_store.stats(),
+        "running": _builder is not None,
+        "last_build_at": _builder.last_build_at if _builder else None,
+        "hit_rate": (get_counter("review_digest.hits") / lookups) if lookups else None,
+        "built": get_counter("review_digest.built"),
+        "build_errors": get_counter("review_digest.build_errors"),
+    }
+
+
+def clear_review_digests():
+    _store.clear()
+    _demand.clear()
+
+
+async def _build_offline(facilities: List[str]):
+    from utils.http_session import close_http_session
+
+    load_review_digests()
+    builder = create_review_digest_builder()
+    keys = [key for key in (digest_key(f) for f in facilities) if key] or builder.targets()
+    await builder.build_once(keys)
+    await close_http_session()
+    save_review_digests()
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    # 예: python -m tools.review_digest 에버랜드 서울숲 (인자가 없으면 기본 시설)
+    asyncio.run(_build_offline(sys.argv[1:]))
@@ -14,7 +14,7 @@ class SearchMapInput(BaseModel):
     )
 
 # 2. 래퍼 함수 정의
-def _map_tool_wrapper(place_name_or_address: str, conversation_id: str = "") -> str:
+async def _map_tool_wrapper(place_name_or_address: str, conversation_id: str = "") -> str:
     """
     LLM의 호출 규칙을 맞추기 위한 래퍼 함수. 
     conversation_id를 받지만, 실제 코어 함수에는 전달하지 않습니다.
@@ -32,7 +32,7 @@ def _map_tool_wrapper(place_name_or_address: str, conversation_id: str = "") ->
             }, ensure_ascii=False)
 
     # 그 외에는 원래대로 주소/장소명 지오코딩
-    return search_map_by_address_core(place_name_or_address)
+    return await search_map_by_address_core(place_name_or_address)
 
 
 # 3. StructuredTool 생성 함수 (Factory)
@@ -41,7 +41,7 @@ def create_search_map_tool() -> StructuredTool:
     StructuredTool을 생성하여 반환하는 Factory 함수
     """
     return StructuredTool.from_function(
-        func=_map_tool_wrapper,  
+        coroutine=_map_tool_wrapper,
         name="search_map_by_address",
         description="특정 장소 이름이나 주소를 검색하여 지도 좌표를 반환하는 도구입니다. 대화 기록이 아닌, 입력된 장소나 주소에만 사용하세요.",
         args_schema=SearchMapInput,  
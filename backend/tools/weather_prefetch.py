@@ -0,0 +1,170 @@
+"""
+인기 도시 날씨 예보 백그라운드 갱신
+- 야외/주말 질문은 RAG 전에 날씨부터 확인하므로 예보 조회가 응답 경로에 그대로 올라감
+  → 최근 조회가 많은 상위 N개 도시(city_mapping 영문명, 조회 기록이 적으면 기본 도시로 채움)의 예보를 캐시에 미리 유지
+- 캐시 항목이 만료되기 LEAD + 무작위 JITTER초 전에 새로 조회하고, 새 항목은 기존 항목 다음 갱신 주기까지 이어서 캐시
+  (만료 = 제공자 갱신 시각 + WEATHER_UPDATE_GRACE_SECONDS 이므로 LEAD + JITTER < GRACE면 갱신된 예보를 받음)
+- 최근 1시간 외부 호출 수(요청 경로 포함)가 예산에 닿으면 백그라운드 갱신은 멈추고 요청 경로만 호출
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from config import settings
+from tools.weather_tool import next_update_at, peek_forecasts, provider_calls_last_hour, refresh_forecast, top_cities
+from utils.location_mapper import city_mapping
+from utils.metrics import get_counter, incr
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_list(value: str) -> List[str]:
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+
+class WeatherPrefetchScheduler:
+    def __init__(
+        self,
+        top_n: int,
+        default_cities: List[str],
+        demand_window: float,
+        lead: float,
+        jitter: float,
+        budget_per_hour: int,
+        tick: float,
+        retry_after: float = 600.0,
+    ):
+        self.top_n = top_n
+        self.default_cities = default_cities
+        self.demand_window = demand_window
+        self.lead = lead
+        self.jitter = jitter
+        self.budget_per_hour = budget_per_hour
+        self.tick = tick
+        self.retry_after = retry_after
+        # 도시별 (항목 만료 시각, 갱신 예정 시각) — 만료 시각이 바뀌면 지터를 새로 뽑음
+        self._refresh_at: Dict[str, Tuple[float, float]] = {}
+        # 조회에 실패한 도시(잘못된 도시명/일시 오류)는 retry_after초 동안 건너뜀 (예산 낭비 방지)
+        self._failed_until: Dict[str, float] = {}
+        # 조회 중인 도시 (틱이 조회 완료를 기다리지 않으므로 중복 시작 방지)
+        self._pending: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._rng = random.Random()
+
+    def targets(self) -> List[str]:
+        cities = top_cities(self.top_n, self.demand_window)
+        for city in self.default_cities:
+            if len(cities) >= self.top_n:
+                break
+            if city not in cities:
+                cities.append(city)
+        return cities
+
+    def _due(self, city: str, expires_at: Optional[float], now: float) -> bool:
+        if self._failed_until.get(city, 0) > now:
+            return False
+        if expires_at is None:
+            return True
+        planned = self._refresh_at.get(city)
+        if planned is None or planned[0] != expires_at:
+            planned = (expires_at, expires_at - self.lead - self._rng.uniform(0, self.jitter))
+            self._refresh_at[city] = planned
+        return now >= planned[1]
+
+    async def run_once(self) -> int:
+        """갱신할 때가 된 도시의 조회를 예산 안에서 시작하고 시작한 조회 수를 반환 (완료는 기다리지 않음)"""
+        now = time.time()
+        cached = peek_forecasts()
+        started = 0
+        for city in self.targets():
+            if city in self._pending:
+                continue
+            forecast = cached.get(city)
+            expires_at = forecast.expires_at if forecast else None
+            if not self._due(city, expires_at, now):
+                continue
+            if provider_calls_last_hour() >= self.budget_per_hour:
+                incr("weather_prefetch.budget_skipped")
+                break
+            # 만료 전 갱신이면 새 예보는 기존 항목 다음 주기까지 이어서 캐시
+            next_expiry = next_update_at(expires_at) if expires_at is not None else None
+            task = refresh_forecast(city, origin="scheduler", expires_at=next_expiry)
+            self._pending.add(city)
+            task.add_done_callback(lambda t, city=city: self._on_refreshed(city, t))
+            started += 1
+        return started
+
+    def _on_refreshed(self, city: str, task: asyncio.Task):
+        self._pending.discard(city)
+        if task.cancelled() or task.exception() is not None or task.result() is None:
+            self._failed_until[city] = time.time() + self.retry_after
+            incr("weather_prefetch.failed")
+        else:
+            incr("weather_prefetch.refreshed")
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("❌ [WEATHER PREFETCH] 갱신 루프 오류")
+            await asyncio.sleep(self.tick)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+_scheduler: Optional[WeatherPrefetchScheduler] = None
+
+
+def create_weather_prefetch_scheduler() -> WeatherPrefetchScheduler:
+    default_cities = [city_mapping.get(c, c) for c in _parse_list(settings.WEATHER_PREFETCH_DEFAULT_CITIES)]
+    return WeatherPrefetchScheduler(
+        top_n=settings.WEATHER_PREFETCH_TOP_N,
+        default_cities=default_cities,
+        demand_window=settings.WEATHER_PREFETCH_DEMAND_WINDOW,
+        lead=settings.WEATHER_PREFETCH_LEAD_SECONDS,
+        jitter=settings.WEATHER_PREFETCH_JITTER_SECONDS,
+        budget_per_hour=settings.WEATHER_PROVIDER_BUDGET_PER_HOUR,
+        tick=settings.WEATHER_PREFETCH_TICK_SECONDS,
+    )
+
+
+def start_weather_prefetch() -> WeatherPrefetchScheduler:
+    global _scheduler
+    _scheduler = create_weather_prefetch_scheduler()
+    _scheduler.start()
+    logger.info(f"✅ [WEATHER PREFETCH] 백그라운드 갱신 시작 (상위 {_scheduler.top_n}개 도시)")
+    return _scheduler
+
+
+async def stop_weather_prefetch():
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.stop()
+        _scheduler = None
+
+
+def get_weather_prefetch_stats() -> Dict[str, Any]:
+    return {
+        "running": _scheduler is not None,
+        "targets": _scheduler.targets() if _scheduler else [],
+        "refreshed": get_counter("weather_prefetch.refreshed"),
+        "failed": get_counter("weather_prefetch.failed"),
+        "budget_skipped": get_counter("weather_prefetch.budget_skipped"),
+    }
@@ -1,10 +1,62 @@
 from langchain.tools import tool
-import requests
+import aiohttp
 from config import settings  # 수정
+from collections import Counter, OrderedDict, deque
 from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import asyncio
 import json
+import logging
+import math
+import time
 from utils.conversation_memory import set_status
+from utils.http_session import get_http_session
 from utils.location_mapper import city_mapping
+from utils.metrics import get_counter, incr, record_request
+from utils.prefetch import consume_prefetch
+from utils.singleflight import SingleFlight, request_signature
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+WEATHER_API_URL = "https://api.openweathermap.org/data/2.5/forecast"
+# OpenWeather 5일/3시간 예보는 3시간(UTC 00/03/06...)마다 갱신 → 다음 갱신 시각(+반영 지연)까지 캐시
+FORECAST_UPDATE_SECONDS = 3 * 3600
+# 도시별 최근 조회 기록 (백그라운드 예보 갱신 대상 선정용)
+DEMAND_SAMPLES = 10000
+
+
+class CityForecast:
+    """도시 1곳의 5일/3시간 예보. 날짜(YYYY-MM-DD)별 첫 슬롯을 미리 색인해 날짜 조회를 O(1)로"""
+
+    def __init__(self, slots: List[dict], origin: str = "request"):
+        self.slots = slots
+        self.by_date: Dict[str, dict] = {}
+        for slot in slots:
+            self.by_date.setdefault(slot["dt_txt"][:10], slot)
+        self.fetched_at = time.time()
+        # 조회 경로("request" / "scheduler")와 캐시 만료 시각 (캐시에 넣을 때 채움)
+        self.origin = origin
+        self.expires_at: Optional[float] = None
+
+    def slot_for(self, target_date_str: str) -> dict:
+        """대상 날짜의 첫 슬롯 (예보 범위 밖이면 가장 가까운 첫 슬롯)"""
+        return self.by_date.get(target_date_str) or self.slots[0]
+
+
+# 영문 도시명(city_mapping) → CityForecast
+_forecast_cache: TTLCache[CityForecast] = TTLCache(
+    "weather_forecast", max_size=settings.WEATHER_CACHE_SIZE, default_ttl=FORECAST_UPDATE_SECONDS
+)
+# 같은 도시를 동시에 조회하면 API 호출 1번을 나눠 받음
+_flight: SingleFlight[Optional[CityForecast]] = SingleFlight("openweather")
+# city_mapping 영문 도시명 (수요 집계 대상)
+_KNOWN_CITIES = frozenset(city_mapping.values())
+# (조회 시각, 영문 도시명)
+_demand: Deque[Tuple[float, str]] = deque(maxlen=DEMAND_SAMPLES)
+# 최근 1시간 외부 API 호출 시각, 시간대("YYYY-MM-DDTHH")별 호출 수 (최근 24개)
+_provider_calls: Deque[float] = deque()
+_hourly_calls: "OrderedDict[str, int]" = OrderedDict()
 
 def get_target_datetime(date_str: str) -> datetime:
     """날짜 문자열을 datetime으로 변환"""
@@ -25,8 +77,165 @@ def get_target_datetime(date_str: str) -> datetime:
         except:
             return today
 
+def weather_prefetch_key(city_name: str) -> tuple:
+    """선행 조회 캐시 키 (영문 도시명 기준이라 '서울'/'Seoul' 모두 같은 키)"""
+    return ("weather", city_mapping.get(city_name, city_name))
+
+
+def next_update_at(after: float) -> float:
+    """after 이후 첫 예보 갱신 시각(UTC 3시간 단위 + 반영 지연, epoch 초)"""
+    grace = settings.WEATHER_UPDATE_GRACE_SECONDS
+    return (math.floor((after - grace) / FORECAST_UPDATE_SECONDS) + 1) * FORECAST_UPDATE_SECONDS + grace
+
+
+def _record_provider_call():
+    now = time.time()
+    _provider_calls.append(now)
+    while _provider_calls and _provider_calls[0] <= now - 3600:
+        _provider_calls.popleft()
+    hour = datetime.now().strftime("%Y-%m-%dT%H")
+    _hourly_calls[hour] = _hourly_calls.get(hour, 0) + 1
+    while len(_hourly_calls) > 24:
+        _hourly_calls.popitem(last=False)
+
+
+def provider_calls_last_hour() -> int:
+    cutoff = time.time() - 3600
+    while _provider_calls and _provider_calls[0] <= cutoff:
+        _provider_calls.popleft()
+    return len(_provider_calls)
+
+
+def top_cities(n: int, window: float) -> List[str]:
+    """최근 window초 동안 많이 조회된 영문 도시명 상위 n개"""
+    cutoff = time.time() - window
+    counts = Counter(city for ts, city in _demand if ts > cutoff)
+    return [city for city, _ in counts.most_common(n)]
+
+
+async def _request_forecast(english_city: str, origin: str) -> Optional[CityForecast]:
+    """OpenWeather 5일/3시간 예보 조회 (실패 시 None, 공유 세션 + timeout)"""
+    params = {
+        "q": f"{english_city},KR",
+        "appid": settings.OPENWEATHER_API_KEY,
+        "lang": "kr",
+        "units": "metric"
+    }
+
+    session = await get_http_session()
+    started = time.perf_counter()
+    _record_provider_call()
+    try:
+        async with session.get(
+            WEATHER_API_URL, params=params, timeout=aiohttp.ClientTimeout(total=settings.WEATHER_TIMEOUT)
+        ) as response:
+            if response.status != 200:
+                incr("weather.api_errors")
+                logger.warning(f"날씨 API 응답 오류 ({english_city}): {response.status}")
+                return None
+            data = await response.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        incr("weather.api_errors")
+        logger.warning(f"날씨 API 호출 실패 ({english_city}): {e!r}")
+        return None
+    record_request("weather_api", time.perf_counter() - started)
+    incr(f"weather.api_calls.{origin}")
+
+    slots = data.get("list") or None
+    return CityForecast(slots, origin=origin) if slots else None
+
+
+def refresh_forecast(english_city: str, origin: str = "request", expires_at: Optional[float] = None) -> "asyncio.Task":
+    """
+    예보를 새로 조회해 캐시에 넣는 작업 (같은 도시를 조회 중이면 그 작업을 그대로 반환)
+    expires_at을 주지 않으면 다음 갱신 시각까지 캐시 (백그라운드 갱신은 기존 항목 다음 주기로 이어 붙임)
+    """
+    def _store(forecast: Optional[CityForecast]):
+        if forecast is None or not settings.WEATHER_CACHE_ENABLED:
+            return
+        now = time.time()
+        forecast.expires_at = expires_at if expires_at and expires_at > now else next_update_at(now)
+        _forecast_cache.set(english_city, forecast, ttl=forecast.expires_at - now)
+
+    return _flight.task(
+        request_signature(english_city), lambda: _request_forecast(english_city, origin), on_success=_store
+    )
+
+
+def peek_forecasts() -> Dict[str, CityForecast]:
+    """캐시에 있는 도시별 예보 (적중/미스 집계 없이)"""
+    return dict(_forecast_cache.items())
+
+
+async def fetch_forecast(city_name: str) -> Optional[CityForecast]:
+    """도시 예보 조회 (캐시 → 진행 중인 같은 도시 조회 → API). 한 번 받은 예보로 모든 날짜에 답함"""
+    english_city = city_mapping.get(city_name, city_name)
+    # 백그라운드 갱신 대상은 city_mapping 도시만 (LLM이 넘긴 구/동 이름, 오타는 매번 실패하므로 집계 안 함)
+    if english_city in _KNOWN_CITIES:
+        _demand.append((time.time(), english_city))
+    incr("weather.lookups")
+    if settings.WEATHER_CACHE_ENABLED:
+        cached = _forecast_cache.get(english_city)
+        if cached is not None:
+            incr("weather.warm_hits")
+            if cached.origin == "scheduler":
+                incr("weather.warm_hits.scheduler")
+            return cached
+
+    return await asyncio.shield(refresh_forecast(english_city))
+
+
+def build_forecast_result(city_name: str, forecast: CityForecast, date: str = "today") -> dict:
+    """예보에서 대상 날짜의 날씨/기온/실내·실외 추천 조건을 추출"""
+    target_datetime = get_target_datetime(date)
+    target_date_str = target_datetime.strftime("%Y-%m-%d")
+    
+    target_forecast = forecast.slot_for(target_date_str)
+    
+    weather_main = target_forecast["weather"][0]["main"].lower()
+    description = target_forecast["weather"][0]["description"]
+    temp = target_forecast["main"]["temp"]
+    
+    is_rainy = weather_main in ["rain", "drizzle", "thunderstorm"]
+    is_snowy = weather_main in ["snow"]
+    is_clear = weather_main in ["clear"]
+    
+    condition = "실내" if (is_rainy or is_snowy) else "실외"
+    
+    return {
+        "success": True,
+        "city": city_name,
+        "date": target_date_str,
+        "weather": description,
+        "temp": temp,
+        "is_indoor": condition == "실내",
+        "condition": condition
+    }
+
+
+def get_weather_cache_stats() -> Dict[str, Any]:
+    lookups = get_counter("weather.lookups")
+    return {
+        **_forecast_cache.stats(),
+        "inflight": len(_flight),
+        # 네트워크를 기다리지 않고 캐시로 답한 비율 (백그라운드 갱신이 채운 항목 적중 포함)
+        "warm_hit_rate": (get_counter("weather.warm_hits") / lookups) if lookups else None,
+        "scheduler_hit_rate": (get_counter("weather.warm_hits.scheduler") / lookups) if lookups else None,
+        "provider_calls_last_hour": provider_calls_last_hour(),
+        "provider_calls_per_hour": dict(_hourly_calls),
+    }
+
+
+def clear_weather_cache():
+    _forecast_cache.clear()
+    _flight.clear()
+    _demand.clear()
+    _provider_calls.clear()
+    _hourly_calls.clear()
+
+
 @tool
-def get_weather_forecast(city_name: str, date: str = "today", conversation_id: str = "") -> str:
+async def get_weather_forecast(city_name: str, date: str = "today", conversation_id: str = "") -> str:
     """
     특정 날짜의 날씨 예보를 조회합니다.
     
@@ -104,55 +313,15 @@ def get_weather_forecast(city_name: str, date: str = "today", conversation_id: s
         
     # }
     
-    english_city = city_mapping.get(city_name, city_name)
-    
-    url = "https://api.openweathermap.org/data/2.5/forecast"
-    params = {
-        "q": f"{english_city},KR",
-        "appid": settings.OPENWEATHER_API_KEY,
-        "lang": "kr",
-        "units": "metric"
-    }
-    
-    response = requests.get(url, params=params)
-    if response.status_code != 200:
+    # /api/chat에서 선행 조회한 예보가 있으면 사용, 없으면 직접 조회
+    forecast = await consume_prefetch(conversation_id, weather_prefetch_key(city_name))
+    if forecast is None:
+        forecast = await fetch_forecast(city_name)
+
+    if not forecast:
         return json.dumps({
             "success": False,
             "message": f"날씨 정보를 가져올 수 없습니다: {city_name}"
         }, ensure_ascii=False)
     
-    data = response.json()
-    forecast_list = data["list"]
-    
-    target_datetime = get_target_datetime(date)
-    target_date_str = target_datetime.strftime("%Y-%m-%d")
-    
-    target_forecast = None
-    for forecast in forecast_list:
-        dt_txt = forecast["dt_txt"]
-        if target_date_str in dt_txt:
-            target_forecast = forecast
-            break
-    
-    if not target_forecast:
-        target_forecast = forecast_list[0]
-    
-    weather_main = target_forecast["weather"][0]["main"].lower()
-    description = target_forecast["weather"][0]["description"]
-    temp = target_forecast["main"]["temp"]
-    
-    is_rainy = weather_main in ["rain", "drizzle", "thunderstorm"]
-    is_snowy = weather_main in ["snow"]
-    is_clear = weather_main in ["clear"]
-    
-    condition = "실내" if (is_rainy or is_snowy) else "실외"
-    
-    return json.dumps({
-        "success": True,
-        "city": city_name,
-        "date": target_date_str,
-        "weather": description,
-        "temp": temp,
-        "is_indoor": condition == "실내",
-        "condition": condition
-    }, ensure_ascii=False)
+    return json.dumps(build_forecast_result(city_name, forecast, date), ensure_ascii=False)
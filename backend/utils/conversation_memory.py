@@ -1,8 +1,11 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+import asyncio
 import logging
 import json
+import threading
 from models.map_models import MapResponse
+from utils.location_prefetch import cancel_location_prefetch, start_location_prefetch
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +23,15 @@ last_result_source: Dict[str, str] = {}
 # 진행 상태 저장 (conversation_id -> status text)
 current_status: Dict[str, str] = {}
 
+# 오래된 대화의 누적 요약 / 요약에 반영된 메시지 수 (history_manager가 관리)
+conversation_summaries: Dict[str, str] = {}
+summarized_counts: Dict[str, int] = {}
+
+# 진행 상태 구독자 (conversation_id -> [(event loop, queue)])
+# set_status는 동기 도구(스레드)에서도 호출되므로 lock + call_soon_threadsafe로 전달
+status_subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+_subscribers_lock = threading.Lock()
+
 def get_conversation_history(conversation_id: str) -> List:
     """대화 히스토리 가져오기"""
     if conversation_id not in conversation_history:
@@ -74,6 +86,8 @@ def save_search_results(conversation_id: str, facilities: List[Dict], source: st
     """검색 결과를 메모리에 저장 (지도 표시 및 중복 방지용)
 
     source: "rag" / "web" / "cafe" 등 검색 출처 태그
+    web 결과는 좌표가 없으므로 저장과 동시에 백그라운드 지오코딩 시작 (항목에 lat/lng 채움)
+    cafe 결과는 글 제목뿐이라 지오코딩하지 않음 (지도 요청 시 에이전트가 장소명을 골라 검색)
     """
     
     if not facilities:
@@ -84,6 +98,12 @@ def save_search_results(conversation_id: str, facilities: List[Dict], source: st
     last_search_results[conversation_id] = facilities
     last_result_source[conversation_id] = source
 
+    # 이전 결과의 지오코딩은 취소하고 새 결과만 조회
+    if source == "web":
+        start_location_prefetch(conversation_id, facilities)
+    else:
+        cancel_location_prefetch(conversation_id)
+
     # 디버깅용 출력 (최소 정보만)
     try:
         print(f"[MEMORY] save_search_results: conv={conversation_id}, source={source}, count={len(facilities)}")
@@ -104,6 +124,12 @@ def save_search_results(conversation_id: str, facilities: List[Dict], source: st
 
     
 
+def format_search_result_summary(facilities: List[Dict], source: str = "rag") -> str:
+    """히스토리에 남길 검색 결과 요약 한 줄 (전체 dump 대신 이름만 포함)"""
+    names = [fac.get("name") or fac.get("Name") or fac.get("title") or "" for fac in facilities]
+    names = [name for name in names if name]
+    return f"[검색 결과 | {source}] {len(facilities)}건: {', '.join(names)}"
+
 def get_shown_facility_names(conversation_id: str) -> List[str]:
     """지금까지 보여준 시설 이름 목록 반환 (필터링용)"""
     if conversation_id in shown_facilities_history:
@@ -118,6 +144,32 @@ def get_last_result_source(conversation_id: str) -> str:
     """마지막 검색 결과의 출처 반환 ('rag' / 'web' / 'cafe' / '')"""
     return last_result_source.get(conversation_id, "")
 
+def is_first_turn(conversation_id: str) -> bool:
+    """이전 대화/노출 시설/검색 결과가 전혀 없는 첫 턴인지"""
+    return not (
+        conversation_history.get(conversation_id)
+        or shown_facilities_history.get(conversation_id)
+        or last_search_results.get(conversation_id)
+    )
+
+def export_turn_state(conversation_id: str) -> Dict:
+    """첫 턴 처리 후 대화 상태 스냅샷 (첫 사용자 메시지 제외, 응답 캐시 재사용용)"""
+    return {
+        "messages": list(conversation_history.get(conversation_id, [])[1:]),
+        "last_search_results": list(last_search_results.get(conversation_id) or []),
+        "last_result_source": last_result_source.get(conversation_id, ""),
+        "shown_facilities": set(shown_facilities_history.get(conversation_id) or ()),
+    }
+
+def restore_turn_state(conversation_id: str, state: Dict):
+    """export_turn_state 스냅샷을 다른 대화의 첫 턴 결과로 적용 (사용자 메시지는 호출 측에서 추가)"""
+    conversation_history.setdefault(conversation_id, []).extend(state["messages"])
+    if state["last_search_results"]:
+        last_search_results[conversation_id] = list(state["last_search_results"])
+        last_result_source[conversation_id] = state["last_result_source"]
+    if state["shown_facilities"]:
+        shown_facilities_history.setdefault(conversation_id, set()).update(state["shown_facilities"])
+
 def clear_conversation(conversation_id: str):
     """대화 히스토리 삭제"""
     if conversation_id in conversation_history:
@@ -126,6 +178,9 @@ def clear_conversation(conversation_id: str):
         del last_search_results[conversation_id]
     if conversation_id in last_result_source:
         del last_result_source[conversation_id]
+    conversation_summaries.pop(conversation_id, None)
+    summarized_counts.pop(conversation_id, None)
+    cancel_location_prefetch(conversation_id)
     logger.info(f"대화 삭제: {conversation_id}")
 
 def get_all_conversations() -> Dict:
@@ -135,17 +190,50 @@ def get_all_conversations() -> Dict:
         for conv_id, messages in conversation_history.items()
     }
 
+def subscribe_status(conversation_id: str, queue: Optional[asyncio.Queue] = None) -> asyncio.Queue:
+    """
+    진행 상태 변경 구독 (이벤트 루프 안에서 호출).
+    queue로 {"type": "status", "status": ...}, 요청 종료 시 {"type": "done"}이 전달됩니다.
+    """
+    queue = queue or asyncio.Queue()
+    loop = asyncio.get_running_loop()
+    with _subscribers_lock:
+        status_subscribers.setdefault(conversation_id, []).append((loop, queue))
+    return queue
+
+def unsubscribe_status(conversation_id: str, queue: asyncio.Queue):
+    """진행 상태 구독 해제"""
+    with _subscribers_lock:
+        subscribers = status_subscribers.get(conversation_id)
+        if not subscribers:
+            return
+        subscribers[:] = [(loop, q) for loop, q in subscribers if q is not queue]
+        if not subscribers:
+            del status_subscribers[conversation_id]
+
+def _publish_status(conversation_id: str, event: Dict):
+    with _subscribers_lock:
+        subscribers = list(status_subscribers.get(conversation_id, []))
+    for loop, queue in subscribers:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+        except RuntimeError:
+            # 구독자 이벤트 루프가 이미 종료됨
+            unsubscribe_status(conversation_id, queue)
+
 def set_status(conversation_id: str, status: str):
-    """현재 진행 상태를 저장 (예: 의도 파악 중, 시설 검색 중 등)"""
+    """현재 진행 상태를 저장하고 구독자에게 즉시 전달 (예: 의도 파악 중, 시설 검색 중 등)"""
     current_status[conversation_id] = status
     logger.info(f"[STATUS] {conversation_id}: {status}")
+    _publish_status(conversation_id, {"type": "status", "status": status})
 
 def get_status(conversation_id: str) -> str:
     """저장된 진행 상태를 반환 (없으면 빈 문자열)"""
     return current_status.get(conversation_id, "")
 
 def clear_status(conversation_id: str):
-    """요청 처리가 끝났을 때 상태를 초기화"""
+    """요청 처리가 끝났을 때 상태를 초기화하고 구독자에게 종료를 알림"""
     if conversation_id in current_status:
         del current_status[conversation_id]
         logger.info(f"[STATUS] {conversation_id}: 초기화")
+    _publish_status(conversation_id, {"type": "done"})
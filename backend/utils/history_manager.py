@@ -0,0 +1,155 @@
+"""
+대화 히스토리 토큰 예산 관리
+- 최근 HISTORY_RECENT_TURNS턴은 원문 그대로, 그 이전 턴은 누적 요약(rolling summary) 한 개로 압축
+- 프롬프트에 들어가는 히스토리를 HISTORY_TOKEN_BUDGET 토큰 이내로 제한
+- 요약 갱신은 응답 이후 백그라운드에서 수행 (응답 지연에 영향 없음)
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from agent.prompts import HISTORY_SUMMARY_PROMPT
+from config import settings
+from models.chat_models import get_llm
+from utils.conversation_memory import (
+    conversation_history,
+    conversation_summaries,
+    summarized_counts,
+)
+from utils.metrics import incr
+from utils.token_counter import count_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+# 메시지 1개당 role 등 포맷 오버헤드 (OpenAI chat 포맷 기준 근사치)
+MESSAGE_OVERHEAD_TOKENS = 4
+# 예산이 이보다 적게 남으면 잘라서 넣지 않고 제외
+MIN_TRUNCATED_TOKENS = 50
+
+# (기존 요약, 새로 요약할 메시지) -> 갱신된 요약
+Summarizer = Callable[[str, List[BaseMessage]], Awaitable[str]]
+
+# 대화별 진행 중인 요약 작업 (동시에 1개만)
+_fold_tasks: Dict[str, asyncio.Task] = {}
+
+
+def message_tokens(message: BaseMessage) -> int:
+    return count_tokens(str(message.content)) + MESSAGE_OVERHEAD_TOKENS
+
+
+def _recent_start(messages: List[BaseMessage], turns: int) -> int:
+    """최근 turns개 턴(사용자 메시지 기준)이 시작되는 인덱스"""
+    if turns <= 0:
+        return len(messages)
+    seen = 0
+    for i in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[i], HumanMessage):
+            seen += 1
+            if seen == turns:
+                return i
+    return 0
+
+
+def _truncate(message: BaseMessage, max_tokens: int) -> BaseMessage:
+    content = truncate_to_tokens(str(message.content), max_tokens - MESSAGE_OVERHEAD_TOKENS)
+    return message.__class__(content=content)
+
+
+def build_prompt_history(conversation_id: str) -> List[BaseMessage]:
+    """
+    에이전트 chat_history로 넘길 메시지 목록.
+    [이전 대화 요약] + 최근 N턴 원문을 토큰 예산 안에서 최신 메시지부터 채웁니다.
+    아직 요약에 반영되지 않은 오래된 턴은 요약이 갱신될 때까지 제외됩니다.
+    """
+    messages = list(conversation_history.get(conversation_id, []))
+    start = max(_recent_start(messages, settings.HISTORY_RECENT_TURNS), summarized_counts.get(conversation_id, 0))
+    recent = messages[start:]
+
+    budget = settings.HISTORY_TOKEN_BUDGET
+    history: List[BaseMessage] = []
+
+    summary = conversation_summaries.get(conversation_id)
+    if summary:
+        summary_message = SystemMessage(content=f"[이전 대화 요약]\n{summary}")
+        budget -= message_tokens(summary_message)
+        history.append(summary_message)
+
+    kept: List[BaseMessage] = []
+    for message in reversed(recent):
+        cost = message_tokens(message)
+        if cost > budget:
+            if budget >= MIN_TRUNCATED_TOKENS:
+                kept.append(_truncate(message, budget))
+            break
+        kept.append(message)
+        budget -= cost
+
+    history.extend(reversed(kept))
+    return history
+
+
+def _format_messages(messages: List[BaseMessage]) -> str:
+    lines = []
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            role = "사용자"
+        elif isinstance(message, AIMessage):
+            role = "챗봇"
+        else:
+            role = "검색"
+        lines.append(f"{role}: {message.content}")
+    return "\n".join(lines)
+
+
+async def summarize_with_llm(summary: str, messages: List[BaseMessage]) -> str:
+    """기존 요약 + 새 대화 → 갱신된 요약 (LLM 1회)"""
+    result = await get_llm("summarize").ainvoke(
+        [
+            SystemMessage(content=HISTORY_SUMMARY_PROMPT),
+            HumanMessage(content=f"[기존 요약]\n{summary or '없음'}\n\n[새 대화]\n{_format_messages(messages)}"),
+        ]
+    )
+    return str(result.content).strip()
+
+
+async def fold_history(conversation_id: str, summarizer: Optional[Summarizer] = None) -> bool:
+    """최근 N턴 이전의 미요약 메시지를 누적 요약에 반영. 반영했으면 True."""
+    messages = conversation_history.get(conversation_id, [])
+    done = summarized_counts.get(conversation_id, 0)
+    end = _recent_start(messages, settings.HISTORY_RECENT_TURNS)
+    if end <= done:
+        return False
+
+    summarizer = summarizer or summarize_with_llm
+    try:
+        summary = await summarizer(conversation_summaries.get(conversation_id, ""), messages[done:end])
+    except Exception as e:
+        logger.warning(f"[HISTORY] 요약 실패 (다음 턴에 재시도): {e}")
+        return False
+    if not summary:
+        return False
+
+    conversation_summaries[conversation_id] = summary
+    summarized_counts[conversation_id] = end
+    incr("history.summaries")
+    logger.info(f"[HISTORY] 요약 갱신: conv={conversation_id} 메시지 {done}~{end} 반영 ({count_tokens(summary)} tokens)")
+    return True
+
+
+def schedule_fold(conversation_id: str):
+    """응답 이후 백그라운드에서 요약 갱신 (대화별로 1개만 실행)"""
+    running = _fold_tasks.get(conversation_id)
+    if running and not running.done():
+        return
+
+    task = asyncio.create_task(fold_history(conversation_id))
+    _fold_tasks[conversation_id] = task
+
+    def _cleanup(done_task: asyncio.Task):
+        if _fold_tasks.get(conversation_id) is done_task:
+            del _fold_tasks[conversation_id]
+
+    task.add_done_callback(_cleanup)
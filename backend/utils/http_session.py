@@ -0,0 +1,53 @@
+"""
+앱 전체가 공유하는 aiohttp 세션
+- 호출마다 ClientSession을 새로 만들면 TCP/TLS 연결과 DNS 조회를 매번 다시 함
+  → 프로세스당 세션 1개를 두고 연결을 재사용 (keep-alive, DNS 캐시, 전체/호스트별 동시 연결 상한)
+- 세션은 처음 쓰는 이벤트 루프에 묶이므로 루프가 바뀌면(스크립트의 asyncio.run 반복 등) 새로 만듦
+- 서버 종료 시 main.py shutdown 이벤트에서 close_http_session() 호출
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import aiohttp
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _create_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=settings.HTTP_POOL_LIMIT,
+        limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+        ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=settings.HTTP_DEFAULT_TIMEOUT),
+    )
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """공유 세션 반환 (없거나 닫혔거나 다른 루프의 세션이면 새로 생성)"""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = _create_session()
+        _session_loop = loop
+        logger.info(
+            f"✅ 공유 HTTP 세션 생성 (최대 {settings.HTTP_POOL_LIMIT}, 호스트별 {settings.HTTP_POOL_LIMIT_PER_HOST})"
+        )
+    return _session
+
+
+async def close_http_session():
+    global _session, _session_loop
+    if _session is not None and not _session.closed and _session_loop is asyncio.get_running_loop():
+        await _session.close()
+    _session, _session_loop = None, None
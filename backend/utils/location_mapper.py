@@ -426,8 +426,8 @@ def extract_location(text: str) -> Optional[str]:
 
     text = text.strip().replace(" ", "")  # 공백 제거 (예: "한 남 동" → "한남동")
 
-    # 1️⃣ KMA 지역코드 기반: 도시/군/구 단위 직접 매칭
-    for city in KMA_LOCATION_CODES.keys():
+    # 1️⃣ 날씨 도시 매핑(city_mapping) 기반: 도시/군/구 단위 직접 매칭
+    for city in city_mapping.keys():
         if city in text:
             return city
 
@@ -672,4 +672,30 @@ city_mapping = {
     # 제주특별자치도 (2개 시)
     "제주": "Jeju",
     "서귀포": "Seogwipo",
-}
\ No newline at end of file
+}
+
+
+# =========================================================
+# 8. RAG 지역 필터용 위치 추출 (시군구 단위 우선)
+# =========================================================
+def extract_rag_location(text: str) -> Optional[str]:
+    """
+    CITY_TO_PROVINCE_SIGNGU 키 중 메시지에 포함된 가장 구체적인 지역명을 반환.
+    (예: "서울 송파구 키즈카페" → "송파구", "부산 아이랑 갈만한 곳" → "부산")
+    search_facilities의 location 파라미터로 그대로 사용할 수 있습니다.
+    """
+    compact = text.strip().replace(" ", "")
+
+    matches = [key for key in CITY_TO_PROVINCE_SIGNGU if key in compact]
+    if not matches:
+        return None
+
+    # 광역 지역이 함께 언급되면 같은 시도의 시군구만 인정 (예: "대구 동구" ≠ 인천 동구)
+    provinces = {CITY_TO_PROVINCE_SIGNGU[key][0] for key in matches if len(CITY_TO_PROVINCE_SIGNGU[key]) == 1}
+    if provinces:
+        matches = [key for key in matches if CITY_TO_PROVINCE_SIGNGU[key][0] in provinces]
+
+    # 시군구까지 지정된 키 > 긴 키 순으로 우선 (예: "강서구" > "서구")
+    matches.sort(key=lambda key: (len(CITY_TO_PROVINCE_SIGNGU[key]) > 1, len(key)), reverse=True)
+    return matches[0]
+
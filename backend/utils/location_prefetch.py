@@ -0,0 +1,121 @@
+"""
+웹 검색 결과 좌표 백그라운드 지오코딩
+- save_search_results로 web 결과가 저장되는 즉시 모든 항목의 장소를 동시에 지오코딩해
+  저장된 결과 항목에 lat/lng/place_name/address를 채움 → 지도 후속 요청은 메모리의 좌표로 바로 응답
+- 대화당 작업 1개: 같은 대화에 새 검색 결과가 저장되거나 대화가 삭제되면 이전 작업을 취소
+  (취소돼도 이미 보낸 Kakao 호출은 지오코딩 캐시에 남음)
+- 요청이 끝나도 취소하지 않음 (다음 턴의 지도 요청에서 쓰기 위함)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from config import settings
+from utils.metrics import get_counter, incr, record_request
+
+logger = logging.getLogger(__name__)
+
+# 지도 검색어로 쓰지 않을 장소 값 (Perplexity가 장소를 모를 때 쓰는 표현)
+UNKNOWN_LOCATIONS = {"장소 미확인", "장소 정보 없음", "미정", "온라인"}
+
+# conversation_id -> 최근 검색 결과 지오코딩 작업
+_tasks: Dict[str, asyncio.Task] = {}
+
+
+def location_query(result: Dict[str, Any]) -> str:
+    """검색 결과 항목의 지도 검색어 (구체적인 장소가 있으면 장소, 없으면 이름/제목)"""
+    location = (result.get("location") or "").strip()
+    if location and location not in UNKNOWN_LOCATIONS:
+        return location
+    return (result.get("name") or result.get("title") or "").strip()
+
+
+async def _geocode_results(conversation_id: str, results: List[Dict[str, Any]]):
+    # tools 패키지가 conversation_memory를 import하므로 순환 import를 피해 여기서 가져옴
+    from tools.geocoding_tool import search_map_by_address_core
+
+    started = time.perf_counter()
+    targets = [(result, location_query(result)) for result in results]
+    targets = [(result, query) for result, query in targets if query and not result.get("lat")]
+    responses = await asyncio.gather(
+        *(search_map_by_address_core(query) for _, query in targets), return_exceptions=True
+    )
+
+    resolved = 0
+    for (result, query), response in zip(targets, responses):
+        if isinstance(response, BaseException) or response.type != "map" or not response.data.markers:
+            continue
+        marker = response.data.markers[0]
+        result.update({"lat": marker.lat, "lng": marker.lng, "place_name": marker.name, "address": marker.desc})
+        resolved += 1
+
+    incr("location_prefetch.resolved", resolved)
+    incr("location_prefetch.unresolved", len(targets) - resolved)
+    record_request("location_prefetch", time.perf_counter() - started)
+    logger.info(f"📍 [LOCATION PREFETCH] conv={conversation_id} 좌표 {resolved}/{len(targets)}건")
+
+
+def start_location_prefetch(conversation_id: str, results: List[Dict[str, Any]]):
+    """검색 결과 항목의 좌표 조회를 백그라운드로 시작 (같은 대화의 이전 작업은 취소)"""
+    cancel_location_prefetch(conversation_id)
+    if not settings.LOCATION_PREFETCH_ENABLED or not conversation_id or not results:
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # 이벤트 루프 밖(동기 스레드)에서 저장된 결과는 지도 요청 시 지오코딩
+        return
+
+    task = asyncio.ensure_future(_geocode_results(conversation_id, results))
+    _tasks[conversation_id] = task
+    incr("location_prefetch.started")
+
+    def _done(t: asyncio.Task):
+        if _tasks.get(conversation_id) is t:
+            del _tasks[conversation_id]
+        if not t.cancelled() and t.exception() is not None:
+            logger.warning(f"[LOCATION PREFETCH] 지오코딩 실패 conv={conversation_id}: {t.exception()!r}")
+
+    task.add_done_callback(_done)
+
+
+async def wait_location_prefetch(conversation_id: str, timeout: Optional[float] = None) -> bool:
+    """
+    진행 중인 좌표 조회가 끝날 때까지 대기 (작업이 없거나 끝났으면 바로 True, timeout이면 False)
+    대기하던 요청이 취소돼도 백그라운드 작업은 계속 진행
+    """
+    task = _tasks.get(conversation_id)
+    if task is None or task.done():
+        return True
+    try:
+        await asyncio.wait_for(asyncio.shield(task), timeout)
+    except asyncio.TimeoutError:
+        return False
+    except asyncio.CancelledError:
+        if task.cancelled():
+            return False
+        raise
+    except Exception:
+        return False
+    return True
+
+
+def cancel_location_prefetch(conversation_id: str):
+    task = _tasks.pop(conversation_id, None)
+    if task is not None and not task.done():
+        task.cancel()
+        incr("location_prefetch.cancelled")
+
+
+def get_location_prefetch_stats() -> Dict[str, Any]:
+    resolved = get_counter("location_prefetch.resolved")
+    unresolved = get_counter("location_prefetch.unresolved")
+    return {
+        "running": len(_tasks),
+        "started": get_counter("location_prefetch.started"),
+        "cancelled": get_counter("location_prefetch.cancelled"),
+        "resolve_rate": (resolved / (resolved + unresolved)) if resolved + unresolved else None,
+        "map_hits": get_counter("location_prefetch.map_hits"),
+    }
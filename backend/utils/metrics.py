@@ -0,0 +1,68 @@
+"""Simple in-process request metrics recorder (latency / LLM calls / counters)."""
+
+import threading
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional
+
+# 경로별로 최근 N개 요청만 보관 (메모리 무한 증가 방지)
+MAX_SAMPLES = 1000
+
+_lock = threading.Lock()
+_latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+_llm_calls: Dict[str, Deque[int]] = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+_counters: Dict[str, float] = defaultdict(float)
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """nearest-rank 방식 백분위수 (values가 비어 있으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def record_request(path: str, latency: float, llm_calls: Optional[int] = None):
+    """요청 1건의 처리 경로(planner/agent 등), 지연 시간, LLM 호출 수를 기록"""
+    with _lock:
+        _latencies[path].append(latency)
+        if llm_calls is not None:
+            _llm_calls[path].append(llm_calls)
+
+
+def incr(name: str, value: float = 1):
+    """이름 기반 카운터 증가"""
+    with _lock:
+        _counters[name] += value
+
+
+def get_counter(name: str) -> float:
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def snapshot() -> Dict[str, Any]:
+    """경로별 p50/p95 지연 시간, 평균 LLM 호출 수, 카운터를 반환"""
+    with _lock:
+        latencies = {path: list(values) for path, values in _latencies.items()}
+        llm_calls = {path: list(values) for path, values in _llm_calls.items()}
+        counters = dict(_counters)
+
+    paths = {}
+    for path, values in latencies.items():
+        calls = llm_calls.get(path, [])
+        paths[path] = {
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "avg_llm_calls": (sum(calls) / len(calls)) if calls else None,
+        }
+
+    return {"paths": paths, "counters": counters}
+
+
+def reset_metrics():
+    with _lock:
+        _latencies.clear()
+        _llm_calls.clear()
+        _counters.clear()
@@ -0,0 +1,106 @@
+"""
+요청 단위 추측 선행 조회(speculative prefetch) 캐시
+- /api/chat 핸들러가 LLM 의도 파악 전에 날씨/임베딩 조회를 미리 시작
+- 도구는 consume_prefetch로 결과를 먼저 찾아보고, 없으면 직접 조회
+- 요청이 끝나면 finish_prefetch가 쓰이지 않은 작업을 취소
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Dict, Hashable, Optional
+
+from utils.metrics import get_counter, incr
+
+logger = logging.getLogger(__name__)
+
+
+class _PrefetchEntry:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+
+
+# conversation_id -> {key: _PrefetchEntry}
+_prefetches: Dict[str, Dict[Hashable, _PrefetchEntry]] = {}
+
+
+def start_prefetch(conversation_id: str, key: Hashable, coro: Awaitable[Any]):
+    """선행 조회 작업을 시작 (같은 key가 이미 있으면 무시)"""
+    entries = _prefetches.setdefault(conversation_id, {})
+    if key in entries:
+        coro.close()
+        return
+
+    entry = _PrefetchEntry(asyncio.ensure_future(coro))
+
+    def _on_done(task: asyncio.Task):
+        entry.finished_at = time.perf_counter()
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"[PREFETCH] 선행 조회 실패 key={key}: {task.exception()}")
+
+    entry.task.add_done_callback(_on_done)
+    entries[key] = entry
+    incr("prefetch.started")
+    logger.info(f"[PREFETCH] 시작: conv={conversation_id} key={key}")
+
+
+async def consume_prefetch(conversation_id: str, key: Hashable) -> Optional[Any]:
+    """
+    선행 조회 결과를 가져옴 (진행 중이면 끝날 때까지 대기).
+    선행 조회가 없거나 실패했으면 None → 호출 측에서 직접 조회.
+    """
+    entries = _prefetches.get(conversation_id) if conversation_id else None
+    if not entries:
+        return None
+
+    entry = entries.pop(key, None)
+    if entry is None:
+        incr("prefetch.miss")
+        return None
+
+    asked_at = time.perf_counter()
+    try:
+        result = await entry.task
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        incr("prefetch.error")
+        return None
+
+    # 절약된 시간 = 도구가 요청하기 전까지 이미 진행된 작업 시간
+    finished_at = entry.finished_at or time.perf_counter()
+    saved = max(0.0, min(asked_at, finished_at) - entry.started_at)
+    incr("prefetch.hit")
+    incr("prefetch.saved_seconds", saved)
+    logger.info(f"[PREFETCH] 적중: conv={conversation_id} key={key} saved={saved:.3f}s")
+    return result
+
+
+def get_prefetch_task(conversation_id: str, key: Hashable) -> Optional[asyncio.Task]:
+    """선행 조회 작업을 소비하지 않고 참조만 반환 (도구는 여전히 consume_prefetch로 재사용 가능)"""
+    entry = (_prefetches.get(conversation_id) or {}).get(key) if conversation_id else None
+    return entry.task if entry else None
+
+
+def finish_prefetch(conversation_id: str):
+    """요청 종료 시 호출: 사용되지 않은 선행 조회를 취소"""
+    entries = _prefetches.pop(conversation_id, None) or {}
+    for key, entry in entries.items():
+        if not entry.task.done():
+            entry.task.cancel()
+        incr("prefetch.unused")
+        logger.info(f"[PREFETCH] 미사용 작업 정리: conv={conversation_id} key={key}")
+
+
+def get_prefetch_stats() -> Dict[str, Any]:
+    """선행 조회 적중률 / 절약 시간"""
+    started = get_counter("prefetch.started")
+    hits = get_counter("prefetch.hit")
+    return {
+        "started": started,
+        "hits": hits,
+        "hit_rate": (hits / started) if started else None,
+        "saved_seconds": get_counter("prefetch.saved_seconds"),
+    }
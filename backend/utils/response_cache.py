@@ -0,0 +1,242 @@
+"""
+첫 턴 응답 캐시 (exact + semantic)
+- 이전 대화/노출 시설이 없는 첫 턴만 대상 ("이번 주말 서울 아이랑 갈만한 곳" 같은 반복 질문)
+- 문맥 키: 대상 날짜(오늘/내일/주말 → 실제 날짜), 날씨 조건(실내/실외, 날씨가 필요한 질문만), 아이 나이
+- exact: 정규화한 메시지(공백/문장부호/대소문자 무시) + 문맥 키
+- semantic: 같은 문맥 키 + 같은 지역 안에서 질문 임베딩 코사인 유사도가 임계값 이상이면 재사용
+  (임베딩은 RAG 도구와 같은 선행 조회 작업을 공유하고, 짧게만 기다림)
+- TTL은 응답에 쓰인 데이터 출처 중 가장 짧은 것 (RAG 길게, 웹 행사 짧게)
+- 적중 시 원래 턴이 남긴 대화 상태(검색 결과, 노출 시설)를 함께 복원해 후속 지도 요청도 동작
+"""
+
+import asyncio
+import logging
+import re
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from agent.planner import DATE_KEYWORDS, speculative_targets
+from config import settings
+from models.schemas import ChatResponse
+from tools.rag_tool import embedding_prefetch_key
+from tools.weather_tool import build_forecast_result, get_target_datetime, weather_prefetch_key
+from utils.conversation_memory import export_turn_state, restore_turn_state
+from utils.location_mapper import extract_rag_location
+from utils.metrics import get_counter, incr
+from utils.prefetch import get_prefetch_task
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# 데이터 출처(도구)별 응답 TTL (초) - 응답에 쓰인 도구 중 가장 짧은 값 적용
+SOURCE_TTLS: Dict[str, float] = {
+    "search_facilities": 6 * 3600,      # DB 시설 정보는 자주 바뀌지 않음
+    "search_map_by_address": 24 * 3600,
+    "show_map_for_facilities": 6 * 3600,
+    "naver_cafe_search": 3 * 3600,
+    "get_weather_forecast": 3600,       # 예보 갱신 주기(3시간)보다 짧게
+    "naver_web_search": 1800,           # 행사/축제 일정은 짧게
+}
+# 도구 없이 생성한 응답 (안내/재질문 등)
+DEFAULT_TTL = 6 * 3600
+
+NORMALIZE_PATTERN = re.compile(r"[\s\.,!?~·…\"'()\[\]]+")
+
+
+@dataclass(frozen=True)
+class CacheContext:
+    """응답을 재사용해도 되는 조건 (이 값이 같아야 같은 답)"""
+    date: str
+    condition: str
+    child_age: Optional[int]
+
+
+@dataclass
+class CacheLookup:
+    """요청 1건의 캐시 조회 상태 (저장 시 재사용)"""
+    message: str
+    normalized: str
+    context: CacheContext
+    location: Optional[str]
+    embedding_task: Optional[asyncio.Task] = None
+    embedding: Optional[np.ndarray] = None
+
+
+@dataclass
+class CachedTurn:
+    response: ChatResponse
+    state: Dict[str, Any]
+    context: CacheContext
+    location: Optional[str]
+    latency: float
+    embedding: Optional[np.ndarray] = None
+    created_at: float = field(default_factory=time.time)
+
+
+_cache: TTLCache[CachedTurn] = TTLCache(
+    "response", max_size=settings.RESPONSE_CACHE_MAX_SIZE, default_ttl=DEFAULT_TTL
+)
+
+
+def normalize_message(message: str) -> str:
+    text = unicodedata.normalize("NFKC", message or "").lower()
+    return NORMALIZE_PATTERN.sub("", text)
+
+
+def _exact_key(normalized: str, context: CacheContext) -> Tuple:
+    return (normalized, context.date, context.condition, context.child_age)
+
+
+async def _wait(task: Optional[asyncio.Task], timeout: float) -> Any:
+    """선행 조회 작업 결과를 소비하지 않고 timeout까지만 기다림 (실패/시간 초과 시 None)"""
+    if task is None:
+        return None
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+    except asyncio.CancelledError:
+        if task.cancelled():
+            return None
+        raise
+    except Exception:
+        return None
+
+
+async def build_lookup(message: str, child_age: Optional[int], conversation_id: str) -> Optional[CacheLookup]:
+    """
+    캐시 조회 문맥 구성. 날씨가 필요한 질문인데 예보를 제때 못 받으면 None (캐시 사용 안 함).
+    /api/chat의 선행 조회(start_speculative_prefetch)가 이미 시작된 뒤에 호출합니다.
+    """
+    text = (message or "").strip()
+    normalized = normalize_message(text)
+    if not normalized:
+        return None
+
+    date = next((value for kw, value in DATE_KEYWORDS.items() if kw in text), "today")
+    target_date = get_target_datetime(date).strftime("%Y-%m-%d")
+
+    condition = ""
+    weather_city = speculative_targets(text).get("weather_city")
+    if weather_city:
+        forecast = await _wait(
+            get_prefetch_task(conversation_id, weather_prefetch_key(weather_city)),
+            settings.RESPONSE_CACHE_WAIT_SECONDS,
+        )
+        if not forecast:
+            return None
+        condition = build_forecast_result(weather_city, forecast, date)["condition"]
+
+    return CacheLookup(
+        message=text,
+        normalized=normalized,
+        context=CacheContext(date=target_date, condition=condition, child_age=child_age),
+        location=extract_rag_location(text),
+        embedding_task=get_prefetch_task(conversation_id, embedding_prefetch_key(text)),
+    )
+
+
+def _semantic_match(lookup: CacheLookup) -> Optional[Tuple[CachedTurn, float]]:
+    best, best_score = None, settings.RESPONSE_CACHE_SEMANTIC_THRESHOLD
+    for _, entry in _cache.items():
+        if entry.embedding is None or entry.context != lookup.context or entry.location != lookup.location:
+            continue
+        score = float(np.dot(entry.embedding, lookup.embedding))
+        if score >= best_score:
+            best, best_score = entry, score
+    return (best, best_score) if best else None
+
+
+def _normalized_embedding(embedding: Any) -> Optional[np.ndarray]:
+    if embedding is None:
+        return None
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else None
+
+
+async def lookup_response(lookup: CacheLookup, conversation_id: str) -> Optional[Tuple[ChatResponse, str, float]]:
+    """
+    적중하면 (응답, 'exact'|'semantic', 원래 처리 시간)을 반환하고 대화 상태를 복원.
+    사용자 메시지는 호출 측에서 이미 저장했다고 가정합니다.
+    """
+    entry = _cache.get(_exact_key(lookup.normalized, lookup.context))
+    tier = "exact"
+
+    if entry is None and lookup.embedding_task is not None:
+        lookup.embedding = _normalized_embedding(
+            await _wait(lookup.embedding_task, settings.RESPONSE_CACHE_WAIT_SECONDS)
+        )
+        if lookup.embedding is not None:
+            match = _semantic_match(lookup)
+            if match:
+                entry, score = match
+                tier = "semantic"
+                logger.info(f"[RESPONSE CACHE] semantic 적중 (유사도 {score:.3f})")
+
+    if entry is None:
+        incr("response_cache.miss")
+        return None
+
+    restore_turn_state(conversation_id, entry.state)
+    incr(f"response_cache.hit_{tier}")
+    response = entry.response.model_copy(update={"conversation_id": conversation_id})
+    return response, tier, entry.latency
+
+
+def response_ttl(intermediate_steps: List) -> float:
+    """응답에 쓰인 도구(데이터 출처) 중 가장 짧은 TTL"""
+    tools = {getattr(step[0], "tool", None) for step in intermediate_steps}
+    return min([SOURCE_TTLS[t] for t in tools if t in SOURCE_TTLS], default=DEFAULT_TTL)
+
+
+def store_response(
+    lookup: CacheLookup,
+    response: ChatResponse,
+    conversation_id: str,
+    intermediate_steps: List,
+    latency: float,
+):
+    """첫 턴 처리 결과와 대화 상태를 캐시에 저장"""
+    embedding = lookup.embedding
+    task = lookup.embedding_task
+    if embedding is None and task is not None and task.done() and not task.cancelled() and task.exception() is None:
+        embedding = _normalized_embedding(task.result())
+
+    ttl = response_ttl(intermediate_steps)
+    _cache.set(
+        _exact_key(lookup.normalized, lookup.context),
+        CachedTurn(
+            response=response.model_copy(),
+            state=export_turn_state(conversation_id),
+            context=lookup.context,
+            location=lookup.location,
+            latency=latency,
+            embedding=embedding,
+        ),
+        ttl=ttl,
+    )
+    incr("response_cache.stored")
+    logger.info(f"[RESPONSE CACHE] 저장: '{lookup.message[:30]}' ttl={ttl:.0f}s ctx={lookup.context}")
+
+
+def get_response_cache_stats() -> Dict[str, Any]:
+    """적중률(exact/semantic)과 절약 시간"""
+    exact = get_counter("response_cache.hit_exact")
+    semantic = get_counter("response_cache.hit_semantic")
+    misses = get_counter("response_cache.miss")
+    lookups = exact + semantic + misses
+    return {
+        "lookups": lookups,
+        "hits_exact": exact,
+        "hits_semantic": semantic,
+        "hit_rate": ((exact + semantic) / lookups) if lookups else None,
+        "saved_seconds": get_counter("response_cache.saved_seconds"),
+        "size": len(_cache),
+    }
+
+
+def clear_response_cache():
+    _cache.clear()
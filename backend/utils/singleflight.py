@@ -0,0 +1,100 @@
+"""
+업스트림 호출 single-flight (동시 요청 합치기)
+- 인기 질의가 몰리면 동시에 들어온 같은 요청(임베딩, Chroma 조회, 같은 도시 날씨, 같은 장소 Kakao, 같은 행사 Perplexity)이
+  같은 업스트림 호출을 각자 보냄 → 정규화한 요청 서명(request_signature) 기준으로 진행 중인 호출 1개를 공유
+- 결과와 오류를 모두 공유하고, 먼저 온 호출자가 취소돼도 다른 호출자를 위해 호출은 계속 진행 (asyncio.shield)
+- 캐시 저장은 on_success 콜백으로 한 번만 (실패/취소는 저장하지 않음)
+- 업스트림별 실제 호출 수 / 합쳐진 요청 수를 /metrics의 singleflight에 기록
+"""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+from utils.metrics import get_counter, incr
+
+T = TypeVar("T")
+
+# 업스트림 이름 → SingleFlight (/metrics 집계용)
+_registry: Dict[str, "SingleFlight"] = {}
+
+
+def _canonical(part: Any) -> Any:
+    if isinstance(part, str):
+        return " ".join(part.split())
+    if isinstance(part, (list, tuple)):
+        return [_canonical(p) for p in part]
+    if isinstance(part, dict):
+        return {str(k): _canonical(v) for k, v in part.items()}
+    return part
+
+
+def request_signature(*parts: Any) -> str:
+    """요청 서명 (문자열 공백 정리, dict 키 정렬 → 같은 요청이면 같은 문자열)"""
+    return json.dumps(_canonical(list(parts)), ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class SingleFlight(Generic[T]):
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, "asyncio.Task[T]"] = {}
+        _registry[name] = self
+
+    def task(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[T]],
+        on_success: Optional[Callable[[T], None]] = None,
+    ) -> "asyncio.Task[T]":
+        """같은 키로 진행 중인 호출이 있으면 그 작업, 없으면 factory()로 새 호출을 시작 (on_success는 새 호출에만 적용)"""
+        task = self._inflight.get(key)
+        # 작업은 이벤트 루프에 묶이므로 루프가 바뀌면(스크립트의 asyncio.run 반복 등) 새로 시작
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            incr(f"singleflight.{self.name}.coalesced")
+            return task
+
+        task = asyncio.ensure_future(factory())
+        self._inflight[key] = task
+        incr(f"singleflight.{self.name}.calls")
+
+        def _done(t: asyncio.Task):
+            if self._inflight.get(key) is t:
+                del self._inflight[key]
+            # 기다리는 호출자가 없어도 오류를 꺼내 두어 'exception was never retrieved' 경고 방지
+            if t.cancelled() or t.exception() is not None:
+                return
+            if on_success is not None:
+                on_success(t.result())
+
+        task.add_done_callback(_done)
+        return task
+
+    async def do(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[T]],
+        on_success: Optional[Callable[[T], None]] = None,
+    ) -> T:
+        """진행 중인 같은 호출의 결과(또는 오류)를 기다림"""
+        return await asyncio.shield(self.task(key, factory, on_success))
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def clear(self):
+        self._inflight.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        calls = get_counter(f"singleflight.{self.name}.calls")
+        coalesced = get_counter(f"singleflight.{self.name}.coalesced")
+        return {
+            "inflight": len(self._inflight),
+            "calls": calls,
+            "coalesced": coalesced,
+            # 들어온 요청 중 진행 중인 호출에 합쳐진 비율
+            "coalesce_rate": (coalesced / (calls + coalesced)) if calls + coalesced else None,
+        }
+
+
+def get_singleflight_stats() -> Dict[str, Any]:
+    return {name: flight.stats() for name, flight in _registry.items()}
@@ -0,0 +1,36 @@
+"""gpt-4o 계열 토큰 수 계산 (tiktoken이 없거나 인코딩을 받을 수 없으면 글자 수 기반 근사치)"""
+
+import logging
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"[TOKENS] tiktoken 인코딩 로드 실패, 글자 수 기반 근사치 사용: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 2 + 1
+    return len(encoding.encode(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = "…") -> str:
+    """max_tokens 이내로 자르기 (넘지 않으면 그대로)"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[: max(0, (max_tokens - 1) * 2)] + marker
+    return encoding.decode(encoding.encode(text)[:max_tokens]) + marker
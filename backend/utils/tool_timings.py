@@ -24,19 +24,48 @@ def clear_tool_timings():
         _records.clear()
 
 
-def record_tool_timing(tool: str, duration: float, conversation_id: str = None):
-    """Store a single timing record."""
+def record_tool_timing(
+    tool: str,
+    duration: float,
+    conversation_id: str = None,
+    start: float = None,
+    end: float = None,
+    error: bool = False,
+):
+    """Store a single timing record (start/end make concurrent spans visible)."""
     if not _enabled:
         return
+    now = time.time()
+    end = end if end is not None else now
     with _lock:
         _records.append({
             "tool": tool,
             "duration": duration,
             "conversation_id": conversation_id,
-            "timestamp": time.time(),
+            "start": start if start is not None else end - duration,
+            "end": end,
+            "error": error,
+            "timestamp": now,
         })
 
 
+def max_concurrency(records: List[Dict[str, Any]]) -> int:
+    """Return the highest number of overlapping tool spans in the given records."""
+    events = []
+    for r in records:
+        if r.get("start") is None or r.get("end") is None:
+            continue
+        events.append((r["start"], 1))
+        events.append((r["end"], -1))
+    # 같은 시각이면 종료(-1)를 먼저 처리해 맞닿은 구간은 겹침으로 보지 않음
+    events.sort()
+    current = peak = 0
+    for _, delta in events:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
 def get_and_reset() -> List[Dict[str, Any]]:
     """Return all timing records and clear the buffer."""
     with _lock:
@@ -51,5 +80,5 @@ def timed_call(tool: str, conversation_id: str, func, *args, **kwargs):
     try:
         return func(*args, **kwargs)
     finally:
-        duration = time.time() - start
-        record_tool_timing(tool=tool, duration=duration, conversation_id=conversation_id)
+        end = time.time()
+        record_tool_timing(tool=tool, duration=end - start, conversation_id=conversation_id, start=start, end=end)
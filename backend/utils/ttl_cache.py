@@ -0,0 +1,112 @@
+"""
+프로세스 내 TTL + LRU 캐시
+- 항목마다 만료 시각(TTL)을 두고, max_size를 넘으면 가장 오래 쓰지 않은 항목부터 제거
+- 동기 도구(스레드)와 이벤트 루프에서 함께 쓰이므로 lock으로 보호
+- 적중/미스/만료/제거 수는 utils.metrics 카운터("cache.{name}.*")로 기록
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Iterator, List, Optional, Tuple, TypeVar
+
+from utils.metrics import get_counter, incr
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[V]):
+    def __init__(self, name: str, max_size: int, default_ttl: float):
+        self.name = name
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _count(self, event: str):
+        incr(f"cache.{self.name}.{event}")
+
+    def get(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        """만료되지 않은 값을 반환 (조회한 항목은 최근 사용으로 갱신)"""
+        value = self._get(key)
+        if value is _MISSING:
+            self._count("miss")
+            return default
+        self._count("hit")
+        return value
+
+    def _get(self, key: Hashable) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return _MISSING
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                expired = True
+            else:
+                self._data.move_to_end(key)
+                return value
+        if expired:
+            self._count("expired")
+        return _MISSING
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._get(key) is not _MISSING
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        evicted = 0
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                evicted += 1
+        if evicted:
+            incr(f"cache.{self.name}.evicted", evicted)
+
+    def pop(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def items(self) -> List[Tuple[Hashable, V]]:
+        """만료되지 않은 (key, value) 목록 (LRU 순서는 갱신하지 않음)"""
+        now = time.monotonic()
+        with self._lock:
+            return [(key, value) for key, (expires_at, value) in self._data.items() if expires_at > now]
+
+    def export_items(self) -> List[Tuple[Hashable, V, float]]:
+        """파일 저장용 (key, value, 남은 TTL초) 목록 (오래 쓰지 않은 항목부터)"""
+        now = time.monotonic()
+        with self._lock:
+            return [(key, value, expires_at - now) for key, (expires_at, value) in self._data.items() if expires_at > now]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter([key for key, _ in self.items()])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        hits = get_counter(f"cache.{self.name}.hit")
+        misses = get_counter(f"cache.{self.name}.miss")
+        return {
+            "size": len(self),
+            "max_size": self.max_size,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (hits / (hits + misses)) if (hits + misses) else None,
+            "expired": get_counter(f"cache.{self.name}.expired"),
+            "evicted": get_counter(f"cache.{self.name}.evicted"),
+        }
@@ -0,0 +1,245 @@
+"""
+카페 글 크롤링 벤치마크 (오프라인)
+1) 본문 추출: 저장해 둔 카페 글 HTML(--pages-dir/*.html, m.cafe.naver.com 페이지를 그대로 저장)
+   또는 실제 페이지 구조를 흉내 낸 합성 페이지로
+   - before: 전체 디코딩 + BeautifulSoup(html.parser) + find (기존)
+   - after: lxml 점진 파싱, 본문 컨테이너가 닫히면 중단 (tools/naver_cafe_search_tool.extract_cafe_content)
+   페이지당 추출 시간 P50/P95, 파싱한 바이트 비율, 추출 결과 일치 여부
+2) 크롤링: 로컬 stub 서버에서 fetch_cafe_urls(글 3개)를 반복 호출
+   - before: 호출마다 새 ClientSession + resp.text() + BeautifulSoup
+   - after: 앱 공유 세션(utils/http_session) + 점진 파싱
+   호출당 P50/P95와 새로 맺은 TCP 연결 수 (로컬이라 TLS/DNS 비용은 빠져 있어 실제 차이는 더 큼)
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+WORDS = ["주차장", "오전", "도착", "유모차", "대여", "수유실", "깨끗", "웨이팅", "아이", "체험", "입장료", "할인",
+         "주말", "평일", "간식", "준비물", "사물함", "그늘", "놀이터", "화장실", "엘리베이터", "추천", "비추천"]
+
+
+def _sentence(rng: random.Random, n: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n)) + "."
+
+
+def synthetic_page(rng: random.Random) -> str:
+    """m.cafe.naver.com 글 페이지 구조 흉내: 큰 head(인라인 스크립트/스타일) → 본문 → 댓글/추천글/스크립트"""
+    head_scripts = "".join(
+        f"<script>window.__cafe_{i} = {json.dumps({'k': _sentence(rng, 30)}, ensure_ascii=False)};</script>"
+        for i in range(rng.randint(20, 40))
+    )
+    styles = "".join(f"<style>.c{i}{{margin:{i}px;padding:{i}px;color:#{i:06x}}}</style>" for i in range(50))
+    body = "".join(
+        f'<div class="se-component se-text"><div class="se-module"><p class="se-text-paragraph">'
+        f'<span>{_sentence(rng)}</span> <b>{rng.choice(WORDS)}</b> {_sentence(rng, 6)}</p></div></div>'
+        + (f'<div class="se-component se-image"><img src="https://cafeptthumb.pstatic.net/{i}.jpg"></div>' if i % 3 == 0 else "")
+        for i in range(rng.randint(8, 30))
+    )
+    comments = "".join(
+        f'<li class="comment"><span class="nick">닉네임{i}</span><p>{_sentence(rng, 10)}</p></li>'
+        for i in range(rng.randint(100, 400))
+    )
+    related = "".join(f'<li><a href="/ArticleRead.nhn?articleid={i}">{_sentence(rng, 5)}</a></li>' for i in range(50))
+    tail_scripts = "".join(f"<script>/* {_sentence(rng, 40)} */ init{i}();</script>" for i in range(30))
+    return (
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{_sentence(rng, 4)}</title>{head_scripts}{styles}</head>"
+        f"<body><div id='header'><ul>{''.join(f'<li>메뉴{i}</li>' for i in range(80))}</ul></div>"
+        f"<div class='post_title'><h2>{_sentence(rng, 5)}</h2></div>"
+        f"<div class='se-main-container'>{body}</div>"
+        f"<div class='comment_area'><ul>{comments}</ul></div><div class='related'><ul>{related}</ul></div>"
+        f"{tail_scripts}</body></html>"
+    )
+
+
+def legacy_extract(html: str) -> str:
+    """기존 fetch_single_cafe의 추출 로직"""
+    soup = BeautifulSoup(html, "html.parser")
+    content = soup.find("div", class_="se-main-container")
+    if not content:
+        content = soup.find("div", id="postContent")
+    return content.get_text(" ", strip=True)[:850] if content else ""
+
+
+def load_pages(pages_dir: str, count: int, seed: int) -> List[bytes]:
+    if pages_dir:
+        return [p.read_bytes() for p in sorted(Path(pages_dir).glob("*.html"))]
+    rng = random.Random(seed)
+    return [synthetic_page(rng).encode("utf-8") for _ in range(count)]
+
+
+async def _chunks(data: bytes, size: int, consumed: Dict[str, int]):
+    for i in range(0, len(data), size):
+        consumed["bytes"] += len(data[i : i + size])
+        yield data[i : i + size]
+
+
+async def bench_extract(pages: List[bytes], repeat: int) -> Dict[str, Any]:
+    from tools.naver_cafe_search_tool import READ_CHUNK_SIZE, extract_cafe_content
+    from utils.metrics import percentile
+
+    before, after, ratios, mismatched = [], [], [], 0
+    for page in pages:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            expected = legacy_extract(page.decode("utf-8"))
+            before.append(time.perf_counter() - started)
+
+            consumed = {"bytes": 0}
+            started = time.perf_counter()
+            actual = await extract_cafe_content(_chunks(page, READ_CHUNK_SIZE, consumed))
+            after.append(time.perf_counter() - started)
+        ratios.append(consumed["bytes"] / len(page))
+        mismatched += int(expected != actual)
+
+    return {
+        "pages": len(pages),
+        "avg_page_kb": sum(len(p) for p in pages) / len(pages) / 1024,
+        "before_p50_ms": percentile(before, 50) * 1000,
+        "before_p95_ms": percentile(before, 95) * 1000,
+        "after_p50_ms": percentile(after, 50) * 1000,
+        "after_p95_ms": percentile(after, 95) * 1000,
+        "avg_parsed_ratio": sum(ratios) / len(ratios),
+        "mismatched": mismatched,
+    }
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class StubCafeServer:
+    """카페 글 페이지 stub (keep-alive, 새 TCP 연결 수 집계)"""
+
+    def __init__(self, pages: List[bytes], latency: float):
+        self.pages = pages
+        self.latency = latency
+        self.connections = 0
+        self.lock = threading.Lock()
+        self.httpd = _StubHTTPServer(("127.0.0.1", 0), self._handler())
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server.lock:
+                    server.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                page = server.pages[int(self.path.rsplit("/", 1)[-1]) % len(server.pages)]
+                time.sleep(server.latency)
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(page)))
+                    self.end_headers()
+                    self.wfile.write(page)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        return Handler
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+async def _legacy_fetch_cafe_urls(links: List[str]) -> List[str]:
+    """기존 fetch_cafe_urls: 호출마다 새 세션 + 전체 다운로드 + BeautifulSoup"""
+
+    async def _one(session, link):
+        async with session.get(link, timeout=aiohttp.ClientTimeout(total=3)) as resp:
+            return legacy_extract(await resp.text()) if resp.status == 200 else ""
+
+    async with aiohttp.ClientSession() as session:
+        return await asyncio.gather(*[_one(session, link) for link in links])
+
+
+async def bench_fetch(pages: List[bytes], calls: int, latency: float) -> Dict[str, Any]:
+    from tools.naver_cafe_search_tool import fetch_cafe_urls
+    from utils.http_session import close_http_session
+    from utils.metrics import percentile
+
+    server = StubCafeServer(pages, latency)
+    results = {}
+    for mode, fetch in (("before", _legacy_fetch_cafe_urls), ("after", fetch_cafe_urls)):
+        server.connections = 0
+        latencies, empty = [], 0
+        for i in range(calls):
+            links = [f"{server.base_url}/cafe/{i * 3 + k}" for k in range(3)]
+            started = time.perf_counter()
+            contents = await fetch(links)
+            latencies.append(time.perf_counter() - started)
+            empty += sum(1 for c in contents if not c)
+        results[mode] = {
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "tcp_connections": server.connections,
+            "empty_contents": empty,
+        }
+    await close_http_session()
+    server.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카페 글 본문 추출/크롤링 벤치마크 (오프라인)")
+    parser.add_argument("--pages-dir", type=str, default="", help="저장한 카페 글 HTML 폴더 (없으면 합성 페이지)")
+    parser.add_argument("--pages", type=int, default=30, help="합성 페이지 수")
+    parser.add_argument("--repeat", type=int, default=5, help="페이지당 추출 반복 수")
+    parser.add_argument("--calls", type=int, default=50, help="fetch_cafe_urls 호출 수 (글 3개씩)")
+    parser.add_argument("--latency", type=float, default=0.02, help="stub 페이지 응답 지연(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/cafe_extract_bench.json")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir, args.pages, args.seed)
+    extract = asyncio.run(bench_extract(pages, args.repeat))
+    fetch = asyncio.run(bench_fetch(pages, args.calls, args.latency))
+
+    print("\n" + "=" * 60)
+    print(f"본문 추출: 페이지 {extract['pages']}개 (평균 {extract['avg_page_kb']:.0f}KB)")
+    print(f"  before (bs4 html.parser): P50 {extract['before_p50_ms']:.1f}ms | P95 {extract['before_p95_ms']:.1f}ms")
+    print(
+        f"   after (lxml 점진 파싱): P50 {extract['after_p50_ms']:.1f}ms | P95 {extract['after_p95_ms']:.1f}ms "
+        f"| 파싱한 분량 {extract['avg_parsed_ratio']:.0%} | 결과 불일치 {extract['mismatched']}"
+    )
+    print(f"크롤링: fetch_cafe_urls {args.calls}회 (글 3개씩, stub 지연 {args.latency * 1000:.0f}ms)")
+    for mode, r in fetch.items():
+        print(
+            f"  {mode:>6}: P50 {r['p50_ms']:.1f}ms | P95 {r['p95_ms']:.1f}ms | 새 TCP 연결 {r['tcp_connections']}개 "
+            f"| 빈 본문 {r['empty_contents']}"
+        )
+    print("=" * 60)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps({"extract": extract, "fetch": fetch}, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
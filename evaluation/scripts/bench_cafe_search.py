@@ -0,0 +1,264 @@
+"""
+naver_cafe_search 도구 end-to-end 지연 벤치마크 (오프라인)
+- 로컬 stub 서버 1개가 네이버 카페 검색 API, 카페 글 페이지, OpenAI chat-completions를 흉내냄
+  (후기 선별 LLM --select-latency초, 꿀팁 요약 LLM --summarize-latency초,
+   --slow-ratio 비율의 글은 요약이 --slow-latency초 걸림 → 글별 timeout 확인용,
+   --blocked-ratio 비율의 글은 본문 없는 로그인 안내 페이지 → 실패 URL 캐시 확인용)
+- 질의 목록을 --runs번 돌며 반복 호출 (인기 질의 반복)
+- before: 꿀팁 요약 순차 실행, 글별 timeout 없이 LLM 자체 timeout만, 캐시 없음 (기존 동작)
+  after: 동시 실행 (CAFE_SUMMARY_CONCURRENCY) + 글별 timeout (CAFE_SUMMARY_TIMEOUT), 캐시 없음
+  cached: after + 맘카페 캐시 (검색 응답/선별/본문/실패 URL/꿀팁)
+- 도구 호출 P50/P95, 꿀팁이 붙은 글 수, 요약 timeout 수, 외부 호출 수(검색 API/글 페이지/LLM), 캐시 적중률 보고
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+QUERIES = [
+    "에버랜드 주차 팁",
+    "아쿠아리움 웨이팅",
+    "키즈카페 솔직 후기",
+    "서울숲 아이랑 주말",
+    "국립중앙박물관 어린이박물관 예약",
+    "롯데월드 유모차",
+    "과천과학관 주차",
+    "한강 물놀이장 후기",
+]
+
+LOGIN_HTML = """<html><body><div class="login_guide">멤버 공개 글입니다. 카페에 가입해 주세요.</div></body></html>"""
+
+ARTICLE_HTML = """<html><head><title>{title}</title></head><body>
+<div class="header">카페 메뉴 {nav}</div>
+<div class="se-main-container"><p>{body}</p></div>
+<div class="comments">{comments}</div>
+</body></html>"""
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class StubNaverServer:
+    def __init__(self, args, seed: int):
+        self.args = args
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = {"search": 0, "page": 0, "select": 0, "summarize": 0}
+        self.httpd = _StubHTTPServer(("127.0.0.1", 0), self._handler())
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def count(self, kind: str):
+        with self.lock:
+            self.calls[kind] += 1
+
+    def reset(self, seed: int):
+        self.rng.seed(seed)
+        self.calls = {kind: 0 for kind in self.calls}
+
+    def _sleep(self, seconds: float):
+        time.sleep(seconds * self.rng.uniform(0.85, 1.15))
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", content_type)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # timeout으로 끊긴 요약 요청
+                    pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == "/v1/search/cafearticle.json":
+                    query = parse_qs(url.query)["query"][0]
+                    server.count("search")
+                    server._sleep(server.args.api_latency)
+                    items = [
+                        {
+                            "title": f"<b>{query}</b> 다녀왔어요 {i}",
+                            "link": f"{server.base_url}/cafe/{zlib.crc32(query.encode()) % 1000}/{i}",
+                            "description": f"{query} 관련 후기 {i}",
+                        }
+                        for i in range(10)
+                    ]
+                    return self._send(200, json.dumps({"items": items}, ensure_ascii=False).encode(), "application/json")
+                if url.path.startswith("/cafe/"):
+                    server.count("page")
+                    server._sleep(server.args.page_latency)
+                    if zlib.crc32(url.path.encode()) % 100 < server.args.blocked_ratio * 100:
+                        return self._send(200, LOGIN_HTML.encode("utf-8"), "text/html; charset=utf-8")
+                    html = ARTICLE_HTML.format(
+                        title=url.path,
+                        nav=" | ".join(f"메뉴{i}" for i in range(200)),
+                        body="주차장은 오전 10시 전에 도착해야 여유 있어요. 유모차 대여 가능하고 수유실도 깨끗해요. " * 20,
+                        comments="".join(f"<p>댓글 {i}: 저도 다녀왔어요</p>" for i in range(300)),
+                    )
+                    return self._send(200, html.encode("utf-8"), "text/html; charset=utf-8")
+                self._send(404, b"", "text/plain")
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                prompt = body["messages"][-1]["content"]
+                if "후기 3개" in prompt:
+                    server.count("select")
+                    server._sleep(server.args.select_latency)
+                    picked = re.findall(r"- (.+?) \((http[^)]+)\) :", prompt)[:3]
+                    content = json.dumps({"results": [
+                        {"title": title, "link": link, "summary": "실제 다녀온 후기", "sentiment": "긍정"}
+                        for title, link in picked
+                    ]}, ensure_ascii=False)
+                else:
+                    server.count("summarize")
+                    slow = server.rng.random() < server.args.slow_ratio
+                    server._sleep(server.args.slow_latency if slow else server.args.summarize_latency)
+                    content = "오전 10시 전 도착하면 주차 여유"
+                payload = {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "stub"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20},
+                }
+                self._send(200, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json")
+
+        return Handler
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+async def run_mode(
+    mode: str, concurrency: int, timeout: float, cache: bool, server: StubNaverServer, args
+) -> Dict[str, Any]:
+    from config import settings
+    from tools.naver_cafe_search_tool import clear_cafe_cache, get_cafe_cache_stats, naver_cafe_search
+    from utils.http_session import close_http_session
+    from utils.metrics import get_counter, percentile, reset_metrics
+
+    reset_metrics()
+    clear_cafe_cache()
+    server.reset(args.seed)
+    settings.CAFE_SUMMARY_CONCURRENCY = concurrency
+    settings.CAFE_SUMMARY_TIMEOUT = timeout
+    settings.CAFE_CACHE_ENABLED = cache
+    latencies: List[float] = []
+    tips = 0
+    for i in range(args.runs):
+        query = QUERIES[i % len(QUERIES)]
+        started = time.perf_counter()
+        output = await naver_cafe_search.ainvoke({"query": query, "conversation_id": ""})
+        latencies.append(time.perf_counter() - started)
+        tips += output.count("💡")
+    await close_http_session()
+
+    return {
+        "mode": mode,
+        "summary_concurrency": concurrency,
+        "summary_timeout": timeout,
+        "runs": args.runs,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "tips_attached": tips,
+        "summary_timeouts": get_counter("cafe.summary_timeout"),
+        "upstream_calls": dict(server.calls),
+        "cache": get_cafe_cache_stats() if cache else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="naver_cafe_search end-to-end 지연 벤치마크 (로컬 stub)")
+    parser.add_argument("--runs", "-n", type=int, default=24)
+    parser.add_argument("--api-latency", type=float, default=0.1)
+    parser.add_argument("--page-latency", type=float, default=0.2)
+    parser.add_argument("--select-latency", type=float, default=1.2)
+    parser.add_argument("--summarize-latency", type=float, default=0.8)
+    parser.add_argument("--slow-ratio", type=float, default=0.05, help="요약이 느린 글 비율")
+    parser.add_argument("--slow-latency", type=float, default=12.0)
+    parser.add_argument("--blocked-ratio", type=float, default=0.1, help="본문 없는(차단/멤버 공개) 글 비율")
+    parser.add_argument("--summary-timeout", type=float, default=None, help="CAFE_SUMMARY_TIMEOUT 덮어쓰기")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/cafe_search_bench.json")
+    args = parser.parse_args()
+
+    server = StubNaverServer(args, args.seed)
+    # get_llm은 OPENAI_API_BASE를 따르므로 처음 LLM을 만들기 전에 stub으로 지정
+    os.environ["OPENAI_API_BASE"] = f"{server.base_url}/v1"
+    from config import settings
+    from models.chat_models import LLM_TASK_POLICIES
+    import tools.naver_cafe_search_tool as cafe_tool
+
+    settings.NAVER_CLIENT_ID = settings.NAVER_CLIENT_ID or "stub"
+    settings.NAVER_CLIENT_SECRET = settings.NAVER_CLIENT_SECRET or "stub"
+    if args.summary_timeout is not None:
+        settings.CAFE_SUMMARY_TIMEOUT = args.summary_timeout
+    cafe_tool.NAVER_CAFE_API_URL = f"{server.base_url}/v1/search/cafearticle.json"
+    modes = [
+        ("before", 1, LLM_TASK_POLICIES["summarize"].timeout, False),
+        ("after", settings.CAFE_SUMMARY_CONCURRENCY, settings.CAFE_SUMMARY_TIMEOUT, False),
+        ("cached", settings.CAFE_SUMMARY_CONCURRENCY, settings.CAFE_SUMMARY_TIMEOUT, True),
+    ]
+
+    results = []
+    for mode, concurrency, timeout, cache in modes:
+        results.append(asyncio.run(run_mode(mode, concurrency, timeout, cache, server, args)))
+    server.close()
+
+    print("\n" + "=" * 60)
+    print(
+        f"도구 호출 {args.runs}회 (질의 {len(QUERIES)}종 반복) | 선별 {args.select_latency}s, 요약 {args.summarize_latency}s "
+        f"(느린 글 {args.slow_ratio:.0%} {args.slow_latency}s)"
+    )
+    for r in results:
+        print(
+            f"{r['mode']:>7} (요약 동시 {r['summary_concurrency']}, timeout {r['summary_timeout']:.0f}s): P50 {r['p50'] * 1000:.0f}ms | "
+            f"P95 {r['p95'] * 1000:.0f}ms | 꿀팁 {r['tips_attached']}/{args.runs * 3}개 | timeout {r['summary_timeouts']:.0f}회"
+        )
+        calls = r["upstream_calls"]
+        print(
+            f"{'':>7}  외부 호출: 검색 {calls['search']} / 글 {calls['page']} / 선별 LLM {calls['select']} "
+            f"/ 요약 LLM {calls['summarize']}"
+        )
+        if r["cache"]:
+            print("        캐시 적중률: " + " / ".join(
+                f"{name} {stats['hit_rate']:.0%}" for name, stats in r["cache"].items() if stats["hit_rate"] is not None
+            ))
+    print("=" * 60)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
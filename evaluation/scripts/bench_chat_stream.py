@@ -0,0 +1,106 @@
+"""
+/api/chat vs /api/chat/stream 체감 지연 비교 스크립트 (실행 중인 서버 대상)
+- /api/chat: 전체 응답이 와야 첫 바이트 → TTFB = 전체 시간
+- /api/chat/stream: 첫 바이트(TTFB), 첫 토큰(TTFT), 전체 시간
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from utils.metrics import percentile
+
+DEFAULT_QUESTIONS = [
+    "부산 키즈카페 추천해줘",
+    "서울 박물관 갈만한 곳 알려줘",
+    "내일 대구 날씨 어때? 아이랑 공원 가고 싶어",
+]
+
+
+async def _bench_chat(session: aiohttp.ClientSession, base_url: str, question: str) -> Dict[str, Any]:
+    start = time.perf_counter()
+    async with session.post(f"{base_url}/api/chat", json={"message": question}) as resp:
+        await resp.read()
+    total = time.perf_counter() - start
+    return {"ttfb": total, "ttft": total, "total": total}
+
+
+async def _bench_stream(session: aiohttp.ClientSession, base_url: str, question: str) -> Dict[str, Any]:
+    start = time.perf_counter()
+    ttfb: Optional[float] = None
+    ttft: Optional[float] = None
+    async with session.post(f"{base_url}/api/chat/stream", json={"message": question}) as resp:
+        async for raw in resp.content:
+            now = time.perf_counter() - start
+            if ttfb is None:
+                ttfb = now
+            line = raw.decode("utf-8").strip()
+            if not line.startswith("data:"):
+                continue
+            event = json.loads(line[len("data:"):])
+            if event.get("type") == "token" and ttft is None:
+                ttft = now
+            if event.get("type") in ("final", "error"):
+                break
+    total = time.perf_counter() - start
+    # 토큰 이벤트가 없으면(폴백 등) 최종 응답 시점을 첫 토큰으로 간주
+    return {"ttfb": ttfb or total, "ttft": ttft or total, "total": total}
+
+
+def _summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    summary = {}
+    for key in ("ttfb", "ttft", "total"):
+        values = [r[key] for r in runs]
+        summary[key] = {"p50": percentile(values, 50), "p95": percentile(values, 95)}
+    return summary
+
+
+async def run_bench(base_url: str, questions: List[str], repeat: int) -> Dict[str, Any]:
+    timeout = aiohttp.ClientTimeout(total=120)
+    chat_runs, stream_runs = [], []
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        for r in range(repeat):
+            for question in questions:
+                print(f"[{r+1}/{repeat}] {question}")
+                chat_runs.append(await _bench_chat(session, base_url, question))
+                stream_runs.append(await _bench_stream(session, base_url, question))
+
+    results = {"chat": _summarize(chat_runs), "stream": _summarize(stream_runs)}
+
+    print("\n" + "=" * 50)
+    for path, summary in results.items():
+        print(
+            f"{path:>6}: TTFB P50 {summary['ttfb']['p50']:.2f}s / P95 {summary['ttfb']['p95']:.2f}s | "
+            f"TTFT P50 {summary['ttft']['p50']:.2f}s / P95 {summary['ttft']['p95']:.2f}s | "
+            f"전체 P50 {summary['total']['p50']:.2f}s"
+        )
+    print("=" * 50)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/api/chat vs /api/chat/stream TTFB/TTFT 비교")
+    parser.add_argument("--base-url", type=str, default="http://localhost:8000")
+    parser.add_argument("--repeat", "-r", type=int, default=3)
+    parser.add_argument("--question", "-q", action="append", help="질문 (여러 번 지정 가능)")
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/chat_stream_bench.json")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_bench(args.base_url, args.question or DEFAULT_QUESTIONS, args.repeat))
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
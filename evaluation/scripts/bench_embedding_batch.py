@@ -0,0 +1,197 @@
+"""
+쿼리 임베딩 micro-batching(backend/models/embedding_batcher.py) 벤치마크
+- 로컬 stub 임베딩 서버(OpenAI /v1/embeddings 호환): 호출당 --latency초 + 텍스트당 --per-item초,
+  동시에 --capacity건만 처리 (API 동시 요청 한도 흉내)
+- pca_embeddings.aembed_query(/api/chat, RAG 도구와 같은 경로)를 동시 --concurrency개 호출자로 --requests건 보냄
+  unbatched: 요청마다 API 호출 (기존) / batched: window 안의 요청을 모아 1회 호출
+- 처리량(req/s), P50/P95, API 호출 수, 평균 배치 크기, 결과가 텍스트별로 맞게 돌아왔는지,
+  --cancel-ratio만큼 호출자를 중간 취소해도 나머지가 정상 응답하는지 보고
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from evaluation.scripts.eval_cases import load_dataset
+
+EMBEDDING_DIM = 16
+
+
+def _stub_vector(text: str) -> List[float]:
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return [b / 255 for b in digest[:EMBEDDING_DIM]]
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    # 기본 backlog(5)로는 동시 연결이 몰릴 때 SYN 재전송(~1초)이 생겨 stub 지연이 왜곡됨
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class StubEmbeddingServer:
+    def __init__(self, latency: float, per_item: float, capacity: int):
+        self.latency = latency
+        self.per_item = per_item
+        self.slots = threading.Semaphore(capacity)
+        self.calls = 0
+        self.httpd = _StubHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                texts = body["input"]
+                with server.slots:
+                    time.sleep(server.latency + server.per_item * len(texts))
+                server.calls += 1
+                data = json.dumps({
+                    "object": "list",
+                    "model": body.get("model"),
+                    "data": [
+                        {"object": "embedding", "index": i, "embedding": _stub_vector(text)}
+                        for i, text in enumerate(texts)
+                    ],
+                    "usage": {"prompt_tokens": len(texts), "total_tokens": len(texts)},
+                }).encode("utf-8")
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # 취소된 호출자는 응답 전에 연결을 끊음
+                    pass
+
+        return Handler
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _use_stub(server: StubEmbeddingServer):
+    from langchain_openai import OpenAIEmbeddings
+
+    from models.pca_embeddings import pca_embeddings
+
+    # 오프라인에서 tiktoken 다운로드를 피하려고 길이 확인은 끔 (stub은 문자열 입력을 그대로 받음)
+    pca_embeddings.embeddings = OpenAIEmbeddings(
+        model="text-embedding-3-large",
+        openai_api_key="EMPTY",
+        openai_api_base=server.url,
+        check_embedding_ctx_length=False,
+    )
+    return pca_embeddings
+
+
+async def run_mode(batched: bool, questions: List[str], args) -> Dict[str, Any]:
+    from config import settings
+    from utils.metrics import get_counter, percentile, reset_metrics
+
+    reset_metrics()
+    settings.EMBEDDING_BATCH_ENABLED = batched
+    server = StubEmbeddingServer(args.latency, args.per_item, args.capacity)
+    embeddings = _use_stub(server)
+    rng = random.Random(args.seed)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    stats = {"wrong": 0, "errors": 0, "cancelled": 0}
+
+    async def one(i: int):
+        text = questions[i % len(questions)]
+        async with semaphore:
+            started = time.perf_counter()
+            task = asyncio.ensure_future(embeddings.aembed_query(text))
+            if rng.random() < args.cancel_ratio:
+                await asyncio.sleep(rng.uniform(0, settings.EMBEDDING_BATCH_WINDOW_MS / 1000))
+                task.cancel()
+            try:
+                vector = await task
+            except asyncio.CancelledError:
+                stats["cancelled"] += 1
+                return
+            except Exception:
+                stats["errors"] += 1
+                return
+            latencies.append(time.perf_counter() - started)
+            if vector != _stub_vector(text):
+                stats["wrong"] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    total = time.perf_counter() - started
+    server.close()
+
+    batches = get_counter("embedding_batch.batches")
+    return {
+        "mode": "batched" if batched else "unbatched",
+        "requests": args.requests,
+        "completed": len(latencies),
+        **stats,
+        "throughput": len(latencies) / total,
+        "total_seconds": total,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "api_calls": server.calls,
+        "avg_batch_texts": (get_counter("embedding_batch.texts") / batches) if batches else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="쿼리 임베딩 micro-batching 벤치마크 (로컬 stub 서버)")
+    parser.add_argument("--requests", "-n", type=int, default=1000)
+    parser.add_argument("--concurrency", "-c", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.08, help="stub 호출당 지연(초)")
+    parser.add_argument("--per-item", type=float, default=0.0005, help="stub 텍스트당 추가 지연(초)")
+    parser.add_argument("--capacity", type=int, default=16, help="stub 동시 처리 한도")
+    parser.add_argument("--cancel-ratio", type=float, default=0.05, help="중간에 취소하는 호출자 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/embedding_batch_bench.json")
+    args = parser.parse_args()
+
+    questions = [q["question"] for q in load_dataset()["questions"]]
+    results = [asyncio.run(run_mode(batched, questions, args)) for batched in (False, True)]
+
+    print("\n" + "=" * 60)
+    print(f"요청 {args.requests}건, 동시 {args.concurrency}, stub {args.latency * 1000:.0f}ms/호출 (한도 {args.capacity})")
+    for r in results:
+        batch = f" | 평균 배치 {r['avg_batch_texts']:.1f}개" if r["avg_batch_texts"] else ""
+        print(
+            f"{r['mode']:>10}: {r['throughput']:.0f} req/s | P50 {r['p50'] * 1000:.0f}ms | P95 {r['p95'] * 1000:.0f}ms "
+            f"| API 호출 {r['api_calls']}회{batch}"
+        )
+        print(
+            f"{'':>10}  완료 {r['completed']} / 취소 {r['cancelled']} / 오류 {r['errors']} / 결과 불일치 {r['wrong']}"
+        )
+    print("=" * 60)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
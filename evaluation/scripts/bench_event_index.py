@@ -0,0 +1,177 @@
+"""
+Case 1 행사 인덱스(tools/event_index.py) 벤치마크 (오프라인)
+- 실시간 검색: bench_perplexity의 로컬 stub Perplexity 서버 (호출당 --latency초)
+- 백그라운드 갱신 소스: 프로세스 내 stub EventSource (원본 항목에 link 없는 항목/추가 필드 섞음 → _normalize_results 확인)
+- 인기 지역/구간 질문과 구체적인 질문(특정 동네/날짜)을 --specific-ratio 비율로 섞어 naver_web_search를 --runs번 호출
+  live: 인덱스/당일 캐시 없이 매번 실시간 검색 (기존 동작)
+  indexed: refresh_once로 인덱스를 채운 뒤 인덱스 우선, 없으면 실시간 검색 (당일 캐시는 꺼서 인덱스 효과만 측정)
+- 도구 호출 P50/P95, 인덱스 적중률, 실시간 API 호출 수, 갱신에 든 소스 호출 수
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from evaluation.scripts.bench_perplexity import StubPerplexityServer
+
+GENERIC_TEMPLATES = [
+    "이번 주말 {region} 아이랑 갈만한 축제",
+    "{region} 이번주 어린이 행사 추천해줘",
+    "다음 주말 {region}에서 하는 가족 행사 있어?",
+    "{region} 키즈 페스티벌 알려줘",
+    "이번주말 {region} 팝업 뭐 있어",
+]
+SPECIFIC_QUERIES = [
+    "성수동 팝업스토어 이번주",
+    "12월 25일 코엑스 크리스마스 행사",
+    "해운대 불꽃축제 일정",
+    "내일 송도 어린이 공연",
+]
+
+
+class StubEventSource:
+    """로컬 stub 행사 소스 (호출 수 집계)"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def fetch(self, query: str) -> List[Dict[str, Any]]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        items: List[Any] = [
+            {
+                "name": f"{query} 행사 {i}",
+                "link": f"https://example.com/indexed/{self.calls}/{i}",
+                "description": "기간 해석: 2099-01-01 ~ 2099-12-31 | 가족 행사",
+                "location": "벡스코",
+                "source": "stub",
+            }
+            for i in range(5)
+        ]
+        items += [{"name": "링크 없는 항목"}, "문자열 항목"]
+        return items
+
+
+def build_queries(regions: List[str], args) -> List[str]:
+    rng = random.Random(args.seed)
+    queries = []
+    for _ in range(args.runs):
+        if rng.random() < args.specific_ratio:
+            queries.append(rng.choice(SPECIFIC_QUERIES))
+        else:
+            queries.append(rng.choice(GENERIC_TEMPLATES).format(region=rng.choice(regions)))
+    return queries
+
+
+async def run_mode(mode: str, server: StubPerplexityServer, queries: List[str], args) -> Dict[str, Any]:
+    from config import settings
+    from tools.event_index import (
+        EventIndexRefresher,
+        _index,
+        clear_event_index,
+        get_event_index_stats,
+        get_event_regions,
+    )
+    from tools.naver_search_tool import naver_web_search
+    from tools.perplexity_client import clear_perplexity_cache, close_perplexity_client
+    from utils.metrics import percentile, reset_metrics
+
+    reset_metrics()
+    clear_event_index()
+    clear_perplexity_cache()
+    settings.PERPLEXITY_CACHE_ENABLED = False
+    settings.EVENT_INDEX_ENABLED = mode == "indexed"
+
+    source = StubEventSource(args.source_latency)
+    refresh_seconds = None
+    if mode == "indexed":
+        refresher = EventIndexRefresher(
+            _index,
+            source,
+            regions=get_event_regions(),
+            windows=["this_week", "this_weekend", "next_weekend"],
+            interval=settings.EVENT_INDEX_REFRESH_INTERVAL,
+            concurrency=settings.EVENT_INDEX_REFRESH_CONCURRENCY,
+        )
+        started = time.perf_counter()
+        await refresher.refresh_once()
+        refresh_seconds = time.perf_counter() - started
+
+    server.calls = 0
+    latencies: List[float] = []
+    errors = 0
+    for query in queries:
+        started = time.perf_counter()
+        output = await naver_web_search.ainvoke({"query": query, "conversation_id": ""})
+        latencies.append(time.perf_counter() - started)
+        errors += int(output.startswith("웹 검색"))
+    await close_perplexity_client()
+
+    stats = get_event_index_stats()
+    return {
+        "mode": mode,
+        "runs": len(queries),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "errors": errors,
+        "live_api_calls": server.calls,
+        "index_hit_rate": stats["hit_rate"] if mode == "indexed" else None,
+        "index_entries": stats["entries"],
+        "index_events": stats["events"],
+        "refresh_source_calls": source.calls,
+        "refresh_seconds": refresh_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Case 1 행사 인덱스 벤치마크 (로컬 stub)")
+    parser.add_argument("--runs", "-n", type=int, default=40)
+    parser.add_argument("--specific-ratio", type=float, default=0.25, help="인덱스로 답할 수 없는 구체적 질문 비율")
+    parser.add_argument("--latency", type=float, default=1.5, help="실시간 검색 stub 지연(초)")
+    parser.add_argument("--source-latency", type=float, default=0.2, help="갱신 소스 stub 지연(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/event_index_bench.json")
+    args = parser.parse_args()
+
+    server = StubPerplexityServer(args.latency)
+    os.environ["PERPLEXITY_BASE_URL"] = server.base_url
+    os.environ["PERPLEXITY_API_KEY"] = os.environ.get("PERPLEXITY_API_KEY") or "stub"
+    from tools.event_index import get_event_regions
+
+    queries = build_queries(get_event_regions(), args)
+    results = [asyncio.run(run_mode(mode, server, queries, args)) for mode in ("live", "indexed")]
+    server.close()
+
+    print("\n" + "=" * 60)
+    print(f"naver_web_search {args.runs}회 (구체적 질문 {args.specific_ratio:.0%}), 실시간 stub {args.latency}s")
+    for r in results:
+        print(
+            f"{r['mode']:>7}: P50 {r['p50'] * 1000:.0f}ms | P95 {r['p95'] * 1000:.0f}ms | 실시간 API 호출 {r['live_api_calls']}회 "
+            f"| 오류 {r['errors']}"
+        )
+        if r["mode"] == "indexed":
+            print(
+                f"{'':>7}  인덱스 적중률 {r['index_hit_rate']:.0%} | 항목 {r['index_entries']}개 (행사 {r['index_events']}개) "
+                f"| 갱신 소스 호출 {r['refresh_source_calls']}회, {r['refresh_seconds']:.1f}s"
+            )
+    print("=" * 60)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+search_map_by_address_core(지오코딩) 벤치마크 (오프라인)
+- 로컬 stub 서버가 Kakao 키워드 검색(/v2/local/search/keyword.json)을 흉내냄 (호출당 --latency초, 정확히 같은 장소명만 찾음)
+- 장소 --places개 중 절반은 시설 지명 사전(벡터 DB 메타데이터 대신 stub)에도 있음
+  질의는 장소명 뒤에 0~3단어('4홀', '2층' 등)를 붙이거나 없는 장소로 만들어 Zipf 분포로 --requests건, 동시 --concurrency개
+  before: requests.get(스레드)으로 원본 → 단어 뺀 질의를 하나씩 순서대로, 캐시 없음 (기존 동작)
+  after: 시설 사전 → 질의 캐시(찾지 못한 결과 포함) → 줄인 질의를 동시에 Kakao로, 가장 긴 성공 결과 사용
+  after_restart: after 캐시를 파일로 저장 → 비우고 다시 읽은 뒤 같은 부하 (서버 재시작 후)
+- 지도 요청 P50/P95, 처리량, Kakao 호출 수, 좌표가 before와 같은지
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+PLACE_WORDS = ["벡스코", "시민회관", "어린이대공원", "과학관", "키즈카페", "미술관", "도서관", "체험관", "수목원", "박물관"]
+REGION_WORDS = ["부산", "서울", "인천", "대전", "수원", "제주"]
+SUFFIX_WORDS = ["4홀", "2층", "대극장", "입구", "B동", "야외무대"]
+
+
+def make_places(n: int, rng: random.Random) -> Dict[str, Tuple[float, float]]:
+    """장소명 → (lat, lng)"""
+    places: Dict[str, Tuple[float, float]] = {}
+    while len(places) < n:
+        name = f"{rng.choice(REGION_WORDS)}{rng.choice(PLACE_WORDS)}{rng.randint(1, 99)}"
+        places[name] = (round(rng.uniform(33.2, 38.0), 6), round(rng.uniform(126.1, 129.5), 6))
+    return places
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class StubKakaoServer:
+    def __init__(self, places: Dict[str, Tuple[float, float]], latency: float):
+        self.places = places
+        self.latency = latency
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.httpd = _StubHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v2/local/search/keyword.json"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)["query"][0]
+                with server.lock:
+                    server.calls += 1
+                time.sleep(server.latency)
+                documents = []
+                if query in server.places:
+                    lat, lng = server.places[query]
+                    documents.append({"place_name": query, "road_address_name": f"{query} 도로명", "y": str(lat), "x": str(lng)})
+                data = json.dumps({"documents": documents}, ensure_ascii=False).encode("utf-8")
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        return Handler
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _legacy_geocode(url: str, place_name_or_address: str) -> Optional[Tuple[float, float]]:
+    """기존 search_map_by_address_core: requests.get으로 단어를 하나씩 빼며 순서대로 재시도"""
+    current_query = place_name_or_address.strip()
+    retry_count = 0
+    while current_query and retry_count <= 3:
+        response = requests.get(url, headers={"Authorization": "KakaoAK stub"}, params={"query": current_query, "size": 1}, timeout=5)
+        documents = response.json().get("documents", [])
+        if documents:
+            return float(documents[0]["y"]), float(documents[0]["x"])
+        words = current_query.split()
+        if len(words) <= 1:
+            break
+        current_query = " ".join(words[:-1])
+        retry_count += 1
+    return None
+
+
+def make_workload(places: Dict[str, Tuple[float, float]], args, rng: random.Random) -> List[str]:
+    names = list(places)
+    # 같은 장소도 붙는 단어가 달라질 수 있게 (장소, 접미사) 조합을 먼저 만들고 Zipf로 뽑음
+    queries = []
+    for i in range(args.distinct):
+        if rng.random() < args.unknown:
+            queries.append(f"없는장소{i} {rng.choice(SUFFIX_WORDS)}")
+            continue
+        suffix = rng.sample(SUFFIX_WORDS, rng.randint(0, 3))
+        queries.append(" ".join([rng.choice(names), *suffix]))
+    weights = [1 / (rank ** args.zipf) for rank in range(1, len(queries) + 1)]
+    return rng.choices(queries, weights, k=args.requests)
+
+
+async def run_mode(mode: str, server: StubKakaoServer, workload: List[str], args, cache_path: str) -> Dict[str, Any]:
+    import tools.geocoding_tool as geocoding_tool
+    from utils.http_session import close_http_session
+    from utils.metrics import get_counter, percentile, reset_metrics
+
+    reset_metrics()
+    if mode == "after":
+        geocoding_tool.clear_geocode_cache()
+    elif mode == "after_restart":
+        geocoding_tool.save_geocode_cache(cache_path)
+        geocoding_tool.clear_geocode_cache()
+        geocoding_tool.load_geocode_cache(cache_path)
+    server.calls = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    answers: Dict[str, Optional[Tuple[float, float]]] = {}
+
+    async def one(query: str):
+        async with semaphore:
+            started = time.perf_counter()
+            if mode == "before":
+                answer = await asyncio.to_thread(_legacy_geocode, server.url, query)
+            else:
+                response = await geocoding_tool.search_map_by_address_core(query)
+                marker = response.data.markers[0] if response.data.markers else None
+                answer = (marker.lat, marker.lng) if marker else None
+            latencies.append(time.perf_counter() - started)
+            answers[query] = answer
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(query) for query in workload))
+    total = time.perf_counter() - started
+    await close_http_session()
+    return {
+        "mode": mode,
+        "requests": len(workload),
+        "throughput": len(workload) / total,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "kakao_calls": server.calls,
+        "gazetteer_hits": get_counter("geocode.gazetteer_hits"),
+        "answers": answers,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지오코딩 시설 사전/캐시/동시 질의 벤치마크 (로컬 stub)")
+    parser.add_argument("--requests", "-n", type=int, default=400)
+    parser.add_argument("--concurrency", "-c", type=int, default=20)
+    parser.add_argument("--places", type=int, default=60, help="stub Kakao가 아는 장소 수 (절반은 시설 사전에도 있음)")
+    parser.add_argument("--distinct", type=int, default=120, help="서로 다른 질의 수")
+    parser.add_argument("--unknown", type=float, default=0.1, help="없는 장소 질의 비율")
+    parser.add_argument("--zipf", type=float, default=1.0)
+    parser.add_argument("--latency", type=float, default=0.1, help="stub 응답 지연(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/geocoding_bench.json")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    places = make_places(args.places, rng)
+    workload = make_workload(places, args, rng)
+    server = StubKakaoServer(places, args.latency)
+
+    import tools.geocoding_tool as geocoding_tool
+    from config import settings
+    from tools.facility_gazetteer import build_gazetteer, set_gazetteer
+
+    geocoding_tool.KAKAO_KEYWORD_URL = server.url
+    settings.KAKAO_REST_API_KEY = "stub"
+    set_gazetteer(build_gazetteer([
+        {"Name": name, "Address": f"{name} 도로명", "LAT": lat, "LON": lng}
+        for name, (lat, lng) in list(places.items())[: args.places // 2]
+    ]))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = str(Path(tmp_dir) / "geocode_cache.json")
+        results = [
+            asyncio.run(run_mode(mode, server, workload, args, cache_path))
+            for mode in ("before", "after", "after_restart")
+        ]
+    server.close()
+    baseline = results[0]["answers"]
+    for r in results:
+        r["mismatched"] = sum(1 for query, answer in r.pop("answers").items() if answer != baseline[query])
+
+    print("\n" + "=" * 60)
+    print(
+        f"지도 요청 {args.requests}건 (서로 다른 질의 {args.distinct}개, 장소 {args.places}개 중 사전 {args.places // 2}개), "
+        f"동시 {args.concurrency}, stub {args.latency}s"
+    )
+    for r in results:
+        print(
+            f"{r['mode']:>13}: {r['throughput']:.0f} req/s | P50 {r['p50'] * 1000:.1f}ms | P95 {r['p95'] * 1000:.1f}ms "
+            f"| Kakao 호출 {r['kakao_calls']}회 | 사전 적중 {r['gazetteer_hits']:.0f} | 좌표 불일치 {r['mismatched']}"
+        )
+    print("=" * 60)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+LLM 엔드포인트 풀(backend/models/llm_pool.py) 벤치마크
+- 로컬 stub 서버(OpenAI chat-completions 호환)를 여러 개 띄우고 엔드포인트별 지연/꼬리 지연/장애 구간을 설정
+  stub은 동시에 --capacity건만 처리하고 나머지는 대기 (GPU 서버 배치 한도 흉내)
+- 같은 부하(동시 --concurrency, 총 --requests건)를 세 방식으로 보냄
+  single: 기존처럼 엔드포인트 1개 (첫 번째 stub)
+  pool: 최소 진행 중 요청 × 관측 지연 라우팅 + 장애 멤버 제외/재투입
+  pool+hedge: pool + p95 기반 지연 후 다른 멤버로 hedged 요청
+- P50/P95/P99, 오류 수, 멤버별 처리 수, hedge/재전송/제외/재투입 횟수 보고
+
+엔드포인트 형식: "지연초[:꼬리확률:꼬리지연초[:장애시작-장애끝]]" (장애 구간은 모드 시작 기준 초, 그동안 503)
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+DEFAULT_ENDPOINTS = [
+    "0.15:0.05:1.5",
+    "0.15:0.05:1.5",
+    "0.3:0.05:1.5:2-6",
+]
+
+
+@dataclass
+class StubSpec:
+    latency: float
+    tail_prob: float = 0.0
+    tail_latency: float = 0.0
+    outage: Optional[Tuple[float, float]] = None
+
+    @classmethod
+    def parse(cls, value: str) -> "StubSpec":
+        parts = value.split(":")
+        spec = cls(latency=float(parts[0]))
+        if len(parts) >= 3:
+            spec.tail_prob, spec.tail_latency = float(parts[1]), float(parts[2])
+        if len(parts) >= 4:
+            start, end = parts[3].split("-")
+            spec.outage = (float(start), float(end))
+        return spec
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    # 기본 backlog(5)로는 동시 연결이 몰릴 때 SYN 재전송(~1초)이 생겨 stub 지연이 왜곡됨
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class StubServer:
+    """chat-completions 호환 stub (요청마다 설정한 지연 후 고정 응답)"""
+
+    def __init__(self, spec: StubSpec, seed: int, capacity: int):
+        self.spec = spec
+        self.slots = threading.Semaphore(capacity)
+        self.rng = random.Random(seed)
+        self.started_at = time.monotonic()
+        self.handled = 0
+        self.httpd = _StubHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                elapsed = time.monotonic() - server.started_at
+                outage = server.spec.outage
+                if outage and outage[0] <= elapsed < outage[1]:
+                    time.sleep(0.01)
+                    return self._send(503, {"error": {"message": "stub outage"}})
+
+                latency = server.spec.latency * server.rng.uniform(0.8, 1.2)
+                if server.rng.random() < server.spec.tail_prob:
+                    latency = server.spec.tail_latency
+                with server.slots:
+                    time.sleep(latency)
+                server.handled += 1
+                self._send(200, {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "stub"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "stub 응답입니다."},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+                })
+
+            def _send(self, status: int, payload: Dict[str, Any]):
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # hedging에서 진 요청은 클라이언트가 먼저 끊음
+                    pass
+
+        return Handler
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _build_llm(mode: str, servers: List[StubServer], hedge_min_delay: float):
+    import httpx
+    from langchain_openai import ChatOpenAI
+
+    from models.llm_pool import POOL_BASE_URL, LLMEndpointPool, PoolAsyncTransport
+
+    if mode == "single":
+        return ChatOpenAI(model="stub", openai_api_key="EMPTY", base_url=servers[0].url, timeout=30), None
+
+    pool = LLMEndpointPool(
+        [s.url for s in servers],
+        eject_failures=3,
+        eject_seconds=2.0,
+        hedge_enabled=(mode == "pool+hedge"),
+        hedge_min_delay=hedge_min_delay,
+    )
+    llm = ChatOpenAI(
+        model="stub",
+        openai_api_key="EMPTY",
+        base_url=POOL_BASE_URL,
+        timeout=30,
+        http_async_client=httpx.AsyncClient(transport=PoolAsyncTransport(pool)),
+    )
+    return llm, pool
+
+
+async def run_mode(
+    mode: str,
+    specs: List[StubSpec],
+    requests: int,
+    concurrency: int,
+    capacity: int,
+    hedge_min_delay: float,
+    seed: int,
+) -> Dict[str, Any]:
+    from utils.metrics import get_counter, percentile, reset_metrics
+
+    reset_metrics()
+    servers = [StubServer(spec, seed + i, capacity) for i, spec in enumerate(specs)]
+    llm, pool = _build_llm(mode, servers, hedge_min_delay)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await llm.ainvoke(f"질문 {i}")
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    total = time.perf_counter() - started
+    for server in servers:
+        server.close()
+
+    return {
+        "mode": mode,
+        "requests": requests,
+        "errors": errors,
+        "total_seconds": total,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "handled_by_endpoint": [s.handled for s in servers],
+        "hedged": get_counter("llm_pool.hedged"),
+        "hedge_won": get_counter("llm_pool.hedge_won"),
+        "failover": get_counter("llm_pool.failover"),
+        "ejected": get_counter("llm_pool.ejected"),
+        "readmitted": get_counter("llm_pool.readmitted"),
+        "pool": pool.stats() if pool else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM 엔드포인트 풀 / hedging 벤치마크 (로컬 stub 서버)")
+    parser.add_argument("--endpoint", action="append", help="stub 엔드포인트 설정 (반복 지정, 형식은 모듈 설명 참고)")
+    parser.add_argument("--requests", "-n", type=int, default=400)
+    parser.add_argument("--concurrency", "-c", type=int, default=16)
+    parser.add_argument("--capacity", type=int, default=8, help="stub 1개가 동시에 처리하는 요청 수")
+    parser.add_argument("--hedge-min-delay", type=float, default=0.2)
+    parser.add_argument("--modes", type=str, default="single,pool,pool+hedge")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/llm_pool_bench.json")
+    args = parser.parse_args()
+
+    specs = [StubSpec.parse(value) for value in (args.endpoint or DEFAULT_ENDPOINTS)]
+    results = []
+    for mode in args.modes.split(","):
+        result = asyncio.run(run_mode(
+            mode, specs, args.requests, args.concurrency, args.capacity, args.hedge_min_delay, args.seed
+        ))
+        results.append(result)
+
+    print("\n" + "=" * 60)
+    print(f"요청 {args.requests}건, 동시 {args.concurrency}, stub 처리 한도 {args.capacity}, 엔드포인트 {args.endpoint or DEFAULT_ENDPOINTS}")
+    for r in results:
+        print(
+            f"{r['mode']:>10}: P50 {r['p50'] * 1000:.0f}ms | P95 {r['p95'] * 1000:.0f}ms | P99 {r['p99'] * 1000:.0f}ms "
+            f"| 오류 {r['errors']} | 처리 {r['handled_by_endpoint']} | 총 {r['total_seconds']:.1f}s"
+        )
+        if r["pool"]:
+            print(
+                f"{'':>10}  hedge {r['hedged']:.0f}회 (승 {r['hedge_won']:.0f}) | "
+                f"재전송 {r['failover']:.0f}회 | 제외 {r['ejected']:.0f}회 | 재투입 {r['readmitted']:.0f}회"
+            )
+    print("=" * 60)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
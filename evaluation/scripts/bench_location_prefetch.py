@@ -0,0 +1,136 @@
+"""
+웹/맘카페 검색 결과 좌표 선행 조회(utils/location_prefetch.py) 벤치마크 (오프라인)
+- bench_geocoding의 로컬 stub Kakao 서버 사용 (호출당 --latency초, 시설 사전은 비움)
+- 대화 --conversations개가 동시에: 웹 검색 결과 --results건 저장(save_search_results, source="web")
+  → 사용자가 답변을 읽는 --think초 뒤 "N번째 지도 보여줘" 후속 요청(answer_map_followup)
+  on_demand: 선행 조회 끔 (지도 요청 때 fast lane이 지오코딩)
+  prefetch: 결과 저장과 동시에 모든 항목 좌표를 백그라운드로 조회 → 지도 요청은 메모리 좌표 사용
+  (모드마다 지오코딩 캐시를 비우고, 대화 절반은 think 중 새 검색을 한 번 더 해 이전 작업 취소도 확인)
+- 지도 후속 요청 P50/P95, fast lane 응답 비율, Kakao 호출 수, 취소된 작업 수
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from evaluation.scripts.bench_geocoding import SUFFIX_WORDS, StubKakaoServer, make_places
+
+
+def make_results(places: List[str], count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """행사 검색 결과 (location은 stub이 아는 장소 + 세부 공간 단어)"""
+    return [
+        {
+            "name": f"행사{rng.randint(1, 9999)}",
+            "link": "https://example.com/event",
+            "location": " ".join([rng.choice(places), *rng.sample(SUFFIX_WORDS, rng.randint(0, 2))]),
+        }
+        for _ in range(count)
+    ]
+
+
+async def run_mode(mode: str, server: StubKakaoServer, places: List[str], args) -> Dict[str, Any]:
+    from agent.map_fastlane import answer_map_followup
+    from config import settings
+    from tools.geocoding_tool import clear_geocode_cache
+    from utils.conversation_memory import clear_conversation, save_search_results
+    from utils.http_session import close_http_session
+    from utils.metrics import get_counter, percentile, reset_metrics
+
+    reset_metrics()
+    clear_geocode_cache()
+    server.calls = 0
+    settings.LOCATION_PREFETCH_ENABLED = mode == "prefetch"
+    rng = random.Random(args.seed)
+    latencies: List[float] = []
+    answered = 0
+
+    async def conversation(i: int):
+        nonlocal answered
+        conversation_id = f"bench-{mode}-{i}"
+        # 대화마다 시작 시점을 흩어 놓음
+        await asyncio.sleep(rng.uniform(0, args.spread))
+        if i % 2:
+            # 이전 검색 결과 → 새 검색으로 교체 (이전 지오코딩은 취소돼야 함)
+            save_search_results(conversation_id, make_results(places, args.results, rng), source="web")
+            await asyncio.sleep(args.latency / 2)
+        save_search_results(conversation_id, make_results(places, args.results, rng), source="web")
+        await asyncio.sleep(args.think)
+
+        started = time.perf_counter()
+        response = await answer_map_followup(f"{rng.randint(1, args.results)}번째 지도 보여줘", conversation_id)
+        latencies.append(time.perf_counter() - started)
+        if response is not None:
+            answered += 1
+        clear_conversation(conversation_id)
+
+    await asyncio.gather(*(conversation(i) for i in range(args.conversations)))
+    await close_http_session()
+    return {
+        "mode": mode,
+        "followups": len(latencies),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "fastlane_rate": answered / len(latencies),
+        "kakao_calls": server.calls,
+        "prefetch_cancelled": get_counter("location_prefetch.cancelled"),
+        "prefetch_map_hits": get_counter("location_prefetch.map_hits"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색 결과 좌표 선행 조회 벤치마크 (로컬 stub)")
+    parser.add_argument("--conversations", type=int, default=40)
+    parser.add_argument("--results", type=int, default=5, help="대화당 검색 결과 수")
+    parser.add_argument("--think", type=float, default=3.0, help="결과 저장 → 지도 요청 사이 시간(초, 답변 읽는 시간)")
+    parser.add_argument("--spread", type=float, default=5.0, help="대화 시작 시점을 흩어 놓을 구간(초)")
+    parser.add_argument("--places", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.2, help="stub 응답 지연(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/location_prefetch_bench.json")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    places = make_places(args.places, random.Random(args.seed))
+    server = StubKakaoServer(places, args.latency)
+
+    import tools.geocoding_tool as geocoding_tool
+    from config import settings
+    from tools.facility_gazetteer import set_gazetteer
+
+    geocoding_tool.KAKAO_KEYWORD_URL = server.url
+    settings.KAKAO_REST_API_KEY = "stub"
+    set_gazetteer({})
+
+    results = [asyncio.run(run_mode(mode, server, list(places), args)) for mode in ("on_demand", "prefetch")]
+    server.close()
+
+    print("\n" + "=" * 60)
+    print(
+        f"대화 {args.conversations}개 × 결과 {args.results}건, 저장 → 지도 요청 {args.think}s, stub {args.latency}s"
+    )
+    for r in results:
+        print(
+            f"{r['mode']:>9}: P50 {r['p50'] * 1000:.1f}ms | P95 {r['p95'] * 1000:.1f}ms "
+            f"| fast lane {r['fastlane_rate']:.0%} | Kakao 호출 {r['kakao_calls']}회 "
+            f"| 취소 {r['prefetch_cancelled']:.0f} | 메모리 좌표 응답 {r['prefetch_map_hits']:.0f}"
+        )
+    print("=" * 60)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+지도 후속 요청 fast lane(agent/map_fastlane.py) 벤치마크
+- 최근 RAG 검색 결과를 메모리에 넣어 둔 상태에서 "2번째 지도 보여줘" 류 후속 요청을
+  run_chat(/api/chat과 동일 경로)으로 처리한 응답 시간 P50/P95 (LLM 호출 0회)
+- 후속 요청 문구별 fast lane 적중 여부와 선택된 시설
+- 평가 데이터셋 질문 중 fast lane이 잘못 가로채는 문항 수 (새 장소 지도 요청 등은 에이전트로 가야 함)
+서버/LLM 없이 실행됩니다.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from evaluation.scripts.eval_cases import load_dataset
+
+SAMPLE_FACILITIES = [
+    {"name": "서울상상나라", "lat": 37.5487, "lng": 127.0807, "desc": "광진구 어린이 체험 시설"},
+    {"name": "국립어린이과학관", "lat": 37.5856, "lng": 126.9960, "desc": "종로구 과학 체험관"},
+    {"name": "서울시립과학관", "lat": 37.6417, "lng": 127.0770, "desc": "노원구 과학관"},
+    {"name": "키즈카페 놀이숲", "lat": 37.5172, "lng": 127.0473, "desc": "강남구 실내 놀이터"},
+    {"name": "어린이대공원", "lat": 37.5480, "lng": 127.0745, "desc": "광진구 공원"},
+]
+
+FOLLOWUP_PHRASES = [
+    "2번째 지도 보여줘",
+    "첫 번째랑 세 번째 위치",
+    "둘 다 지도로 보여줘",
+    "1, 3번 지도",
+    "마지막 거 위치 알려줘",
+    "두 번째 곳 위치 좀 알려줘",
+    "2번 어디야?",
+    "전부 지도에 표시해줘",
+    "지도 보여줘",
+    "거기 지도로 보여줘",
+]
+
+
+def _seed(conversation_id: str):
+    from utils.conversation_memory import clear_conversation, save_search_results
+
+    clear_conversation(conversation_id)
+    save_search_results(conversation_id, SAMPLE_FACILITIES, source="rag")
+
+
+async def bench_latency(repeat: int) -> Dict[str, Any]:
+    from models.schemas import ChatRequest
+    from routers.chat import run_chat
+    from utils.metrics import percentile
+
+    latencies: List[float] = []
+    phrases: Dict[str, Any] = {}
+    for phrase in FOLLOWUP_PHRASES:
+        for i in range(repeat):
+            conversation_id = f"bench_map_{i}"
+            _seed(conversation_id)
+            start = time.perf_counter()
+            response = await run_chat(ChatRequest(message=phrase, conversation_id=conversation_id), conversation_id)
+            latencies.append(time.perf_counter() - start)
+        phrases[phrase] = {
+            "type": response.type,
+            "markers": [m.name for m in response.data.markers] if response.data else [],
+        }
+
+    return {
+        "count": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "phrases": phrases,
+    }
+
+
+def check_dataset(questions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """데이터셋 질문은 모두 새 요청 → 최근 결과가 있어도 fast lane이 가로채면 안 됨"""
+    from agent.map_fastlane import is_map_followup
+
+    intercepted = [item["question"] for item in questions if is_map_followup(item["question"])]
+    return {"questions": len(questions), "intercepted": intercepted}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지도 후속 요청 fast lane 벤치마크")
+    parser.add_argument("--repeat", "-r", type=int, default=20, help="문구별 반복 횟수")
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/map_fastlane_bench.json")
+    args = parser.parse_args()
+
+    results = {
+        "latency": asyncio.run(bench_latency(args.repeat)),
+        "dataset": check_dataset(load_dataset()["questions"]),
+    }
+
+    latency = results["latency"]
+    dataset = results["dataset"]
+    print("\n" + "=" * 50)
+    for phrase, info in latency["phrases"].items():
+        print(f"{phrase:<20} → {info['type']:>4} {info['markers']}")
+    print(f"fast lane 응답 시간: P50 {latency['p50_ms']:.1f}ms | P95 {latency['p95_ms']:.1f}ms (n={latency['count']}, LLM 0회)")
+    print(f"데이터셋 오적중: {len(dataset['intercepted'])}/{dataset['questions']}문항")
+    print("=" * 50)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Perplexity 행사 검색(tools/perplexity_client.search_events_with_perplexity) 벤치마크 (오프라인)
+- 로컬 stub 서버가 Perplexity chat-completions(/chat/completions)를 흉내냄 (호출당 --latency초)
+- before: 호출마다 Perplexity(sync) 클라이언트 생성 + asyncio.to_thread, 캐시 없음 (기존 동작)
+  after: 공유 AsyncPerplexity + (정규화한 질의, 오늘 날짜) 캐시 + 동시 같은 질의 single-flight
+- 1) 인기 질의를 --runs번 순차 반복: 첫 호출/반복 호출 P50(중앙값)
+  2) 같은 질의 --burst개를 동시에 보냄: 완료 시간, stub이 받은 API 호출 수
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+QUERIES = [
+    "이번 주말 서울 아이랑 갈만한 축제",
+    "부산 어린이 체험 전시 다음주",
+    "성수동 팝업스토어 이번주",
+    "경기도 가족 행사 이번 주말",
+    "인천 키즈 페스티벌",
+]
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class StubPerplexityServer:
+    def __init__(self, latency: float, rotate: bool = False):
+        """rotate=True면 호출마다 다른 행사 이름을 돌려줌 (같은 질의 재검색 시 새 행사가 나오는 경우)"""
+        self.latency = latency
+        self.rotate = rotate
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.httpd = _StubHTTPServer(("127.0.0.1", 0), self._handler())
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                with server.lock:
+                    server.calls += 1
+                    call = server.calls
+                time.sleep(server.latency)
+                query = body["messages"][-1]["content"].split("사용자 요청: ", 1)[-1].split("\n", 1)[0]
+                events = [
+                    {
+                        "name": f"{query} 행사 {call}-{i}" if server.rotate else f"{query} 행사 {i}",
+                        "link": f"https://example.com/events/{i}",
+                        "description": "기간 해석: 2026-10-24 ~ 2026-10-25 | 주말 가족 행사",
+                        "location": "벡스코",
+                    }
+                    for i in range(5)
+                ]
+                payload = {
+                    "id": "stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "sonar-pro"),
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": json.dumps(events, ensure_ascii=False)},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                }
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        return Handler
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+async def _legacy_search(query: str) -> List[Dict[str, str]]:
+    """기존 동작: 호출마다 sync 클라이언트를 만들어 스레드에서 호출"""
+    from perplexity import Perplexity
+
+    from tools.perplexity_client import SYSTEM_PROMPT, _build_user_prompt, _parse_content, _today_text
+
+    def _call():
+        from datetime import datetime
+
+        client = Perplexity(api_key=os.environ["PERPLEXITY_API_KEY"])
+        completion = client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": _build_user_prompt(query, _today_text(datetime.now()))},
+            ],
+            model="sonar-pro",
+        )
+        return _parse_content(completion.choices[0].message.content)
+
+    return await asyncio.to_thread(_call)
+
+
+async def run_mode(mode: str, server: StubPerplexityServer, args) -> Dict[str, Any]:
+    from tools.perplexity_client import (
+        clear_perplexity_cache,
+        close_perplexity_client,
+        get_perplexity_cache_stats,
+        search_events_with_perplexity,
+    )
+    from utils.metrics import percentile, reset_metrics
+
+    reset_metrics()
+    clear_perplexity_cache()
+    search = _legacy_search if mode == "before" else search_events_with_perplexity
+
+    server.calls = 0
+    first, repeat = [], []
+    seen = set()
+    for i in range(args.runs):
+        query = QUERIES[i % len(QUERIES)]
+        # 공백/대소문자만 다른 같은 질의도 섞음
+        if i % 3 == 2:
+            query = f"  {query}  "
+        started = time.perf_counter()
+        results = await search(query)
+        (repeat if query.strip() in seen else first).append(time.perf_counter() - started)
+        seen.add(query.strip())
+        assert results and results[0]["link"]
+    sequential_calls = server.calls
+
+    server.calls = 0
+    burst_query = "이번 주말 제주 어린이 공연"
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(search(burst_query) for _ in range(args.burst)), return_exceptions=True)
+    burst_seconds = time.perf_counter() - started
+    burst_calls = server.calls
+
+    stats = get_perplexity_cache_stats() if mode == "after" else None
+    await close_perplexity_client()
+    return {
+        "mode": mode,
+        "runs": args.runs,
+        "first_p50": percentile(first, 50),
+        "repeat_p50": percentile(repeat, 50),
+        "repeat_p95": percentile(repeat, 95),
+        "sequential_api_calls": sequential_calls,
+        "burst": args.burst,
+        "burst_seconds": burst_seconds,
+        "burst_api_calls": burst_calls,
+        "burst_errors": sum(1 for o in outcomes if isinstance(o, Exception)),
+        "cache": stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perplexity 행사 검색 캐시/single-flight 벤치마크 (로컬 stub)")
+    parser.add_argument("--runs", "-n", type=int, default=30, help="순차 호출 수 (질의 목록 반복)")
+    parser.add_argument("--burst", type=int, default=50, help="같은 질의 동시 호출 수")
+    parser.add_argument("--latency", type=float, default=1.5, help="stub 응답 지연(초)")
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/perplexity_bench.json")
+    args = parser.parse_args()
+
+    server = StubPerplexityServer(args.latency)
+    # 두 클라이언트 모두 PERPLEXITY_BASE_URL / PERPLEXITY_API_KEY 환경변수를 따름
+    os.environ["PERPLEXITY_BASE_URL"] = server.base_url
+    os.environ["PERPLEXITY_API_KEY"] = os.environ.get("PERPLEXITY_API_KEY") or "stub"
+
+    results = [asyncio.run(run_mode(mode, server, args)) for mode in ("before", "after")]
+    server.close()
+
+    print("\n" + "=" * 60)
+    print(f"순차 {args.runs}회 (질의 {len(QUERIES)}종 반복), 동시 {args.burst}개 같은 질의, stub {args.latency}s")
+    for r in results:
+        print(
+            f"{r['mode']:>6}: 첫 호출 P50 {r['first_p50'] * 1000:.0f}ms | 반복 호출 P50 {r['repeat_p50'] * 1000:.1f}ms "
+            f"(P95 {r['repeat_p95'] * 1000:.1f}ms) | API 호출 {r['sequential_api_calls']}회"
+        )
+        print(
+            f"{'':>6}  동시 {r['burst']}개: {r['burst_seconds'] * 1000:.0f}ms | API 호출 {r['burst_api_calls']}회 "
+            f"| 오류 {r['burst_errors']}"
+        )
+        if r["cache"]:
+            print(f"{'':>6}  캐시 적중률 {r['cache']['hit_rate']:.0%}")
+    print("=" * 60)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
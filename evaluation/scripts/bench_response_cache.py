@@ -0,0 +1,152 @@
+"""
+첫 턴 응답 캐시(utils/response_cache.py) 벤치마크
+- 평가 데이터셋 질문을 인기 편중(Zipf) 분포로 반복 요청하고, 일부는 띄어쓰기/문장부호/어미만 바꾼 변형으로 보냄
+- run_chat(/api/chat과 동일 경로)으로 처리해 exact/semantic 적중률, 적중 시 응답 시간, 절약 시간 보고
+- 기본(오프라인): 에이전트는 --agent-latency초 걸리는 가짜 실행, 임베딩은 문자 n-gram 해시 벡터, 날씨는 고정 예보
+- --live: 실제 에이전트/임베딩/날씨 API 사용 (LLM 호출 발생)
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from evaluation.scripts.eval_cases import load_dataset
+
+# 같은 질문의 표현 변형 (의미는 같고 정규화/임베딩으로 묶여야 하는 경우)
+VARIANTS = [
+    lambda q: q,
+    lambda q: q.replace(" ", "", 1),
+    lambda q: q.rstrip("?!. ") + "?",
+    lambda q: q.rstrip("?!. ") + " 좀 알려줘",
+]
+EMBEDDING_DIM = 512
+
+
+def _hashed_embedding(text: str) -> List[float]:
+    """오프라인용 임베딩: 공백 제거 문자 2/3-gram 해시 벡터"""
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    compact = text.replace(" ", "")
+    for n in (2, 3):
+        for i in range(len(compact) - n + 1):
+            digest = hashlib.md5(compact[i : i + n].encode("utf-8")).digest()
+            vector[int.from_bytes(digest[:4], "little") % EMBEDDING_DIM] += 1.0
+    return vector.tolist()
+
+
+def _install_offline_stubs(agent_latency: float):
+    from langchain_core.agents import AgentAction
+
+    import tools.weather_tool as weather_tool
+    from config import settings
+    from models.pca_embeddings import pca_embeddings
+    from routers import chat as chat_router
+
+    class _FakeAgent:
+        async def ainvoke(self, inputs: Dict[str, Any], config=None):
+            await asyncio.sleep(agent_latency)
+            facilities = [{"name": f"{inputs['input'][:6]} 시설 {i}", "lat": 37.5, "lng": 127.0} for i in range(3)]
+            step = (
+                AgentAction("search_facilities", {"original_query": inputs["input"]}, ""),
+                json.dumps({"success": True, "facilities": facilities}, ensure_ascii=False),
+            )
+            return {"output": f"'{inputs['input']}'에 대한 추천입니다.", "intermediate_steps": [step]}
+
+    async def _aembed(text: str):
+        await asyncio.sleep(0.05)
+        return _hashed_embedding(text)
+
+    today = datetime.now().strftime("%Y-%m-%d 12:00:00")
+
+    async def _fetch_forecast(city: str):
+        return weather_tool.CityForecast(
+            [{"dt_txt": today, "weather": [{"main": "Clear", "description": "맑음"}], "main": {"temp": 20.0}}]
+        )
+
+    weather_tool.fetch_forecast = _fetch_forecast
+    chat_router.fetch_forecast = _fetch_forecast
+    pca_embeddings.aembed_query = _aembed
+    chat_router.agent_executor = _FakeAgent()
+    settings.PLANNER_ENABLED = False
+    settings.CASE_CLASSIFIER_ENABLED = False
+    # 해시 임베딩은 OpenAI 임베딩보다 유사도가 낮게 나와 임계값을 맞춰 줌
+    settings.RESPONSE_CACHE_SEMANTIC_THRESHOLD = 0.85
+
+
+def build_workload(questions: List[str], requests: int, zipf_s: float, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    weights = [1 / (rank ** zipf_s) for rank in range(1, len(questions) + 1)]
+    picked = rng.choices(questions, weights=weights, k=requests)
+    return [rng.choice(VARIANTS)(q) for q in picked]
+
+
+async def run_bench(workload: List[str]) -> Dict[str, Any]:
+    from models.schemas import ChatRequest
+    from routers.chat import run_chat
+    from utils.metrics import snapshot
+    from utils.response_cache import get_response_cache_stats
+
+    started = time.perf_counter()
+    for i, message in enumerate(workload):
+        conversation_id = f"bench_cache_{i}"
+        await run_chat(ChatRequest(message=message, conversation_id=conversation_id), conversation_id)
+    total = time.perf_counter() - started
+
+    paths = snapshot()["paths"]
+    return {
+        "requests": len(workload),
+        "total_seconds": total,
+        "paths": paths,
+        "cache": get_response_cache_stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="첫 턴 응답 캐시 벤치마크")
+    parser.add_argument("--requests", "-n", type=int, default=500)
+    parser.add_argument("--zipf", type=float, default=1.1, help="질문 인기 편중 정도 (클수록 반복 많음)")
+    parser.add_argument("--agent-latency", type=float, default=0.2, help="오프라인 가짜 에이전트 처리 시간(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--live", action="store_true", help="실제 에이전트/임베딩 사용 (LLM 호출)")
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/response_cache_bench.json")
+    args = parser.parse_args()
+
+    if not args.live:
+        _install_offline_stubs(args.agent_latency)
+
+    questions = [q["question"] for q in load_dataset()["questions"]]
+    workload = build_workload(questions, args.requests, args.zipf, args.seed)
+    results = asyncio.run(run_bench(workload))
+
+    cache = results["cache"]
+    print("\n" + "=" * 50)
+    print(f"요청 {results['requests']}건 (고유 질문 {len(set(workload))}개 표현)")
+    print(
+        f"적중률 {cache['hit_rate']:.1%} (exact {cache['hits_exact']:.0f} / semantic {cache['hits_semantic']:.0f} "
+        f"/ miss {cache['lookups'] - cache['hits_exact'] - cache['hits_semantic']:.0f})"
+    )
+    for path, s in results["paths"].items():
+        print(f"{path:>15}: P50 {s['p50'] * 1000:.1f}ms | P95 {s['p95'] * 1000:.1f}ms (n={s['count']})")
+    print(f"절약 시간: {cache['saved_seconds']:.1f}s (전체 처리 {results['total_seconds']:.1f}s)")
+    print("=" * 50)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
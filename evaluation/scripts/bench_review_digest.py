@@ -0,0 +1,153 @@
+"""
+인기 시설 맘카페 후기 요약(tools/review_digest.py) 벤치마크 (오프라인)
+- bench_cafe_search의 로컬 stub 서버(네이버 카페 검색 API + 카페 글 페이지 + OpenAI chat-completions) 사용
+- 시설 --facilities개에 Zipf 분포로 후기 질문 --requests건 (동시 --concurrency개)
+  질문은 같은 시설도 표현이 다름("X 후기", "X 솔직 후기", "X 맘카페 리뷰" ...), --aspect-ratio 비율은 "X 주차 팁" 같은 측면 질문
+  cached: 기존 맘카페 캐시만 (질의 문자열이 다르면 검색/선별/요약을 다시 함), 캐시는 빈 상태로 시작
+  digest: 상위 --top-n 시설 요약을 ReviewDigestBuilder로 먼저 만든 뒤(오프라인 생성) 같은 부하
+- 도구 호출 P50/P95, 요약 적중률, 부하 동안의 외부 호출 수(검색 API/글 페이지/선별 LLM/요약 LLM), 요약 생성 시간/호출 수
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from evaluation.scripts.bench_cafe_search import StubNaverServer
+
+FACILITIES = [
+    "에버랜드", "롯데월드", "서울숲", "국립중앙박물관", "국립과천과학관", "코엑스아쿠아리움",
+    "서울대공원", "어린이대공원", "키자니아", "한강공원", "뽀로로파크", "서울상상나라",
+]
+PHRASINGS = ["{} 후기", "{} 솔직 후기", "{} 맘카페 후기", "{} 리뷰", "{} 아이랑 후기"]
+ASPECTS = ["{} 주차 팁", "{} 웨이팅"]
+
+
+def make_workload(args, rng: random.Random) -> List[str]:
+    facilities = FACILITIES[: args.facilities]
+    weights = [1 / (rank ** args.zipf) for rank in range(1, len(facilities) + 1)]
+    workload = []
+    for _ in range(args.requests):
+        facility = rng.choices(facilities, weights)[0]
+        templates = ASPECTS if rng.random() < args.aspect_ratio else PHRASINGS
+        workload.append(rng.choice(templates).format(facility))
+    return workload
+
+
+async def run_mode(mode: str, server: StubNaverServer, workload: List[str], args) -> Dict[str, Any]:
+    from config import settings
+    from tools.naver_cafe_search_tool import clear_cafe_cache, naver_cafe_search
+    from tools.review_digest import clear_review_digests, create_review_digest_builder, get_review_digest_stats
+    from utils.http_session import close_http_session
+    from utils.metrics import percentile, reset_metrics
+
+    reset_metrics()
+    clear_cafe_cache()
+    clear_review_digests()
+    server.reset(args.seed)
+    settings.REVIEW_DIGEST_ENABLED = mode == "digest"
+
+    build = None
+    if mode == "digest":
+        builder = create_review_digest_builder()
+        builder.top_n = args.top_n
+        started = time.perf_counter()
+        built = await builder.build_once()
+        build = {"seconds": time.perf_counter() - started, "built": built, "upstream_calls": dict(server.calls)}
+        server.reset(args.seed)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+
+    async def one(query: str):
+        async with semaphore:
+            started = time.perf_counter()
+            await naver_cafe_search.ainvoke({"query": query, "conversation_id": ""})
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(query) for query in workload))
+    stats = get_review_digest_stats()
+    await close_http_session()
+    return {
+        "mode": mode,
+        "requests": len(workload),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "digest_hit_rate": stats["hit_rate"],
+        "upstream_calls": dict(server.calls),
+        "build": build,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="맘카페 후기 요약 벤치마크 (로컬 stub)")
+    parser.add_argument("--requests", "-n", type=int, default=60)
+    parser.add_argument("--concurrency", "-c", type=int, default=4)
+    parser.add_argument("--facilities", type=int, default=12)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--aspect-ratio", type=float, default=0.2, help="주차/웨이팅 같은 측면 질문 비율")
+    parser.add_argument("--top-n", type=int, default=8, help="미리 요약을 만들 시설 수")
+    parser.add_argument("--api-latency", type=float, default=0.1)
+    parser.add_argument("--page-latency", type=float, default=0.2)
+    parser.add_argument("--select-latency", type=float, default=1.2)
+    parser.add_argument("--summarize-latency", type=float, default=0.8)
+    parser.add_argument("--slow-ratio", type=float, default=0.0)
+    parser.add_argument("--slow-latency", type=float, default=12.0)
+    parser.add_argument("--blocked-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/review_digest_bench.json")
+    args = parser.parse_args()
+
+    server = StubNaverServer(args, args.seed)
+    # get_llm은 OPENAI_API_BASE를 따르므로 처음 LLM을 만들기 전에 stub으로 지정
+    os.environ["OPENAI_API_BASE"] = f"{server.base_url}/v1"
+    from config import settings
+    import tools.naver_cafe_search_tool as cafe_tool
+
+    settings.NAVER_CLIENT_ID = settings.NAVER_CLIENT_ID or "stub"
+    settings.NAVER_CLIENT_SECRET = settings.NAVER_CLIENT_SECRET or "stub"
+    # 기본 시설 대신 벤치 시설 상위 top_n으로 요약 생성 (부하 전이라 질문 기록 없음)
+    settings.REVIEW_DIGEST_DEFAULT_FACILITIES = ",".join(FACILITIES[: args.top_n])
+    cafe_tool.NAVER_CAFE_API_URL = f"{server.base_url}/v1/search/cafearticle.json"
+
+    workload = make_workload(args, random.Random(args.seed))
+    results = [asyncio.run(run_mode(mode, server, workload, args)) for mode in ("cached", "digest")]
+    server.close()
+
+    print("\n" + "=" * 60)
+    print(
+        f"후기 질문 {args.requests}건 (시설 {args.facilities}개 Zipf {args.zipf}, 측면 질문 {args.aspect_ratio:.0%}), "
+        f"동시 {args.concurrency}, 미리 요약 {args.top_n}개"
+    )
+    for r in results:
+        calls = r["upstream_calls"]
+        hit_rate = f"{r['digest_hit_rate']:.0%}" if r["digest_hit_rate"] is not None else "-"
+        print(
+            f"{r['mode']:>6}: P50 {r['p50'] * 1000:.0f}ms | P95 {r['p95'] * 1000:.0f}ms | 요약 적중 {hit_rate} "
+            f"| 외부 호출: 검색 {calls['search']} / 글 {calls['page']} / 선별 LLM {calls['select']} / 요약 LLM {calls['summarize']}"
+        )
+        if r["build"]:
+            build_calls = r["build"]["upstream_calls"]
+            print(
+                f"{'':>6}  요약 생성 {r['build']['built']}개 {r['build']['seconds']:.1f}s "
+                f"(검색 {build_calls['search']} / 선별 LLM {build_calls['select']} / 요약 LLM {build_calls['summarize']})"
+            )
+    print("=" * 60)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
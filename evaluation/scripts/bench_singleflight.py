@@ -0,0 +1,238 @@
+"""
+업스트림 single-flight(utils/singleflight.py) 확인 스크립트 (오프라인)
+- 같은 요청 --burst개를 동시에 보내고 업스트림별 실제 호출이 정확히 1번인지 확인 (아니면 종료 코드 1)
+  raw: SingleFlight 자체 (결과 공유, 오류 공유, 먼저 온 호출자 취소)
+  kakao / openweather / perplexity / naver_cafe: 기존 벤치의 로컬 stub 서버 (캐시는 비운 상태)
+  embedding / chroma: search_facilities 도구에 호출 수를 세는 임베딩 클라이언트/컬렉션을 끼워 확인
+- 업스트림별 calls / coalesced (/metrics의 singleflight와 같은 값)와 동시 호출 소요 시간 보고
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from evaluation.scripts.bench_cafe_search import StubNaverServer
+from evaluation.scripts.bench_geocoding import StubKakaoServer, make_places
+from evaluation.scripts.bench_perplexity import StubPerplexityServer
+from evaluation.scripts.bench_weather import StubWeatherServer
+
+
+class CountingEmbeddings:
+    """OpenAIEmbeddings 대신 쓰는 임베딩 클라이언트 (호출 수만 셈)"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def aembed_query(self, text: str) -> List[float]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return [0.0] * 8
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return [[0.0] * 8 for _ in texts]
+
+
+class CountingCollection:
+    """Chroma 컬렉션 대신 쓰는 객체 (스레드에서 호출되므로 lock으로 셈, 결과는 0건)"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def query(self, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return {"ids": [[]], "metadatas": [[]], "documents": [[]], "distances": [[]]}
+
+
+async def burst(n: int, call: Callable[[], Any]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(call() for _ in range(n)), return_exceptions=True)
+    return {"seconds": time.perf_counter() - started, "outcomes": outcomes}
+
+
+async def check_raw(args) -> List[Dict[str, Any]]:
+    from utils.singleflight import SingleFlight
+
+    flight: SingleFlight[str] = SingleFlight("bench_raw")
+    calls = {"ok": 0, "error": 0, "cancel": 0}
+
+    async def upstream(kind: str) -> str:
+        calls[kind] += 1
+        await asyncio.sleep(args.latency)
+        if kind == "error":
+            raise RuntimeError("upstream 503")
+        return f"{kind}-result"
+
+    checks = []
+    ok = await burst(args.burst, lambda: flight.do("ok", lambda: upstream("ok")))
+    checks.append({
+        "name": "raw 결과 공유",
+        "upstream_calls": calls["ok"],
+        "seconds": ok["seconds"],
+        "passed": calls["ok"] == 1 and all(o == "ok-result" for o in ok["outcomes"]),
+    })
+
+    error = await burst(args.burst, lambda: flight.do("error", lambda: upstream("error")))
+    errors = [o for o in error["outcomes"] if isinstance(o, RuntimeError)]
+    checks.append({
+        "name": "raw 오류 공유",
+        "upstream_calls": calls["error"],
+        "seconds": error["seconds"],
+        "passed": calls["error"] == 1 and len(errors) == args.burst and len({id(e) for e in errors}) == 1,
+    })
+
+    # 먼저 온 호출자가 취소돼도 나머지 호출자는 같은 결과를 받음
+    first = asyncio.ensure_future(flight.do("cancel", lambda: upstream("cancel")))
+    await asyncio.sleep(0)
+    others = asyncio.ensure_future(burst(args.burst - 1, lambda: flight.do("cancel", lambda: upstream("cancel"))))
+    await asyncio.sleep(0)
+    first.cancel()
+    rest = await others
+    checks.append({
+        "name": "raw 첫 호출자 취소",
+        "upstream_calls": calls["cancel"],
+        "seconds": rest["seconds"],
+        "passed": calls["cancel"] == 1 and first.cancelled() and all(o == "cancel-result" for o in rest["outcomes"]),
+    })
+    return checks
+
+
+async def check_upstreams(servers: Dict[str, Any], args) -> List[Dict[str, Any]]:
+    import tools.rag_tool as rag_tool
+    from models.pca_embeddings import pca_embeddings
+    from tools.geocoding_tool import clear_geocode_cache, search_map_by_address_core
+    from tools.naver_cafe_search_tool import clear_cafe_cache, search_cafe_articles
+    from tools.perplexity_client import clear_perplexity_cache, close_perplexity_client, search_events_with_perplexity
+    from tools.weather_tool import clear_weather_cache, fetch_forecast
+    from utils.http_session import close_http_session, get_http_session
+
+    clear_geocode_cache()
+    clear_weather_cache()
+    clear_perplexity_cache()
+    clear_cafe_cache()
+    session = await get_http_session()
+    naver_headers = {"X-Naver-Client-Id": "stub", "X-Naver-Client-Secret": "stub"}
+    embeddings, collection = CountingEmbeddings(args.latency), CountingCollection(args.latency)
+    pca_embeddings.embeddings = embeddings
+    rag_tool.collection = collection
+
+    async def search_facility():
+        return await rag_tool.search_facilities.ainvoke({"original_query": "비 오는 날 실내 놀이터", "conversation_id": ""})
+
+    cases = [
+        ("kakao", lambda: servers["kakao"].calls, lambda: search_map_by_address_core(servers["place"])),
+        ("openweather", lambda: servers["weather"].calls, lambda: fetch_forecast("부산")),
+        ("perplexity", lambda: servers["perplexity"].calls, lambda: search_events_with_perplexity("이번 주말 제주 어린이 공연")),
+        (
+            "naver_cafe",
+            lambda: servers["naver"].calls["search"],
+            lambda: search_cafe_articles(session, "에버랜드 주차 팁", naver_headers),
+        ),
+        ("embedding+chroma", lambda: (embeddings.calls, collection.calls), search_facility),
+    ]
+
+    checks = []
+    for name, upstream_calls, call in cases:
+        result = await burst(args.burst, call)
+        calls = upstream_calls()
+        errors = [o for o in result["outcomes"] if isinstance(o, Exception)]
+        checks.append({
+            "name": name,
+            "upstream_calls": calls,
+            "seconds": result["seconds"],
+            "errors": [repr(e) for e in errors[:3]],
+            "passed": calls in (1, (1, 1)) and not errors,
+        })
+
+    await close_perplexity_client()
+    await close_http_session()
+    return checks
+
+
+async def run(servers: Dict[str, Any], args) -> Dict[str, Any]:
+    from utils.metrics import reset_metrics
+    from utils.singleflight import get_singleflight_stats
+
+    reset_metrics()
+    checks = await check_raw(args) + await check_upstreams(servers, args)
+    return {"burst": args.burst, "checks": checks, "singleflight": get_singleflight_stats()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업스트림 single-flight 확인 (로컬 stub)")
+    parser.add_argument("--burst", "-n", type=int, default=100, help="같은 요청 동시 호출 수")
+    parser.add_argument("--latency", type=float, default=0.3, help="stub 응답 지연(초)")
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/singleflight_bench.json")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    places = make_places(1, random.Random(0))
+    naver_args = argparse.Namespace(
+        api_latency=args.latency, page_latency=args.latency, select_latency=args.latency,
+        summarize_latency=args.latency, slow_ratio=0.0, slow_latency=args.latency, blocked_ratio=0.0,
+    )
+    servers = {
+        "place": next(iter(places)),
+        "kakao": StubKakaoServer(places, args.latency),
+        "weather": StubWeatherServer(args.latency),
+        "perplexity": StubPerplexityServer(args.latency),
+        "naver": StubNaverServer(naver_args, 0),
+    }
+    os.environ["PERPLEXITY_BASE_URL"] = servers["perplexity"].base_url
+    os.environ["PERPLEXITY_API_KEY"] = os.environ.get("PERPLEXITY_API_KEY") or "stub"
+
+    import tools.geocoding_tool as geocoding_tool
+    import tools.naver_cafe_search_tool as cafe_tool
+    import tools.weather_tool as weather_tool
+    from config import settings
+    from tools.facility_gazetteer import set_gazetteer
+
+    geocoding_tool.KAKAO_KEYWORD_URL = servers["kakao"].url
+    weather_tool.WEATHER_API_URL = servers["weather"].url
+    cafe_tool.NAVER_CAFE_API_URL = f"{servers['naver'].base_url}/v1/search/cafearticle.json"
+    settings.KAKAO_REST_API_KEY = "stub"
+    set_gazetteer({})
+
+    result = asyncio.run(run(servers, args))
+    for key in ("kakao", "weather", "perplexity", "naver"):
+        servers[key].close()
+
+    print("\n" + "=" * 60)
+    print(f"같은 요청 {args.burst}개 동시, stub {args.latency}s")
+    for check in result["checks"]:
+        status = "✅" if check["passed"] else "❌"
+        print(f"{status} {check['name']:>16}: 업스트림 호출 {check['upstream_calls']} | {check['seconds'] * 1000:.0f}ms")
+        for error in check.get("errors") or []:
+            print(f"{'':>19}오류: {error}")
+    for name, stats in result["singleflight"].items():
+        print(f"   {name:>16}: calls {stats['calls']:.0f} / coalesced {stats['coalesced']:.0f}")
+    print("=" * 60)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(result, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+    if not all(check["passed"] for check in result["checks"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
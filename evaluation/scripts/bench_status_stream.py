@@ -0,0 +1,120 @@
+"""
+진행 상태 SSE(/api/chat/stream/{conversation_id}) 동시 연결 벤치마크
+- N개(기본 1000) 스트림을 연결해 둔 상태의 유휴 CPU 사용량 (기존 1초 polling 방식과 비교)
+- set_status → 각 스트림 도달 지연 P50/P95/최대
+- clear_status → 모든 스트림 종료 여부 / 구독자 정리 여부
+서버 없이 라우터의 SSE generator를 직접 구동합니다.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+
+async def _consume(body_iterator, received: Dict[str, float], closed: Dict[str, float], key: str):
+    async for chunk in body_iterator:
+        if chunk.startswith("data:") and key not in received:
+            received[key] = time.perf_counter()
+    closed[key] = time.perf_counter()
+
+
+async def _legacy_poll_stream(get_status, conversation_id: str):
+    """기존 방식: 연결마다 1초 간격으로 상태를 확인"""
+    while True:
+        get_status(conversation_id)
+        await asyncio.sleep(1)
+
+
+async def _idle_cpu(seconds: float) -> float:
+    start = time.process_time()
+    await asyncio.sleep(seconds)
+    return time.process_time() - start
+
+
+async def run_bench(streams: int, idle_seconds: float) -> Dict[str, Any]:
+    from routers import chat as chat_router
+    from utils.conversation_memory import clear_status, get_status, set_status, status_subscribers
+    from utils.metrics import percentile
+
+    # 기존 polling 방식 유휴 CPU
+    legacy = [asyncio.create_task(_legacy_poll_stream(get_status, f"legacy_{i}")) for i in range(streams)]
+    legacy_cpu = await _idle_cpu(idle_seconds)
+    for task in legacy:
+        task.cancel()
+    await asyncio.gather(*legacy, return_exceptions=True)
+
+    # push 방식 SSE 연결
+    conv_ids = [f"bench_status_{i}" for i in range(streams)]
+    received: Dict[str, float] = {}
+    closed: Dict[str, float] = {}
+    consumers = []
+    for conv_id in conv_ids:
+        response = await chat_router.chat_status_stream(conv_id)
+        consumers.append(asyncio.create_task(_consume(response.body_iterator, received, closed, conv_id)))
+    await asyncio.sleep(0.1)  # 모든 스트림이 구독을 마칠 때까지 대기
+
+    push_cpu = await _idle_cpu(idle_seconds)
+
+    # 상태 전달 지연
+    sent_at = time.perf_counter()
+    for conv_id in conv_ids:
+        set_status(conv_id, "시설 검색 중..")
+    await asyncio.sleep(0.5)
+    latencies = [received[c] - sent_at for c in conv_ids if c in received]
+
+    # 요청 종료 → 스트림 종료
+    done_at = time.perf_counter()
+    for conv_id in conv_ids:
+        clear_status(conv_id)
+    await asyncio.wait(consumers, timeout=5)
+    close_latencies = [closed[c] - done_at for c in conv_ids if c in closed]
+
+    results = {
+        "streams": streams,
+        "idle_seconds": idle_seconds,
+        "legacy_poll_idle_cpu_seconds": legacy_cpu,
+        "push_idle_cpu_seconds": push_cpu,
+        "delivered": len(latencies),
+        "delivery_p50": percentile(latencies, 50),
+        "delivery_p95": percentile(latencies, 95),
+        "delivery_max": max(latencies) if latencies else None,
+        "closed": len(close_latencies),
+        "close_max": max(close_latencies) if close_latencies else None,
+        "leftover_subscribers": sum(1 for c in conv_ids if c in status_subscribers),
+    }
+
+    print("\n" + "=" * 50)
+    print(f"동시 스트림: {streams}개 / 유휴 측정 {idle_seconds:.1f}s")
+    print(f"유휴 CPU: 기존 polling {legacy_cpu:.3f}s | push {push_cpu:.3f}s")
+    print(
+        f"상태 전달: {len(latencies)}/{streams} | "
+        f"P50 {results['delivery_p50'] * 1000:.1f}ms | P95 {results['delivery_p95'] * 1000:.1f}ms"
+    )
+    print(f"종료: {len(close_latencies)}/{streams} 스트림 종료 | 남은 구독자 {results['leftover_subscribers']}")
+    print("=" * 50)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="진행 상태 SSE 동시 연결 벤치마크")
+    parser.add_argument("--streams", "-n", type=int, default=1000)
+    parser.add_argument("--idle", type=float, default=5.0, help="유휴 CPU 측정 시간 (초)")
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/status_stream_bench.json")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_bench(args.streams, args.idle))
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+get_weather_forecast 벤치마크 (오프라인)
+- 로컬 stub 서버가 OpenWeather 5일/3시간 예보(/data/2.5/forecast, 40슬롯)를 흉내냄 (호출당 --latency초)
+- 여러 도시 × today/tomorrow/this_weekend 조회를 동시 --concurrency개로 --requests건 보냄
+  before: 호출마다 requests.get(스레드) + 예보 목록 선형 검색, 캐시 없음 (기존 동작)
+  after: 공유 aiohttp 세션 + timeout, 도시별 예보 캐시(날짜 색인) + 같은 도시 동시 조회 1회로 합침
+- 도구 호출 P50/P95, 처리량, stub이 받은 API 호출 수, 결과가 before와 같은지
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+CITIES = ["서울", "부산", "인천", "대구", "대전", "광주", "수원", "제주", "강릉", "전주"]
+DATES = ["today", "tomorrow", "this_weekend"]
+WEATHERS = [("Clear", "맑음"), ("Clouds", "구름 많음"), ("Rain", "비"), ("Snow", "눈")]
+
+
+def stub_forecast(city: str) -> Dict[str, Any]:
+    """현재 시각부터 3시간 단위 40슬롯 (도시별로 고정된 날씨)"""
+    rng = random.Random(city)
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    start = now - timedelta(hours=now.hour % 3)
+    slots = []
+    for i in range(40):
+        main, description = rng.choice(WEATHERS)
+        slots.append({
+            "dt": int((start + timedelta(hours=3 * i)).timestamp()),
+            "dt_txt": (start + timedelta(hours=3 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+            "main": {"temp": round(rng.uniform(-5, 30), 1), "humidity": rng.randint(30, 90)},
+            "weather": [{"main": main, "description": description}],
+            "wind": {"speed": rng.uniform(0, 8)},
+        })
+    return {"cod": "200", "cnt": len(slots), "list": slots, "city": {"name": city}}
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class StubWeatherServer:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.httpd = _StubHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/data/2.5/forecast"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                city = parse_qs(urlparse(self.path).query)["q"][0].split(",")[0]
+                with server.lock:
+                    server.calls += 1
+                time.sleep(server.latency)
+                data = json.dumps(stub_forecast(city)).encode("utf-8")
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        return Handler
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _legacy_forecast(url: str, city_name: str, date: str) -> Optional[dict]:
+    """기존 get_weather_forecast: requests.get + 선형 검색"""
+    from tools.weather_tool import get_target_datetime
+    from utils.location_mapper import city_mapping
+
+    params = {"q": f"{city_mapping.get(city_name, city_name)},KR", "appid": "stub", "lang": "kr", "units": "metric"}
+    response = requests.get(url, params=params, timeout=5)
+    forecast_list = response.json().get("list")
+    target_date_str = get_target_datetime(date).strftime("%Y-%m-%d")
+    target = next((f for f in forecast_list if target_date_str in f["dt_txt"]), forecast_list[0])
+    return {"date": target_date_str, "weather": target["weather"][0]["description"], "temp": target["main"]["temp"]}
+
+
+async def run_mode(mode: str, server: StubWeatherServer, workload, args) -> Dict[str, Any]:
+    from tools.weather_tool import clear_weather_cache, get_weather_forecast
+    from utils.http_session import close_http_session
+    from utils.metrics import percentile, reset_metrics
+
+    reset_metrics()
+    clear_weather_cache()
+    server.calls = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    answers: Dict[tuple, Any] = {}
+
+    async def one(city: str, date: str):
+        async with semaphore:
+            started = time.perf_counter()
+            if mode == "before":
+                result = await asyncio.to_thread(_legacy_forecast, server.url, city, date)
+            else:
+                output = await get_weather_forecast.ainvoke({"city_name": city, "date": date})
+                parsed = json.loads(output)
+                result = {k: parsed.get(k) for k in ("date", "weather", "temp")}
+            latencies.append(time.perf_counter() - started)
+            answers[(city, date)] = result
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(city, date) for city, date in workload))
+    total = time.perf_counter() - started
+    await close_http_session()
+    return {
+        "mode": mode,
+        "requests": len(workload),
+        "throughput": len(workload) / total,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "api_calls": server.calls,
+        "answers": {f"{city}/{date}": answer for (city, date), answer in answers.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="get_weather_forecast 캐시/비동기 벤치마크 (로컬 stub)")
+    parser.add_argument("--requests", "-n", type=int, default=300)
+    parser.add_argument("--concurrency", "-c", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.3, help="stub 응답 지연(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/weather_bench.json")
+    args = parser.parse_args()
+
+    server = StubWeatherServer(args.latency)
+    import tools.weather_tool as weather_tool
+
+    weather_tool.WEATHER_API_URL = server.url
+    rng = random.Random(args.seed)
+    workload = [(rng.choice(CITIES), rng.choice(DATES)) for _ in range(args.requests)]
+    results = [asyncio.run(run_mode(mode, server, workload, args)) for mode in ("before", "after")]
+    server.close()
+    mismatched = sum(1 for key, answer in results[1]["answers"].items() if results[0]["answers"][key] != answer)
+
+    print("\n" + "=" * 60)
+    print(f"요청 {args.requests}건 (도시 {len(CITIES)} × 날짜 {len(DATES)}), 동시 {args.concurrency}, stub {args.latency}s")
+    for r in results:
+        print(
+            f"{r['mode']:>6}: {r['throughput']:.0f} req/s | P50 {r['p50'] * 1000:.1f}ms | P95 {r['p95'] * 1000:.1f}ms "
+            f"| API 호출 {r['api_calls']}회"
+        )
+    print(f"결과 불일치: {mismatched}")
+    print("=" * 60)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps({"results": results, "mismatched": mismatched}, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
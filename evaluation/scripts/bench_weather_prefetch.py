@@ -0,0 +1,148 @@
+"""
+인기 도시 날씨 예보 백그라운드 갱신(tools/weather_prefetch.py) 벤치마크 (오프라인, 시간 압축)
+- bench_weather의 로컬 stub OpenWeather 서버 사용 (호출당 --latency초)
+- 제공자 갱신 주기 3시간을 --period초로 줄이고 (GRACE/LEAD/JITTER/TICK도 같은 비율로 축소)
+  도시 --cities개에 Zipf 분포로 초당 --rate건 get_weather_forecast를 --duration초 동안 보냄
+  on_demand: 도시별 예보 캐시만 (만료되면 다음 요청이 API를 기다림)
+  scheduled: + 백그라운드 갱신 (상위 --top-n 도시를 만료 전에 미리 조회, 시간당 호출 예산 --budget)
+  (예산은 실제 1시간 창으로 세므로 벤치에서는 전체 실행 동안의 백그라운드 호출 상한으로 동작)
+- 도구 호출 P50/P95/P99, 캐시로 바로 답한 비율(warm hit), 외부 호출 수(요청 경로/백그라운드), 예산 초과 여부
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from evaluation.scripts.bench_weather import StubWeatherServer
+
+# 3시간 → period초 로 압축할 때 같은 비율로 줄이는 설정 (실제 기본값 기준)
+REAL_PERIOD = 3 * 3600
+
+
+def _zipf_weights(n: int, s: float) -> List[float]:
+    return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+
+async def run_mode(mode: str, server: StubWeatherServer, cities: List[str], args) -> Dict[str, Any]:
+    import tools.weather_tool as weather_tool
+    from config import settings
+    from tools.weather_prefetch import create_weather_prefetch_scheduler
+    from utils.http_session import close_http_session
+    from utils.metrics import get_counter, percentile, reset_metrics
+
+    reset_metrics()
+    weather_tool.clear_weather_cache()
+    server.calls = 0
+    scale = args.period / REAL_PERIOD
+    weather_tool.FORECAST_UPDATE_SECONDS = args.period
+    # 압축하면 LEAD가 stub 지연보다 짧아져 갱신이 만료 뒤에 끝나므로, 실제처럼 LEAD > 조회 지연이 되게 하한을 둠
+    settings.WEATHER_PREFETCH_LEAD_SECONDS = max(120 * scale, args.latency * 1.5)
+    settings.WEATHER_PREFETCH_JITTER_SECONDS = 300 * scale
+    settings.WEATHER_UPDATE_GRACE_SECONDS = max(
+        600 * scale, settings.WEATHER_PREFETCH_LEAD_SECONDS + settings.WEATHER_PREFETCH_JITTER_SECONDS
+    )
+    settings.WEATHER_PREFETCH_TICK_SECONDS = max(0.05, 30 * scale)
+    settings.WEATHER_PREFETCH_DEMAND_WINDOW = args.duration
+    settings.WEATHER_PREFETCH_TOP_N = args.top_n
+    settings.WEATHER_PROVIDER_BUDGET_PER_HOUR = args.budget
+
+    scheduler = None
+    if mode == "scheduled":
+        scheduler = create_weather_prefetch_scheduler()
+        scheduler.start()
+
+    rng = random.Random(args.seed)
+    weights = _zipf_weights(len(cities), args.zipf)
+    latencies: List[float] = []
+    tasks = []
+
+    async def one(city: str):
+        started = time.perf_counter()
+        await weather_tool.get_weather_forecast.ainvoke({"city_name": city, "date": rng.choice(["today", "tomorrow"])})
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    while time.perf_counter() - started < args.duration:
+        tasks.append(asyncio.ensure_future(one(rng.choices(cities, weights)[0])))
+        await asyncio.sleep(rng.expovariate(args.rate))
+    await asyncio.gather(*tasks)
+    if scheduler:
+        await scheduler.stop()
+    stats = weather_tool.get_weather_cache_stats()
+    await close_http_session()
+
+    # 실제 시간으로 환산한 시간당 외부 호출 수
+    per_real_hour = server.calls / (args.duration / args.period) / 3
+    return {
+        "mode": mode,
+        "requests": len(latencies),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "warm_hit_rate": stats["warm_hit_rate"],
+        "scheduler_hit_rate": stats["scheduler_hit_rate"],
+        "api_calls": server.calls,
+        "api_calls_request": get_counter("weather.api_calls.request"),
+        "api_calls_scheduler": get_counter("weather.api_calls.scheduler"),
+        "api_calls_per_real_hour": per_real_hour,
+        "budget_skipped": get_counter("weather_prefetch.budget_skipped"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="날씨 예보 백그라운드 갱신 벤치마크 (로컬 stub, 시간 압축)")
+    parser.add_argument("--duration", type=float, default=40.0, help="모드별 부하 시간(초)")
+    parser.add_argument("--period", type=float, default=8.0, help="압축한 제공자 갱신 주기(초, 실제 3시간)")
+    parser.add_argument("--rate", type=float, default=40.0, help="초당 요청 수")
+    parser.add_argument("--cities", type=int, default=25)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--top-n", type=int, default=20)
+    parser.add_argument("--budget", type=int, default=300, help="시간당 외부 호출 예산")
+    parser.add_argument("--latency", type=float, default=0.3, help="stub 응답 지연(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/weather_prefetch_bench.json")
+    args = parser.parse_args()
+
+    from utils.location_mapper import city_mapping
+
+    server = StubWeatherServer(args.latency)
+    import tools.weather_tool as weather_tool
+
+    weather_tool.WEATHER_API_URL = server.url
+    cities = list(dict.fromkeys(city_mapping))[: args.cities]
+    results = [asyncio.run(run_mode(mode, server, cities, args)) for mode in ("on_demand", "scheduled")]
+    server.close()
+
+    print("\n" + "=" * 60)
+    print(
+        f"{args.duration:.0f}초 × {args.rate:.0f} req/s, 도시 {len(cities)}개 (Zipf {args.zipf}), "
+        f"갱신 주기 {args.period}s(=3시간), 상위 {args.top_n}개 백그라운드 갱신"
+    )
+    for r in results:
+        print(
+            f"{r['mode']:>9}: P50 {r['p50'] * 1000:.1f}ms | P95 {r['p95'] * 1000:.1f}ms | P99 {r['p99'] * 1000:.1f}ms "
+            f"| warm hit {r['warm_hit_rate']:.1%} (백그라운드 {r['scheduler_hit_rate']:.1%})"
+        )
+        print(
+            f"{'':>9}  외부 호출 {r['api_calls']}회 (요청 {r['api_calls_request']:.0f} / 백그라운드 {r['api_calls_scheduler']:.0f}) "
+            f"≈ 실제 시간당 {r['api_calls_per_real_hour']:.0f}회 | 예산으로 건너뜀 {r['budget_skipped']:.0f}"
+        )
+    print("=" * 60)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+맘카페 후기 요약 키(tools/review_digest.digest_key) 확인 (오프라인)
+- 같은 시설의 후기 질문은 표현("다녀온 후기 알려줘", "후기 어때요?")이 달라도 같은 키
+- 주차/웨이팅 같은 측면 질문, 일반 장소 명사("아쿠아리움"), 지역 + 유형 질문은 키 없음 (실시간 검색)
+- 시설 사전에 있는 이름은 일반 장소 명사가 섞여도 키 ("어린이 과학관")
+- 하나라도 기대와 다르면 종료 코드 1
+"""
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+# 질문 → 기대 키 (None이면 요약으로 답하지 않음)
+CASES = [
+    ("에버랜드 후기", "에버랜드"),
+    ("에버랜드 다녀온 후기 알려줘", "에버랜드"),
+    ("에버랜드 솔직 후기 알려주세요", "에버랜드"),
+    ("에버랜드 장단점", "에버랜드"),
+    ("롯데월드 후기 어때요?", "롯데월드"),
+    ("서울숲 아이랑 다녀왔어요 후기 궁금해요", "서울숲"),
+    ("코엑스아쿠아리움 맘카페 후기", "코엑스아쿠아리움"),
+    ("어린이 과학관 후기", "어린이 과학관"),
+    ("아쿠아리움 후기", None),
+    ("동물원 후기 알려주세요", None),
+    ("아이랑 갈만한 곳 맘카페 후기", None),
+    ("서울 키즈카페 후기", None),
+    ("에버랜드 주차장 후기", None),
+    ("에버랜드 단점", None),
+    ("롯데월드 꿀팁", None),
+    ("코엑스아쿠아리움 웨이팅", None),
+]
+
+
+def main():
+    from tools.facility_gazetteer import build_gazetteer, set_gazetteer
+    from tools.review_digest import digest_key
+
+    set_gazetteer(build_gazetteer([{"Name": "어린이 과학관", "Address": "", "LAT": 37.5, "LON": 127.0}]))
+
+    failures = 0
+    for query, expected in CASES:
+        actual = digest_key(query)
+        ok = actual == expected
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {query!r:<40} → {actual!r}" + ("" if ok else f" (기대: {expected!r})"))
+
+    print(f"\n{len(CASES) - failures}/{len(CASES)} 통과")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+웹 행사 검색 "더 알려줘" 후속 질문 확인 (오프라인)
+- bench_perplexity의 로컬 stub Perplexity 서버 사용 (rotate: 호출마다 다른 행사 이름)
+- 같은 대화에서 같은 질의를 두 번 보내면 두 번째도 새 행사를 돌려줘야 함
+  (당일 캐시 결과를 이미 모두 보여줬으면 캐시 없이 다시 검색)
+- 다른 대화의 같은 질의는 당일 캐시로 답해야 함 (Perplexity 호출 없음)
+- 하나라도 실패하면 종료 코드 1
+"""
+
+import asyncio
+import os
+import re
+import sys
+from pathlib import Path
+from typing import List
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from evaluation.scripts.bench_perplexity import StubPerplexityServer
+
+QUERY = "이번 주말 제주 어린이 공연"
+NAME_PATTERN = re.compile(r"\*\*(.+?)\*\*")
+
+
+async def run(server: StubPerplexityServer) -> List[str]:
+    from tools.naver_search_tool import naver_web_search
+    from tools.perplexity_client import clear_perplexity_cache, close_perplexity_client
+    from utils.conversation_memory import clear_conversation
+
+    clear_perplexity_cache()
+    failures = []
+
+    async def search(conversation_id: str) -> List[str]:
+        output = await naver_web_search.ainvoke({"query": QUERY, "conversation_id": conversation_id})
+        return NAME_PATTERN.findall(output)
+
+    first = await search("check-followup")
+    second = await search("check-followup")
+    if not first:
+        failures.append("첫 검색 결과 없음")
+    if not second:
+        failures.append("같은 대화의 두 번째 검색이 새 행사를 돌려주지 않음")
+    elif set(first) & set(second):
+        failures.append(f"두 번째 검색에 이미 보여준 행사가 섞임: {sorted(set(first) & set(second))}")
+
+    calls = server.calls
+    other = await search("check-followup-other")
+    if not other:
+        failures.append("다른 대화의 같은 질의 결과 없음")
+    if server.calls != calls:
+        failures.append(f"다른 대화의 같은 질의가 캐시를 쓰지 않음 (Perplexity 호출 {server.calls - calls}회)")
+
+    print(f"첫 검색 {len(first)}건 / 같은 대화 재검색 {len(second)}건 / 다른 대화 {len(other)}건, Perplexity 호출 {server.calls}회")
+    clear_conversation("check-followup")
+    clear_conversation("check-followup-other")
+    await close_perplexity_client()
+    return failures
+
+
+def main():
+    server = StubPerplexityServer(latency=0.05, rotate=True)
+    os.environ["PERPLEXITY_BASE_URL"] = server.base_url
+    os.environ["PERPLEXITY_API_KEY"] = os.environ.get("PERPLEXITY_API_KEY") or "stub"
+
+    from config import settings
+
+    settings.EVENT_INDEX_ENABLED = False
+    settings.LOCATION_PREFETCH_ENABLED = False
+    failures = asyncio.run(run(server))
+    server.close()
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ 같은 대화 재검색도 새 행사를 돌려줌")
+
+
+if __name__ == "__main__":
+    main()
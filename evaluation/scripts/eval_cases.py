@@ -2,15 +2,20 @@
 케이스 분류/필터링 유틸
 - 데이터셋 로드
 - 문항별 케이스 태깅
+- 에이전트 실행 (도구가 async 전용이므로 ainvoke)
 """
 
+import asyncio
 import json
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Any, Dict, List, Optional
 
 
 DEFAULT_DATASET = Path(__file__).parent.parent / "datasets" / "test_questions_prompt_pruned.json"
 
+# 평가 스크립트 전체가 공유하는 이벤트 루프 (공유 HTTP 세션/클라이언트를 문항마다 다시 만들지 않도록)
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
 
 def load_dataset(path: Path = None) -> Dict[str, Any]:
     """데이터셋 로드 (기본: pruned 파일)"""
@@ -61,3 +66,11 @@ def partition_by_case(questions: List[Dict[str, Any]], meta: Dict[str, Any]) ->
         c = classify_case(q, meta)
         buckets.setdefault(c, []).append(q)
     return buckets
+
+
+def invoke_agent(agent, payload: Dict[str, Any]) -> Any:
+    """에이전트 1회 실행 (날씨/지도 도구는 async 전용이라 invoke가 아닌 ainvoke를 공유 루프에서 실행)"""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(agent.ainvoke(payload))
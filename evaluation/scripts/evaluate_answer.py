@@ -1,6 +1,8 @@
 """
 답변 품질 평가 스크립트 (LLM-as-Judge)
 - GPT-4를 사용하여 정확성, 관련성, 유용성 평가
+- --task-model extract=gpt-4o-mini 처럼 작업 유형별 모델을 바꿔 실행하면
+  작업별 LLM 호출 지연(P50/P95)과 답변 품질을 함께 기록 (모델 선택 트레이드오프 비교)
 """
 
 import json
@@ -17,6 +19,8 @@ from openai import OpenAI
 from dotenv import load_dotenv
 import numpy as np
 
+from evaluation.scripts.eval_cases import invoke_agent
+
 # .env 파일 로드
 load_dotenv(Path(__file__).parent.parent.parent / "backend" / ".env")
 
@@ -105,7 +109,7 @@ def evaluate_single_answer(
 def get_model_answer(agent, question: str) -> str:
     """챗봇에서 답변 가져오기"""
     try:
-        response = agent.invoke({
+        response = invoke_agent(agent, {
             "input": question,
             "conversation_id": "eval_session",
             "chat_history": []
@@ -137,6 +141,7 @@ def evaluate_answer_quality(
     overall_scores = []
 
     results = []
+    answer_latencies = []
 
     items = runs if runs is not None else test_data
 
@@ -158,7 +163,9 @@ def evaluate_answer_quality(
             if not model_answer and item.get("error"):
                 model_answer = f"Error: {item.get('error')}"
         else:
+            started = time.perf_counter()
             model_answer = get_model_answer(agent, question)
+            answer_latencies.append(time.perf_counter() - started)
 
         # JSON 직렬화 가능하도록 문자열로 강제
         model_answer = model_answer if isinstance(model_answer, str) else str(model_answer)
@@ -190,8 +197,16 @@ def evaluate_answer_quality(
             "details": results
         }
 
+    summary_extra = {}
+    if answer_latencies:
+        summary_extra["answer_latency"] = {
+            "p50": float(np.percentile(answer_latencies, 50)),
+            "p95": float(np.percentile(answer_latencies, 95)),
+        }
+
     return {
         "summary": {
+            **summary_extra,
             "total_evaluated": len(accuracy_scores),
             "accuracy": {
                 "mean": float(np.mean(accuracy_scores)),
@@ -222,25 +237,74 @@ def evaluate_answer_quality(
     }
 
 
+def apply_task_models(overrides: List[str]) -> Dict[str, str]:
+    """'task=model' 목록으로 작업 유형별 모델 변경 (에이전트 생성 전에 호출)"""
+    from config import settings
+    from models.chat_models import LLM_TASK_POLICIES, get_task_model
+
+    for override in overrides or []:
+        task, _, model = override.partition("=")
+        if task not in LLM_TASK_POLICIES or not model:
+            raise ValueError(f"잘못된 --task-model 값: {override} (작업: {', '.join(LLM_TASK_POLICIES)})")
+        setattr(settings, f"LLM_{task.upper()}_MODEL", model)
+    return {task: get_task_model(task) for task in LLM_TASK_POLICIES}
+
+
+def summarize_llm_tasks() -> Dict[str, Any]:
+    """작업 유형별 LLM 호출 수 / 지연 (models/chat_models.py의 LLMTaskTimingHandler 기록)"""
+    from utils.metrics import snapshot
+
+    return {
+        path.split(":", 1)[1]: {"count": stats["count"], "p50": stats["p50"], "p95": stats["p95"]}
+        for path, stats in snapshot()["paths"].items()
+        if path.startswith("llm:")
+    }
+
+
 def main():
     """답변 품질 평가 실행"""
-    # 테스트 데이터 로드
-    dataset_path = Path(__file__).parent.parent / "datasets" / "test_questions_updated.json"
+    import argparse
+    import random
 
-    with open(dataset_path, "r", encoding="utf-8") as f:
+    parser = argparse.ArgumentParser(description="답변 품질 평가 (LLM-as-Judge)")
+    parser.add_argument(
+        "--task-model", action="append", default=[],
+        help="작업 유형별 모델 변경 (예: --task-model extract=gpt-4o-mini --task-model summarize=gpt-4o-mini)",
+    )
+    parser.add_argument("--sample", "-s", type=int, help="샘플 크기")
+    parser.add_argument(
+        "--dataset", type=str,
+        default=str(Path(__file__).parent.parent / "datasets" / "test_questions_prompt_pruned.json"),
+    )
+    parser.add_argument(
+        "--output", "-o", type=str,
+        default=str(Path(__file__).parent.parent / "results" / "answer_evaluation.json"),
+    )
+    args = parser.parse_args()
+
+    # 테스트 데이터 로드
+    with open(args.dataset, "r", encoding="utf-8") as f:
         data = json.load(f)
 
     test_questions = data["questions"]
+    if args.sample and 0 < args.sample < len(test_questions):
+        test_questions = random.sample(test_questions, args.sample)
 
     # Agent 초기화 (백엔드에서 가져오기)
     try:
+        task_models = apply_task_models(args.task_model)
+        print(f"작업별 모델: {task_models}")
+
         from agent.agent import create_agent
         agent = create_agent()
 
         results = evaluate_answer_quality(agent, test_questions)
+        results["task_models"] = task_models
+        results["llm_tasks"] = summarize_llm_tasks()
 
         # 결과 저장
-        output_path = Path(__file__).parent.parent / "results" / "answer_evaluation.json"
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
         with open(output_path, "w", encoding="utf-8") as f:
             json.dump(results, f, ensure_ascii=False, indent=2)
 
@@ -263,3 +327,8 @@ if __name__ == "__main__":
         print(f"관련성: {summary['relevance']['mean']:.2f}/5.0 (±{summary['relevance']['std']:.2f})")
         print(f"유용성: {summary['usefulness']['mean']:.2f}/5.0 (±{summary['usefulness']['std']:.2f})")
         print(f"종합: {summary['overall']['mean']:.2f}/5.0 (±{summary['overall']['std']:.2f})")
+        if "answer_latency" in summary:
+            print(f"답변 지연: P50 {summary['answer_latency']['p50']:.2f}s | P95 {summary['answer_latency']['p95']:.2f}s")
+        for task, stats in results.get("llm_tasks", {}).items():
+            model = results.get("task_models", {}).get(task, "")
+            print(f"  LLM {task:>9} ({model}): P50 {stats['p50']:.2f}s | P95 {stats['p95']:.2f}s (n={stats['count']})")
@@ -0,0 +1,139 @@
+"""
+로컬 Case 분류기(agent/case_classifier.py) 평가 스크립트
+- --export: 평가 데이터셋 + eval_cases.classify_case 규칙으로 라벨을 붙여 학습 예제 파일 갱신
+- 정확도: 5-fold 교차 검증 (학습에 쓰지 않은 문항 기준), 라벨별 정밀도/재현율
+- 예측 지연: 문항당 P50/P95 (µs)
+- 절감 LLM 호출: 에이전트 없이 바로 답하는 문항(관련 없음/날씨 전용) × 해당 Case 에이전트 평균 LLM 호출 수
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from evaluation.scripts.eval_cases import classify_case, load_dataset
+
+# 에이전트 기준 Case별 LLM 호출 수 (--live 미지정 시 사용하는 근사치)
+# - 관련 없음: 도구 없이 답변 1회
+# - 날씨 전용: 도구 선택 → extract_user_intent 내부 LLM → 날씨 도구 선택 → 답변
+AGENT_LLM_CALLS = {"off_topic": 1, "weather": 4}
+
+
+def labelled_examples() -> List[Dict[str, str]]:
+    from agent.case_classifier import CATEGORY_TO_LABEL
+
+    dataset = load_dataset()
+    return [
+        {"question": q["question"], "label": CATEGORY_TO_LABEL[classify_case(q, dataset["metadata"])]}
+        for q in dataset["questions"]
+    ]
+
+
+def export_examples(examples: List[Dict[str, str]]):
+    from agent.case_classifier import EXAMPLES_PATH
+
+    payload = {
+        "note": "evaluation/scripts/evaluate_case_classifier.py --export 로 생성 (평가 데이터셋 + eval_cases 규칙)",
+        "examples": examples,
+    }
+    EXAMPLES_PATH.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"✅ 학습 예제 {len(examples)}개 저장: {EXAMPLES_PATH}")
+
+
+def cross_validate(examples: List[Dict[str, str]], folds: int) -> Dict[str, Any]:
+    from sklearn.metrics import classification_report
+    from sklearn.model_selection import StratifiedKFold
+
+    from agent.case_classifier import CaseClassifier
+
+    texts = [e["question"] for e in examples]
+    labels = [e["label"] for e in examples]
+    predicted = [None] * len(examples)
+    for train_idx, test_idx in StratifiedKFold(folds, shuffle=True, random_state=0).split(texts, labels):
+        classifier = CaseClassifier().fit([texts[i] for i in train_idx], [labels[i] for i in train_idx])
+        for i in test_idx:
+            predicted[i] = classifier.predict(texts[i])
+
+    correct = sum(p.label == y for p, y in zip(predicted, labels))
+    report = classification_report(labels, [p.label for p in predicted], output_dict=True, zero_division=0)
+    return {
+        "accuracy": correct / len(labels),
+        "per_label": {label: report[label] for label in sorted(set(labels))},
+        "predictions": predicted,
+    }
+
+
+def measure_latency(examples: List[Dict[str, str]], repeat: int) -> Dict[str, float]:
+    from agent.case_classifier import get_case_classifier
+    from utils.metrics import percentile
+
+    classifier = get_case_classifier()
+    latencies = []
+    for _ in range(repeat):
+        for e in examples:
+            start = time.perf_counter()
+            classifier.predict(e["question"])
+            latencies.append(time.perf_counter() - start)
+    return {"p50_us": percentile(latencies, 50) * 1e6, "p95_us": percentile(latencies, 95) * 1e6}
+
+
+def direct_answer_savings(examples: List[Dict[str, str]], predictions) -> Dict[str, Any]:
+    """교차 검증 예측 기준으로 에이전트 없이 답하는 문항 수와 절감 LLM 호출 수"""
+    from agent.direct_answer import can_answer_directly
+
+    direct = Counter()
+    wrong = []
+    for e, prediction in zip(examples, predictions):
+        if can_answer_directly(prediction, e["question"]):
+            direct[prediction.label] += 1
+            if prediction.label != e["label"]:
+                wrong.append({"question": e["question"], "label": e["label"], "predicted": prediction.label})
+
+    saved = sum(AGENT_LLM_CALLS.get(label, 0) * count for label, count in direct.items())
+    return {"direct": dict(direct), "wrong_direct": wrong, "llm_calls_saved": saved}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 Case 분류기 평가")
+    parser.add_argument("--export", action="store_true", help="학습 예제 파일(agent/case_examples.json) 갱신")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20, help="지연 측정 반복 횟수")
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/case_classifier_evaluation.json")
+    args = parser.parse_args()
+
+    examples = labelled_examples()
+    if args.export:
+        export_examples(examples)
+
+    cv = cross_validate(examples, args.folds)
+    latency = measure_latency(examples, args.repeat)
+    savings = direct_answer_savings(examples, cv.pop("predictions"))
+    results = {"cross_validation": cv, "latency": latency, "direct_answer": savings}
+
+    print("\n" + "=" * 50)
+    print(f"라벨 분포: {dict(Counter(e['label'] for e in examples))}")
+    print(f"{args.folds}-fold 정확도: {cv['accuracy']:.1%}")
+    for label, r in cv["per_label"].items():
+        print(f"  {label:>9}: precision {r['precision']:.2f} | recall {r['recall']:.2f} (n={int(r['support'])})")
+    print(f"예측 지연: P50 {latency['p50_us']:.0f}µs | P95 {latency['p95_us']:.0f}µs")
+    print(
+        f"에이전트 없이 답변: {savings['direct']} (오분류 {len(savings['wrong_direct'])}건) → "
+        f"LLM 호출 약 {savings['llm_calls_saved']}회 절감 / {len(examples)}문항"
+    )
+    print("=" * 50)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Case 2 결정적 파이프라인(planner) vs Agent 경로 비교 스크립트
+- planner 적용률 (Case 2로 인식된 문항 비율)
+- 요청당 LLM 호출 수
+- 응답 시간 P50/P95
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 백엔드 모듈 임포트를 위한 경로 추가
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from evaluation.scripts.eval_cases import classify_case, load_dataset
+
+TARGET_CASES = ("rag", "weather_plus")
+
+
+async def _run_agent(agent, question: str, conversation_id: str) -> Dict[str, Any]:
+    from agent.callbacks import LLMCallCounterHandler
+
+    counter = LLMCallCounterHandler()
+    start = time.perf_counter()
+    error = None
+    try:
+        await agent.ainvoke(
+            {
+                "input": question,
+                "conversation_id": conversation_id,
+                "chat_history": [],
+                "last_result_source": "",
+            },
+            config={"callbacks": [counter]},
+        )
+    except Exception as e:
+        error = str(e)
+    return {"latency": time.perf_counter() - start, "llm_calls": counter.count, "error": error}
+
+
+async def _run_planner(pipeline, plan, question: str, conversation_id: str) -> Dict[str, Any]:
+    from agent.callbacks import LLMCallCounterHandler
+
+    counter = LLMCallCounterHandler()
+    start = time.perf_counter()
+    result = await pipeline.arun(plan, question, conversation_id, callbacks=[counter])
+    return {
+        "latency": time.perf_counter() - start,
+        "llm_calls": counter.count,
+        # None이면 실제 서비스에서는 에이전트로 폴백됨
+        "fallback": result is None,
+    }
+
+
+def _summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    from utils.metrics import percentile
+
+    latencies = [r["latency"] for r in runs]
+    llm_calls = [r["llm_calls"] for r in runs]
+    return {
+        "count": len(runs),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "avg_llm_calls": (sum(llm_calls) / len(llm_calls)) if llm_calls else None,
+    }
+
+
+def evaluate_planner(sample: int = None) -> Dict[str, Any]:
+    from agent import create_agent, create_planner, plan_case2
+
+    data = load_dataset()
+    meta = data.get("metadata", {})
+    questions = [q for q in data["questions"] if classify_case(q, meta) in TARGET_CASES]
+
+    planned = [(q, plan_case2(q["question"])) for q in questions]
+    coverage = sum(1 for _, plan in planned if plan) / len(planned) if planned else 0.0
+    planned = [(q, plan) for q, plan in planned if plan]
+    if sample and 0 < sample < len(planned):
+        planned = random.sample(planned, sample)
+
+    agent = create_agent()
+    pipeline = create_planner()
+
+    agent_runs, planner_runs = [], []
+    for i, (item, plan) in enumerate(planned):
+        question = item["question"]
+        print(f"[{i+1}/{len(planned)}] {question[:40]}...")
+        agent_runs.append(asyncio.run(_run_agent(agent, question, f"eval_planner_agent_{i}")))
+        planner_runs.append(asyncio.run(_run_planner(pipeline, plan, question, f"eval_planner_{i}")))
+
+    results = {
+        "coverage": coverage,
+        "agent": _summarize(agent_runs),
+        "planner": _summarize([r for r in planner_runs if not r["fallback"]]),
+        "planner_fallback_rate": (
+            sum(1 for r in planner_runs if r["fallback"]) / len(planner_runs) if planner_runs else 0.0
+        ),
+    }
+
+    print("\n" + "=" * 50)
+    print(f"Case 2 인식률: {coverage:.1%} ({len(planned)}문항 실행)")
+    for path in ("agent", "planner"):
+        s = results[path]
+        if not s["count"]:
+            continue
+        print(
+            f"{path:>8}: LLM 호출 {s['avg_llm_calls']:.2f}회 | "
+            f"P50 {s['p50']:.2f}s | P95 {s['p95']:.2f}s (n={s['count']})"
+        )
+    print(f"planner 폴백률: {results['planner_fallback_rate']:.1%}")
+    print("=" * 50)
+    return results
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Case 2 planner vs agent 비교")
+    parser.add_argument("--sample", "-s", type=int, help="샘플 크기")
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/planner_evaluation.json")
+    args = parser.parse_args()
+
+    results = evaluate_planner(sample=args.sample)
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+턴 단위 도구/프롬프트 라우팅(agent/tool_router.py) 평가 스크립트
+- 오프라인: 문항별 route 분포, 고정 입력 토큰(시스템 프롬프트 + 도구 스키마) 전체 vs 라우팅,
+  route 커버리지(기대 도구가 route 도구 집합에 모두 포함되는 비율)
+- --live: 전체 에이전트 vs 라우팅 에이전트 응답 시간 P50/P95, Tool 선택 정확도 (evaluate_tools와 동일 채점)
+"""
+
+import json
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 백엔드 모듈 임포트를 위한 경로 추가
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from evaluation.scripts.eval_cases import invoke_agent, load_dataset
+from evaluation.scripts.evaluate_tools import calculate_tool_selection_accuracy
+
+
+def _last_source_for(item: Dict[str, Any]) -> str:
+    # 지도 문항은 직전 검색 결과가 있는 후속 질문으로 가정
+    return "rag" if item.get("category") == "map" else ""
+
+
+def _static_tokens(route) -> int:
+    from langchain_core.utils.function_calling import convert_to_openai_tool
+
+    from agent.prompts import assemble_system_prompt
+    from utils.token_counter import count_tokens
+
+    agent = _get_agent()
+    schemas = [convert_to_openai_tool(agent.tools[name]) for name in route.tools]
+    return count_tokens(assemble_system_prompt(route.tools, route.sections)) + count_tokens(
+        json.dumps(schemas, ensure_ascii=False)
+    )
+
+
+_agent = None
+
+
+def _get_agent():
+    global _agent
+    if _agent is None:
+        from agent.agent import create_routed_agent
+
+        _agent = create_routed_agent()
+    return _agent
+
+
+def evaluate_offline(questions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    from agent.tool_router import FULL_ROUTE, select_route
+
+    full_tokens = _static_tokens(FULL_ROUTE)
+    token_cache: Dict[str, int] = {}
+    routes = Counter()
+    routed_tokens = []
+    uncovered = []
+
+    for item in questions:
+        route = select_route(item["question"], _last_source_for(item))
+        routes[route.name] += 1
+        if route.name not in token_cache:
+            token_cache[route.name] = _static_tokens(route)
+        routed_tokens.append(token_cache[route.name])
+        if not set(item.get("expected_tools") or []) <= set(route.tools):
+            uncovered.append({"question": item["question"], "route": route.name, "expected_tools": item.get("expected_tools")})
+
+    avg_routed = sum(routed_tokens) / len(routed_tokens) if routed_tokens else 0
+    return {
+        "routes": dict(routes),
+        "static_tokens_per_route": token_cache,
+        "full_static_tokens": full_tokens,
+        "avg_routed_static_tokens": avg_routed,
+        "static_token_reduction": (1 - avg_routed / full_tokens) if full_tokens else 0.0,
+        "route_coverage": 1 - len(uncovered) / len(questions) if questions else 1.0,
+        "uncovered": uncovered,
+    }
+
+
+def _run(agent, item: Dict[str, Any]) -> Dict[str, Any]:
+    payload = {
+        "input": item["question"],
+        "conversation_id": "eval_routing",
+        "chat_history": [],
+        "last_result_source": _last_source_for(item),
+    }
+    start = time.perf_counter()
+    try:
+        response = invoke_agent(agent, payload)
+        steps = response.get("intermediate_steps") or []
+    except Exception as e:
+        print(f"Error for question '{item['question']}': {e}")
+        steps = []
+    latency = time.perf_counter() - start
+
+    # extract_user_intent 제거 (evaluate_tools와 동일하게 채점 제외)
+    actual_tools = [getattr(step[0], "tool", None) for step in steps]
+    actual_tools = [t for t in actual_tools if t and t != "extract_user_intent"]
+    return {
+        "latency": latency,
+        "selection_accuracy": calculate_tool_selection_accuracy(item.get("expected_tools", []), actual_tools),
+    }
+
+
+def evaluate_live(questions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    from agent.agent import create_agent
+    from utils.metrics import percentile
+
+    agents = {"full": create_agent(), "routed": _get_agent()}
+    runs: Dict[str, List[Dict[str, Any]]] = {name: [] for name in agents}
+    for i, item in enumerate(questions):
+        print(f"[{i+1}/{len(questions)}] {item['question'][:40]}...")
+        for name, agent in agents.items():
+            runs[name].append(_run(agent, item))
+
+    summary = {}
+    for name, results in runs.items():
+        latencies = [r["latency"] for r in results]
+        scores = [r["selection_accuracy"] for r in results]
+        summary[name] = {
+            "count": len(results),
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "selection_accuracy": sum(scores) / len(scores) if scores else None,
+        }
+    return summary
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="도구/프롬프트 라우팅 평가")
+    parser.add_argument("--live", action="store_true", help="실제 에이전트 실행 비교 (LLM 호출)")
+    parser.add_argument("--sample", "-s", type=int, help="--live 샘플 크기")
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/routing_evaluation.json")
+    args = parser.parse_args()
+
+    questions = load_dataset()["questions"]
+    results = {"offline": evaluate_offline(questions)}
+
+    offline = results["offline"]
+    print("\n" + "=" * 50)
+    print(f"route 분포: {offline['routes']}")
+    print(
+        f"고정 입력 토큰: 전체 {offline['full_static_tokens']} → 평균 {offline['avg_routed_static_tokens']:.0f} "
+        f"({offline['static_token_reduction']:.1%} 감소)"
+    )
+    print(f"route 커버리지: {offline['route_coverage']:.1%} (미포함 {len(offline['uncovered'])}문항)")
+
+    if args.live:
+        sample = questions
+        if args.sample and 0 < args.sample < len(questions):
+            sample = random.sample(questions, args.sample)
+        results["live"] = evaluate_live(sample)
+        for name, s in results["live"].items():
+            print(
+                f"{name:>7}: Tool 선택 정확도 {s['selection_accuracy']:.1%} | "
+                f"P50 {s['p50']:.2f}s | P95 {s['p95']:.2f}s (n={s['count']})"
+            )
+    print("=" * 50)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "backend"))
 
 import psutil
 import numpy as np
-from evaluation.scripts.eval_cases import classify_case
+from evaluation.scripts.eval_cases import classify_case, invoke_agent
 from backend.utils.tool_timings import get_and_reset as get_tool_timings
 
 
@@ -30,7 +30,7 @@ def measure_response_time(agent, question: str) -> Dict[str, Any]:
     response = None
 
     try:
-        response = agent.invoke({
+        response = invoke_agent(agent, {
             "input": question,
             "conversation_id": "eval_session",
             "chat_history": []
@@ -79,7 +79,7 @@ def evaluate_system_performance(
     print(f"워밍업 중... ({warmup_questions}개 질문)")
     for i in range(min(warmup_questions, len(test_data))):
         try:
-            agent.invoke({
+            invoke_agent(agent, {
                 "input": test_data[i]["question"],
                 "conversation_id": "eval_warmup",
                 "chat_history": []
@@ -113,7 +113,7 @@ def evaluate_system_performance(
         # 응답 시간 측정
         start_time = time.time()
         try:
-            response = agent.invoke({
+            response = invoke_agent(agent, {
                 "input": question,
                 "conversation_id": conv_id,
                 "chat_history": []
@@ -16,7 +16,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "backend"))
 
 import numpy as np
 from collections import defaultdict
-from evaluation.scripts.eval_cases import classify_case, load_dataset
+from evaluation.scripts.eval_cases import classify_case, invoke_agent, load_dataset
 from backend.utils.tool_timings import get_and_reset as get_tool_timings
 
 
@@ -163,7 +163,7 @@ def evaluate_tool_accuracy(
             # 로거 리셋
             tool_logger.reset()
             try:
-                response = agent.invoke({
+                response = invoke_agent(agent, {
                     "input": question,
                     "conversation_id": "eval_session",
                     "chat_history": []
@@ -0,0 +1,106 @@
+"""
+대화 길이에 따른 프롬프트 히스토리 토큰 증가 측정 (합성 30턴 대화)
+- 기존: 전체 메시지 + "RAG 검색 결과: {facilities}" dump를 매 턴 chat_history로 전달
+- 현재: history_manager (최근 N턴 원문 + 누적 요약, 검색 결과는 시설 이름만)
+기본은 오프라인 요약기(앞부분 자르기)를 사용하고, --llm 지정 시 실제 요약 LLM을 호출합니다.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+CITIES = ["부산", "서울 강남구", "대구", "인천", "수원", "대전", "광주", "제주"]
+PLACES = ["키즈카페", "박물관", "공원", "과학관", "도서관", "수영장"]
+
+
+def _synthetic_turn(i: int) -> Dict[str, Any]:
+    city = CITIES[i % len(CITIES)]
+    place = PLACES[i % len(PLACES)]
+    facilities = [
+        {
+            "name": f"{city} {place} {i}-{j}",
+            "lat": 35.1 + j * 0.01,
+            "lng": 129.0 + j * 0.01,
+            "category": place,
+            "desc": f"{city}에 위치한 {place}로 아이와 함께 체험 프로그램을 즐길 수 있는 공간입니다. " * 2,
+            "in_out": "실내",
+        }
+        for j in range(3)
+    ]
+    answer = "\n".join(
+        f"{j + 1}. **{fac['name']}**\n   - {fac['desc'][:80]}\n   - 아이와 함께 방문하기 좋아요!"
+        for j, fac in enumerate(facilities)
+    )
+    return {
+        "user": f"{city} 아이랑 갈만한 {place} 추천해줘",
+        "facilities": facilities,
+        "answer": f"{city} {place} 추천드릴게요! 😊\n{answer}\n더 궁금한 점이 있으면 말씀해주세요.",
+    }
+
+
+async def _offline_summarizer(summary: str, messages: List) -> str:
+    text = " / ".join(str(m.content)[:60] for m in messages)
+    return (summary + " / " + text)[-600:] if summary else text[-600:]
+
+
+async def measure(turns: int, use_llm: bool) -> Dict[str, Any]:
+    from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+    from utils.conversation_memory import add_message, format_search_result_summary
+    from utils.history_manager import build_prompt_history, fold_history, message_tokens
+
+    conversation_id = "history_growth_bench"
+    summarizer = None if use_llm else _offline_summarizer
+
+    legacy_messages: List = []
+    rows = []
+    for i in range(turns):
+        turn = _synthetic_turn(i)
+
+        # 기존 방식: 전체 히스토리 (현재 사용자 메시지 포함)
+        legacy_messages.append(HumanMessage(content=turn["user"]))
+        legacy_tokens = sum(message_tokens(m) for m in legacy_messages)
+        legacy_messages.append(SystemMessage(content=f"RAG 검색 결과: {turn['facilities']}"))
+        legacy_messages.append(AIMessage(content=turn["answer"]))
+
+        # 현재 방식
+        history = build_prompt_history(conversation_id)
+        tokens = sum(message_tokens(m) for m in history)
+        add_message(conversation_id, "user", turn["user"])
+        add_message(conversation_id, "search_result", format_search_result_summary(turn["facilities"], source="rag"))
+        add_message(conversation_id, "ai", turn["answer"])
+        await fold_history(conversation_id, summarizer=summarizer)
+
+        rows.append({"turn": i + 1, "legacy_tokens": legacy_tokens, "bounded_tokens": tokens})
+
+    print("\n" + "=" * 50)
+    print(f"{'턴':>4} | {'기존 히스토리':>12} | {'예산 적용':>10}")
+    for row in rows:
+        if row["turn"] in (1, 2, 5, 10, 15, 20, 25, 30) or row["turn"] == turns:
+            print(f"{row['turn']:>4} | {row['legacy_tokens']:>12} | {row['bounded_tokens']:>10}")
+    print("=" * 50)
+    return {"turns": turns, "summarizer": "llm" if use_llm else "offline", "rows": rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대화 히스토리 토큰 증가 측정")
+    parser.add_argument("--turns", "-t", type=int, default=30)
+    parser.add_argument("--llm", action="store_true", help="실제 요약 LLM 사용")
+    parser.add_argument("--output", "-o", type=str, default="evaluation/results/history_growth.json")
+    args = parser.parse_args()
+
+    results = asyncio.run(measure(args.turns, args.llm))
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"✅ 결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,7 @@ sys.path.insert(0, str(ROOT_DIR))
 sys.path.insert(0, str(ROOT_DIR / "backend"))
 
 from evaluation.scripts.eval_cases import load_dataset
-from backend.utils.tool_timings import get_and_reset as get_tool_timings, clear_tool_timings, enable_tool_timing, disable_tool_timing
+from backend.utils.tool_timings import get_and_reset as get_tool_timings, clear_tool_timings, enable_tool_timing, disable_tool_timing, max_concurrency
 
 
 def serialize_response(raw_response):
@@ -96,7 +96,9 @@ def run_agent_once(agent, item: Dict[str, Any], conversation_id: str, chat_histo
         "latency": latency,
         "memory_before": mem_before,
         "memory_after": mem_after,
-        "tool_timings": tool_timings
+        "tool_timings": tool_timings,
+        # 한 스텝의 도구 호출이 동시에 실행되면 2 이상
+        "tool_max_concurrency": max_concurrency(tool_timings),
     }
 
 